@@ -5,26 +5,55 @@ Segye VIBE 메인 애플리케이션
 from flask import Flask, render_template, request, jsonify, send_file
 from flask_cors import CORS
 import os
+import time
+import mimetypes
 from pathlib import Path
 import traceback
 
-from config import DEBUG, SECRET_KEY, OUTPUT_DIR
-from modules.article_parser import ArticleParser
-from modules.script_generator import ScriptGenerator
-from modules.tts_engine import TTSEngine
-from modules.subtitle_generator import SubtitleGenerator
-from modules.video_composer import VideoComposer
+from config import DEBUG, SECRET_KEY, OUTPUT_DIR, DOWNLOAD_SETTINGS, render_settings
+from modules.pipeline import RenderPipeline
+from modules.job_queue import JobQueue
+from modules.video_catalog import VideoCatalog
+from modules.renditions import resolve_renditions, rendition_path
+from modules.render_manifest import load_manifest
+from modules.profiler import PROFILE_MODES, authorize, profile_files, summarize
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = SECRET_KEY
 CORS(app)
 
-# 모듈 초기화
-article_parser = ArticleParser()
-script_generator = ScriptGenerator()
-tts_engine = TTSEngine()
-subtitle_generator = SubtitleGenerator()
-video_composer = VideoComposer()
+# 모듈 초기화 (단계 모듈과 작업 큐/카탈로그 DB는 처음 사용할 때 로드 - import만으로는 무거운 의존성을 올리지 않음)
+pipeline = RenderPipeline()
+_job_queue = None
+_video_catalog = None
+
+
+def get_job_queue() -> JobQueue:
+    """작업 큐 (첫 호출 시 DB 연결/스키마 생성)"""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue()
+    return _job_queue
+
+
+def get_video_catalog() -> VideoCatalog:
+    """영상 카탈로그 (첫 호출 시 DB 연결/스키마 생성, 처음 만들 때 기존 영상 색인)"""
+    global _video_catalog
+    if _video_catalog is None:
+        _video_catalog = VideoCatalog()
+    return _video_catalog
+
+
+def warm_up():
+    """
+    단계 모듈 import/생성과 폰트/아바타/B-roll/BGM 인덱스 미리 로드
+    gunicorn.conf.py가 preload_app 마스터에서 fork 전에 호출 (워커가 copy-on-write로 공유)
+    """
+    started = time.perf_counter()
+    pipeline.preload()
+    get_job_queue()
+    get_video_catalog()
+    print(f"✓ 워밍업 완료 ({time.perf_counter() - started:.2f}s)")
 
 
 @app.route('/')
@@ -33,55 +62,141 @@ def index():
     return render_template('index.html')
 
 
+def create_video(article: dict, scripts: dict, profile: str = None, renditions: list = None) -> dict:
+    """
+    스크립트 이후 단계(TTS → 자막 → B-roll → 합성) 실행
+    
+    Returns:
+        dict: {'video_path', 'filename', 'renditions', 'article_title', 'memory', 'segments'}
+    """
+    state = pipeline.run('create', {
+        'article': article, 'scripts': scripts, 'profile': profile, 'renditions': renditions
+    })
+    return state['video']
+
+
+def requested_profile(data: dict):
+    """
+    요청한 프로파일링 모드 (X-Profile 헤더 또는 본문 "profiling" 플래그, X-Profile-Token 필요)
+    
+    Returns:
+        tuple: (모드 또는 None, None) 또는 (None, (에러 메시지, HTTP 상태))
+    """
+    mode = request.headers.get('X-Profile') or (data or {}).get('profiling')
+    if not mode:
+        return None, None
+    if not authorize(request.headers.get('X-Profile-Token')):
+        return None, ('프로파일링 권한이 없습니다', 403)
+    if mode not in PROFILE_MODES:
+        return None, (f"지원하지 않는 프로파일링 모드: {mode} ({', '.join(PROFILE_MODES)})", 400)
+    return mode, None
+
+
+def validate_job(kind: str, data: dict):
+    """
+    작업 입력 검증 (동기 API와 작업 큐 공통, 프로파일링을 요청했으면 payload['profiling']에 모드 추가)
+    
+    Returns:
+        tuple: (payload, None) 또는 (None, (에러 메시지, HTTP 상태))
+    """
+    if kind == 'generate':
+        if not data.get('url'):
+            return None, ('URL이 필요합니다', 400)
+        try:
+            render_settings(data.get('profile'))
+            resolve_renditions(data.get('renditions'))
+        except ValueError as e:
+            return None, (str(e), 400)
+        payload = {key: data.get(key) for key in ('url', 'profile', 'renditions')}
+    elif kind == 'rerender':
+        if not data.get('filename'):
+            return None, ('파일명이 필요합니다', 400)
+        try:
+            load_manifest(OUTPUT_DIR / Path(data['filename']).name)
+        except (FileNotFoundError, ValueError) as e:
+            return None, (str(e), 404)
+        payload = {'filename': data['filename'], 'scripts': data.get('scripts')}
+    else:
+        return None, (f"알 수 없는 작업 종류: {kind}", 400)
+    
+    mode, error = requested_profile(data)
+    if error:
+        return None, error
+    if mode:
+        payload['profiling'] = mode
+    return payload, None
+
+
 @app.route('/api/generate', methods=['POST'])
 def generate_video():
     """
     영상 생성 API
-    Request: { "url": "기사 URL" }
-    Response: { "status": "success", "video_path": "생성된 영상 경로" }
+    Request: {
+        "url": "기사 URL",
+        "profile": "final" | "draft" (선택),
+        "renditions": ["720p", "poster"] (선택, 기본 프로필 설정),
+        "profiling": "sample" | "cprofile" (선택, X-Profile 헤더와 같음 - X-Profile-Token 필요)
+    }
+    Response: { "status": "success", "video_path": "생성된 영상 경로", "renditions": {이름: 파일명},
+                "memory": {"peak_rss_mb", "peak_process_mb", "peak_children_mb", "budget_mb", "seconds"} }
     """
     try:
-        data = request.get_json()
-        article_url = data.get('url')
-        
-        if not article_url:
-            return jsonify({'status': 'error', 'message': 'URL이 필요합니다'}), 400
-        
-        # 1단계: 기사 파싱
-        print(f"[1/6] 기사 파싱 중... {article_url}")
-        article = article_parser.parse(article_url)
-        
-        # 2단계: 스크립트 생성
-        print("[2/6] 스크립트 생성 중...")
-        scripts = script_generator.generate(article)
+        payload, error = validate_job('generate', request.get_json())
+        if error:
+            return jsonify({'status': 'error', 'message': error[0]}), error[1]
         
-        # 3단계: TTS 생성
-        print("[3/6] 음성 생성 중...")
-        audio_files = tts_engine.generate(scripts)
+        # 1~6단계: 파싱/스크립트/음성/자막/B-roll/합성
+        result = pipeline.run('generate', payload)['video']
         
-        # 4단계: 자막 생성
-        print("[4/6] 자막 생성 중...")
-        subtitles = subtitle_generator.generate(scripts, audio_files)
+        return jsonify({
+            'status': 'success',
+            'video_path': result['video_path'],
+            'filename': result['filename'],
+            'renditions': result['renditions'],
+            'article_title': result['article_title'],
+            'memory': result['memory'],
+            'profiling': result.get('profiling'),
+            'message': '영상이 성공적으로 생성되었습니다'
+        })
         
-        # 5단계: B-roll 선택
-        print("[5/6] 자료화면 선택 중...")
-        broll_data = video_composer.select_broll(article, scripts)
+    except Exception as e:
+        print(f"에러 발생: {str(e)}")
+        traceback.print_exc()
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@app.route('/api/rerender', methods=['POST'])
+def rerender_video():
+    """
+    스크립트 수정 후 재렌더링 API
+    바뀐 문장만 음성 합성/세그먼트 인코딩하고 나머지는 이전 렌더링의 세그먼트를 스트림 복사로 연결
+    Request: {
+        "filename": "이전 영상 파일명",
+        "scripts": {"intro", "narration": [...], "outro"} (바꿀 항목만, 나머지는 이전 스크립트)
+    }
+    Response: { "status": "success", "video_path", "filename", "renditions",
+                "segments": {"total", "encoded", "reused", "changed": ["body:2", ...]}, "memory" }
+    """
+    try:
+        payload, error = validate_job('rerender', request.get_json())
+        if error:
+            return jsonify({'status': 'error', 'message': error[0]}), error[1]
         
-        # 6단계: 영상 합성
-        print("[6/6] 영상 합성 중...")
-        video_path = video_composer.compose(
-            scripts=scripts,
-            audio_files=audio_files,
-            subtitles=subtitles,
-            broll_data=broll_data,
-            article=article
-        )
+        print(f"재렌더링: {payload['filename']}")
+        result = pipeline.run('rerender', payload)['video']
         
         return jsonify({
             'status': 'success',
-            'video_path': str(video_path),
-            'article_title': article['title'],
-            'message': '영상이 성공적으로 생성되었습니다'
+            'video_path': result['video_path'],
+            'filename': result['filename'],
+            'renditions': result['renditions'],
+            'segments': result['segments'],
+            'memory': result['memory'],
+            'profiling': result.get('profiling'),
+            'message': '영상이 다시 렌더링되었습니다'
         })
         
     except Exception as e:
@@ -93,11 +208,81 @@ def generate_video():
         }), 500
 
 
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """
+    렌더 작업 등록 API (비동기 - 렌더 워커 `python worker.py`가 실행)
+    Request: { "kind": "generate" | "rerender", 그 외 /api/generate 또는 /api/rerender와 같은 입력,
+               "profiling": "sample" | "cprofile" (선택, X-Profile-Token 필요) }
+    Response (202): { "status": "queued", "job_id": "작업 ID" }
+    """
+    try:
+        data = request.get_json() or {}
+        kind = data.get('kind', 'generate')
+        payload, error = validate_job(kind, data)
+        if error:
+            return jsonify({'status': 'error', 'message': error[0]}), error[1]
+        
+        job_id = get_job_queue().enqueue(kind, payload)
+        return jsonify({'status': 'queued', 'job_id': job_id}), 202
+        
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """
+    렌더 작업 상태 조회
+    Response: { "status": "success", "job": {"id", "kind", "status": queued|running|done|failed,
+                "stage": 마지막으로 끝난 단계, "attempts", "error", "result"} }
+    """
+    try:
+        job = get_job_queue().get(job_id)
+        if job is None:
+            return jsonify({'status': 'error', 'message': '작업을 찾을 수 없습니다'}), 404
+        return jsonify({
+            'status': 'success',
+            'job': {key: job[key] for key in
+                    ('id', 'kind', 'status', 'stage', 'attempts', 'max_attempts', 'error', 'result',
+                     'created', 'updated')}
+        })
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+
+@app.route('/api/jobs/<job_id>/profile')
+def get_job_profile(job_id):
+    """
+    작업(또는 X-Profile로 프로파일링한 동기 요청)의 프로파일 조회 (X-Profile-Token 필요)
+    ?format=summary (기본, 상위 함수 JSON) | collapsed (flamegraph용 텍스트) | pstats (cProfile 파일)
+    """
+    try:
+        if not authorize(request.headers.get('X-Profile-Token')):
+            return jsonify({'status': 'error', 'message': '프로파일링 권한이 없습니다'}), 403
+        files = profile_files(job_id)
+        if not files:
+            return jsonify({'status': 'error', 'message': '프로파일을 찾을 수 없습니다'}), 404
+        
+        output_format = request.args.get('format', 'summary')
+        if output_format == 'summary':
+            limit = request.args.get('limit', 30, type=int)
+            return jsonify({'status': 'success', 'profile': summarize(job_id, limit)})
+        if output_format not in files:
+            return jsonify({'status': 'error', 'message': f"{output_format} 프로파일이 없습니다"}), 404
+        return send_file(files[output_format], as_attachment=True)
+        
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+
 @app.route('/api/preview', methods=['POST'])
 def preview_script():
     """
     스크립트 미리보기 API
     기사 URL을 받아 생성될 스크립트만 반환
+    Request: { "url": "기사 URL", "render": true (선택) }
+    render가 true면 draft 프로필(저해상도/저프레임/ultrafast)로 초안 영상도 렌더링
     """
     try:
         data = request.get_json()
@@ -107,12 +292,12 @@ def preview_script():
             return jsonify({'status': 'error', 'message': 'URL이 필요합니다'}), 400
         
         # 기사 파싱
-        article = article_parser.parse(article_url)
+        article = pipeline.article_parser.parse(article_url)
         
         # 스크립트 생성
-        scripts = script_generator.generate(article)
+        scripts = pipeline.script_generator.generate(article)
         
-        return jsonify({
+        result = {
             'status': 'success',
             'article': {
                 'title': article['title'],
@@ -120,7 +305,15 @@ def preview_script():
                 'content': article['content'][:200] + '...'
             },
             'scripts': scripts
-        })
+        }
+        
+        if data.get('render'):
+            video = create_video(article, scripts, profile='draft')
+            result['video_path'] = video['video_path']
+            result['filename'] = video['filename']
+            result['memory'] = video['memory']
+        
+        return jsonify(result)
         
     except Exception as e:
         return jsonify({
@@ -129,37 +322,93 @@ def preview_script():
         }), 500
 
 
-@app.route('/api/download/<filename>')
+def output_file(filename: str, rendition: str = None) -> Path:
+    """
+    다운로드할 출력 파일 경로 (OUTPUT_DIR 바로 아래 메인 영상 또는 그 렌디션만)
+
+    Raises:
+        ValueError: OUTPUT_DIR 밖을 가리키거나 영상이 아닌 파일, 알 수 없는 렌디션
+    """
+    output_dir = OUTPUT_DIR.resolve()
+    file_path = (output_dir / filename).resolve()
+    # 작업/카탈로그 DB, 매니페스트 등 영상 외 파일은 내려주지 않음
+    if file_path.parent != output_dir or file_path.suffix != '.mp4':
+        raise ValueError('잘못된 파일명입니다')
+    if rendition:
+        resolve_renditions([rendition])
+        file_path = rendition_path(file_path, rendition)
+    return file_path
+
+
+def file_etag(file_path: Path) -> str:
+    """
+    강한 ETag (출력 파일은 고유한 이름으로 한 번만 쓰이므로 크기/수정 시각으로 충분, 내용 해시 불필요)
+    nginx 정적 파일 ETag와 같은 형식이라 X-Accel-Redirect로 넘겨도 재검증이 일치
+    """
+    stat = file_path.stat()
+    return f"{int(stat.st_mtime):x}-{stat.st_size:x}"
+
+
+@app.route('/api/download/<filename>', methods=['GET', 'HEAD'])
 def download_video(filename):
-    """생성된 영상 다운로드"""
+    """
+    생성된 영상 다운로드
+    ?rendition=720p | poster 등을 주면 해당 영상의 렌디션 파일 반환
+    Range(206)/If-None-Match(304)/HEAD 지원, 본문은 sendfile 또는 X-Accel-Redirect로 전송
+    """
     try:
-        file_path = OUTPUT_DIR / filename
-        if file_path.exists():
-            return send_file(file_path, as_attachment=True)
-        else:
+        try:
+            file_path = output_file(filename, request.args.get('rendition'))
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
+        if not file_path.exists():
             return jsonify({'status': 'error', 'message': '파일을 찾을 수 없습니다'}), 404
+        
+        etag = file_etag(file_path)
+        if DOWNLOAD_SETTINGS['accel_redirect']:
+            # 앞단 nginx가 Range 처리와 전송을 맡음 (워커는 헤더만 보내고 바로 다음 요청 처리)
+            response = app.response_class(mimetype=mimetypes.guess_type(file_path.name)[0])
+            response.set_etag(etag)
+            response.make_conditional(request)
+            if response.status_code == 200:
+                response.headers['X-Accel-Redirect'] = (
+                    f"{DOWNLOAD_SETTINGS['accel_redirect'].rstrip('/')}/{file_path.name}"
+                )
+                response.headers['Content-Disposition'] = f'attachment; filename="{file_path.name}"'
+        else:
+            # conditional: Range → 206, If-None-Match → 304 / 전체 전송은 gunicorn이 wsgi.file_wrapper로 sendfile
+            response = send_file(file_path, as_attachment=True, etag=etag, conditional=True,
+                                 max_age=DOWNLOAD_SETTINGS['max_age'])
+        response.headers['Cache-Control'] = f"public, max-age={DOWNLOAD_SETTINGS['max_age']}, immutable"
+        return response
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 
 @app.route('/api/videos')
 def list_videos():
-    """생성된 영상 목록 조회"""
+    """
+    생성된 영상 목록 조회 (영상 카탈로그, 최신순 커서 페이지네이션)
+    ?limit=50&cursor=<next_cursor>&category=economy&profile=final&since=<timestamp>&until=<timestamp>
+    """
     try:
-        videos = []
-        for video_file in OUTPUT_DIR.glob('*.mp4'):
-            videos.append({
-                'filename': video_file.name,
-                'size': video_file.stat().st_size,
-                'created': video_file.stat().st_ctime
-            })
-        
-        # 최신순 정렬
-        videos.sort(key=lambda x: x['created'], reverse=True)
+        args = request.args
+        try:
+            page = get_video_catalog().list(
+                limit=args.get('limit', type=int),
+                cursor=args.get('cursor'),
+                since=float(args['since']) if args.get('since') else None,
+                until=float(args['until']) if args.get('until') else None,
+                category=args.get('category'),
+                profile=args.get('profile'),
+            )
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
         
         return jsonify({
             'status': 'success',
-            'videos': videos
+            'videos': page['videos'],
+            'next_cursor': page['next_cursor']
         })
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
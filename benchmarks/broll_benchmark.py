@@ -0,0 +1,84 @@
+"""
+B-roll 라이브러리 벤치마크
+합성 라이브러리(빈 클립 파일 + 사이드카 태그)로 최초 색인, 변경 없는 갱신, 인덱스 로드,
+문장 단위 검색 시간을 측정 (ffmpeg/네트워크 불필요 - 사이드카에 길이/해상도 포함)
+
+사용법:
+    python benchmarks/broll_benchmark.py [--clips 20000] [--dirs 50] [--sentences 200]
+"""
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.broll_library import BrollLibrary
+
+
+WORDS = [
+    '경제', '주식', '주식시장', '금리', '부동산', '아파트', '환율', '반도체', '수출', '물가',
+    '국회', '대통령', '선거', '외교', '정상회담', '법원', '검찰', '경찰', '사고', '화재',
+    '태풍', '폭우', '지진', '날씨', '교통', '지하철', '공항', '항구', '병원', '학교',
+    '축구', '야구', '올림픽', '공연', '영화', '전시', '여행', '음식', '시장', '농업',
+    'city', 'night', 'crowd', 'office', 'factory', 'server', 'drone', 'aerial', 'traffic', 'market',
+]
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='B-roll 라이브러리 벤치마크')
+    parser.add_argument('--clips', type=int, default=20000)
+    parser.add_argument('--dirs', type=int, default=50)
+    parser.add_argument('--sentences', type=int, default=200)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        source_dir, cache_dir = tmp / 'broll', tmp / 'cache'
+        for index in range(args.clips):
+            directory = source_dir / f"set_{index % args.dirs:03d}"
+            directory.mkdir(parents=True, exist_ok=True)
+            clip = directory / f"clip_{index:06d}.mp4"
+            clip.touch()
+            clip.with_suffix('.json').write_text(json.dumps({
+                'tags': rng.sample(WORDS, 3),
+                'duration': round(rng.uniform(3, 20), 2), 'width': 1920, 'height': 1080,
+            }, ensure_ascii=False), encoding='utf-8')
+
+        library = BrollLibrary(source_dir, cache_dir)
+        results = [
+            ('initial index', timed(library.refresh)),
+            ('refresh (unchanged)', timed(library.refresh)),
+        ]
+        (source_dir / 'set_000' / 'clip_new_주식.mp4').touch()
+        results.append(('refresh (1 new clip)', timed(library.refresh)))
+        results.append(('load index', timed(lambda: BrollLibrary(source_dir, cache_dir))))
+
+        sentences = [
+            ' '.join(rng.sample(WORDS, 4)) + '에 대한 소식입니다' for _ in range(args.sentences)
+        ]
+        keywords = rng.sample(WORDS, 5)
+        lookup = timed(lambda: [library.search(sentence, keywords) for sentence in sentences])
+        select = timed(lambda: library.select(sentences, keywords))
+
+    summary = library.describe()
+    print(f"\n{summary['clips']} clips, {args.dirs} dirs, {summary['terms']} terms")
+    print(f"{'operation':<24}{'ms':>12}")
+    for name, seconds in results:
+        print(f"{name:<24}{seconds * 1000:>12.1f}")
+    print(f"{'search / sentence':<24}{lookup * 1000 / len(sentences):>12.3f}")
+    print(f"{'select / sentence':<24}{select * 1000 / len(sentences):>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
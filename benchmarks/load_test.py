@@ -0,0 +1,442 @@
+"""
+API 부하 테스트
+로컬 스텁 서버(기사 HTML/이미지, OpenAI 호환 LLM, ElevenLabs 호환 TTS)를 띄우고 app.py를 gunicorn으로 실행한 뒤
+/api/preview, /api/generate에 설정한 동시성/도착률로 요청을 보내 처리량, 지연시간(p50/p95/p99),
+에러율, 서버 RSS(워커 + ffmpeg 자식 프로세스)를 측정하고, 동시 작업의 출력이 서로 섞이지 않았는지 확인
+(네트워크 불필요 - 앱 실행 환경(ffmpeg, NLTK 데이터 등)만 있으면 오프라인 리눅스 한 대에서 실행)
+
+사용법:
+    python benchmarks/load_test.py [--requests 40] [--concurrency 4] [--rate 0.5]
+                                   [--mix preview=0.7,generate=0.3] [--workers 2] [--threads 4]
+"""
+import os
+import io
+import re
+import sys
+import json
+import time
+import random
+import shutil
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+import statistics
+from pathlib import Path
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from modules.ffmpeg_utils import ffmpeg_binary
+from modules.memory_monitor import process_rss, child_pids
+from modules.render_manifest import load_manifest
+
+
+MARKER = re.compile(r'LT\d{5}')
+
+
+def marker(n: int) -> str:
+    """기사별 식별 문자열 (제목/본문/스크립트에 들어가 출력이 어느 요청 것인지 확인)"""
+    return f"LT{n:05d}"
+
+
+# ---------------------------------------------------------------------------
+# 스텁 서버
+# ---------------------------------------------------------------------------
+
+class StubHandler(BaseHTTPRequestHandler):
+    """스텁 서버 공통 (응답 지연, 로그 끔)"""
+
+    latency = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def respond(self, body: bytes, content_type: str, status: int = 200):
+        time.sleep(self.latency)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ArticleHandler(StubHandler):
+    """GET /article/<n> → 기사 HTML, GET /img/<n>.jpg → 기사 이미지"""
+
+    images = {}
+    lock = threading.Lock()
+
+    def do_GET(self):
+        match = re.fullmatch(r'/article/(\d+)', self.path)
+        if match:
+            n = int(match.group(1))
+            return self.respond(article_html(n, self.server_address[1]).encode('utf-8'),
+                                'text/html; charset=utf-8')
+        match = re.fullmatch(r'/img/(\d+)\.jpg', self.path)
+        if match:
+            return self.respond(self.image(int(match.group(1)) % 8), 'image/jpeg')
+        self.respond(b'not found', 'text/plain', 404)
+
+    @classmethod
+    def image(cls, index: int) -> bytes:
+        with cls.lock:
+            if index not in cls.images:
+                from PIL import Image
+                buffer = io.BytesIO()
+                color = ((index * 53) % 256, (index * 97) % 256, (index * 151) % 256)
+                Image.new('RGB', (1280, 720), color).save(buffer, 'JPEG', quality=85)
+                cls.images[index] = buffer.getvalue()
+            return cls.images[index]
+
+
+def article_html(n: int, port: int) -> str:
+    tag = marker(n)
+    paragraphs = ''.join(
+        f"<p>{tag} 부하 테스트 기사 {n}의 {i + 1}번째 문단입니다. "
+        f"정부는 오늘 관련 대책을 발표했으며 시장은 이번 발표에 주목하고 있습니다.</p>"
+        for i in range(6)
+    )
+    images = ''.join(
+        f'<img src="http://127.0.0.1:{port}/img/{n * 3 + i}.jpg" width="1280">' for i in range(3)
+    )
+    return (
+        f"<html><head><title>{tag} 부하 테스트 기사 {n}</title>"
+        f'<meta name="keywords" content="경제,정부,시장"></head>'
+        f"<body><article><h1>{tag} 부하 테스트 기사 {n}</h1>{images}{paragraphs}</article></body></html>"
+    )
+
+
+class LLMHandler(StubHandler):
+    """POST /v1/chat/completions (OpenAI 호환) → 프롬프트의 기사 식별 문자열을 넣은 스크립트"""
+
+    sentences = 5
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        prompt = ' '.join(message.get('content', '') for message in request.get('messages', []))
+        found = MARKER.search(prompt)
+        tag = found.group(0) if found else 'LT?????'
+        # ScriptGenerator: 인트로 max_tokens=100, 본문 나레이션 max_tokens=500
+        if request.get('max_tokens', 0) > 100:
+            content = ' '.join(
+                f"{tag} 본문 {i + 1}번째 문장으로 주요 내용을 전해드립니다." for i in range(self.sentences)
+            )
+        else:
+            content = f"{tag} 속보입니다. 지금 확인해 보시죠"
+        body = {
+            'id': 'chatcmpl-stub', 'object': 'chat.completion', 'created': int(time.time()),
+            'model': request.get('model', 'stub'),
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': content}}],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0},
+        }
+        self.respond(json.dumps(body, ensure_ascii=False).encode('utf-8'), 'application/json')
+
+
+class TTSHandler(StubHandler):
+    """POST /v1/text-to-speech/<voice> (ElevenLabs 호환) → 텍스트 길이에 비례한 MP3"""
+
+    clips = {}
+    lock = threading.Lock()
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        seconds = min(8.0, max(1.0, round(len(request.get('text', '')) * 0.12 * 2) / 2))
+        self.respond(self.clip(seconds), 'audio/mpeg')
+
+    @classmethod
+    def clip(cls, seconds: float) -> bytes:
+        with cls.lock:
+            if seconds not in cls.clips:
+                result = subprocess.run(
+                    [ffmpeg_binary(), '-loglevel', 'error', '-f', 'lavfi',
+                     '-i', f"sine=frequency=440:duration={seconds}", '-ac', '1', '-ar', '22050',
+                     '-c:a', 'libmp3lame', '-b:a', '64k', '-f', 'mp3', 'pipe:1'],
+                    stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True
+                )
+                cls.clips[seconds] = result.stdout
+            return cls.clips[seconds]
+
+
+def start_stub(handler: type, latency: float) -> ThreadingHTTPServer:
+    handler = type(handler.__name__, (handler,), {'latency': latency})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ---------------------------------------------------------------------------
+# 앱 서버
+# ---------------------------------------------------------------------------
+
+def free_port() -> int:
+    """비어 있는 TCP 포트"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_app(args, env: dict, port: int) -> subprocess.Popen:
+    if args.server == 'gunicorn':
+        cmd = [sys.executable, '-m', 'gunicorn', 'app:app', '--bind', f"127.0.0.1:{port}",
+               '--workers', str(args.workers), '--threads', str(args.threads), '--timeout', '900']
+    else:
+        cmd = [sys.executable, 'app.py']
+    log = open(Path(env['OUTPUT_DIR']) / 'server.log', 'wb')
+    return subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+def wait_ready(base_url: str, server: subprocess.Popen, timeout: float = 120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("앱 서버가 시작 중 종료되었습니다 (OUTPUT_DIR/server.log 확인)")
+        try:
+            if requests.get(f"{base_url}/api/videos", timeout=2).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError("앱 서버 시작 시간 초과")
+
+
+class RSSSampler:
+    """서버 프로세스 + 자식 프로세스(gunicorn 워커, ffmpeg) RSS 합계 샘플링"""
+
+    def __init__(self, pid: int, interval: float = 0.2):
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            total = process_rss(self.pid) + sum(process_rss(pid) for pid in child_pids(self.pid))
+            self.samples.append(total / 1048576)
+
+
+# ---------------------------------------------------------------------------
+# 부하 생성 / 검증
+# ---------------------------------------------------------------------------
+
+def parse_mix(text: str) -> list:
+    mix = []
+    for item in text.split(','):
+        name, _, weight = item.partition('=')
+        if name not in ('preview', 'generate'):
+            raise SystemExit(f"알 수 없는 엔드포인트: {name}")
+        mix.append((name, float(weight or 1)))
+    return mix
+
+
+def send(base_url: str, endpoint: str, n: int, article_url: str, args) -> dict:
+    """요청 하나 전송 후 응답 검증"""
+    body = {'url': article_url}
+    if endpoint == 'generate':
+        body['profile'] = args.render_profile
+    started = time.perf_counter()
+    try:
+        response = requests.post(f"{base_url}/api/{endpoint}", json=body, timeout=args.timeout)
+        data = response.json()
+    except (requests.RequestException, ValueError) as e:
+        return {'endpoint': endpoint, 'n': n, 'ok': False, 'error': type(e).__name__,
+                'seconds': time.perf_counter() - started}
+    result = {'endpoint': endpoint, 'n': n, 'seconds': time.perf_counter() - started,
+              'ok': response.status_code == 200 and data.get('status') == 'success',
+              'error': None if response.status_code == 200 else f"HTTP {response.status_code}",
+              'data': data}
+    if not result['ok'] and not result['error']:
+        result['error'] = data.get('message', 'error')[:80]
+    return result
+
+
+def verify(result: dict, output_dir: Path, article_url: str) -> list:
+    """응답이 자기 기사로 만들어졌는지 확인 (다른 요청의 기사/스크립트/출력과 섞였으면 문제 목록)"""
+    tag = marker(result['n'])
+    data = result['data']
+    problems = []
+    if result['endpoint'] == 'preview':
+        if tag not in data.get('article', {}).get('title', ''):
+            problems.append('기사 제목 불일치')
+        if not all(tag in sentence for sentence in data.get('scripts', {}).get('narration', [])):
+            problems.append('스크립트 불일치')
+        return problems
+
+    path = output_dir / data.get('filename', '')
+    if not path.is_file() or path.stat().st_size == 0:
+        return ['출력 파일 없음']
+    try:
+        manifest = load_manifest(path)
+    except (FileNotFoundError, ValueError) as e:
+        return [str(e)]
+    if manifest['article'].get('url') != article_url:
+        problems.append('매니페스트 기사 불일치')
+    narration = manifest['scripts'].get('narration', [])
+    if not narration or not all(tag in sentence for sentence in narration):
+        problems.append('매니페스트 스크립트 불일치')
+    return problems
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='API 부하 테스트 (로컬 스텁 백엔드)')
+    parser.add_argument('--requests', type=int, default=40, help='총 요청 수')
+    parser.add_argument('--concurrency', type=int, default=4, help='동시에 진행 중인 최대 요청 수')
+    parser.add_argument('--rate', type=float, default=0.0,
+                        help='도착률 req/s (포아송, 0이면 동시성만큼 연속 요청)')
+    parser.add_argument('--mix', default='preview=0.7,generate=0.3')
+    parser.add_argument('--render-profile', default='draft', choices=['draft', 'final'])
+    parser.add_argument('--server', default='gunicorn', choices=['gunicorn', 'flask'])
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn 워커 수')
+    parser.add_argument('--threads', type=int, default=4, help='gunicorn 워커당 스레드 수')
+    parser.add_argument('--articles', type=int, default=0, help='기사 종류 수 (0이면 요청마다 다른 기사)')
+    parser.add_argument('--article-latency', type=float, default=0.05)
+    parser.add_argument('--llm-latency', type=float, default=0.5)
+    parser.add_argument('--tts-latency', type=float, default=0.2)
+    parser.add_argument('--timeout', type=float, default=900)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--keep', action='store_true', help='출력/캐시 디렉토리 보존')
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    article_server = start_stub(ArticleHandler, args.article_latency)
+    llm_server = start_stub(LLMHandler, args.llm_latency)
+    tts_server = start_stub(TTSHandler, args.tts_latency)
+    article_base = f"http://127.0.0.1:{article_server.server_address[1]}"
+
+    work_dir = Path(tempfile.mkdtemp(prefix='loadtest_'))
+    output_dir, cache_dir = work_dir / 'output', work_dir / 'cache'
+    output_dir.mkdir()
+    port = free_port()
+    env = {
+        **os.environ,
+        'PORT': str(port), 'FLASK_DEBUG': 'False',
+        'OUTPUT_DIR': str(output_dir), 'CACHE_DIR': str(cache_dir),
+        'OPENAI_API_KEY': 'stub', 'OPENAI_BASE_URL': f"http://127.0.0.1:{llm_server.server_address[1]}/v1",
+        'TTS_BACKEND': 'elevenlabs', 'ELEVENLABS_API_KEY': 'stub', 'ELEVENLABS_VOICE_ID': 'stub',
+        'ELEVENLABS_API_BASE': f"http://127.0.0.1:{tts_server.server_address[1]}",
+        'PYTHONUNBUFFERED': '1',
+    }
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_app(args, env, port)
+    sampler = RSSSampler(server.pid)
+    results = []
+    try:
+        wait_ready(base_url, server)
+        sampler.start()
+
+        mix = parse_mix(args.mix)
+        names, weights = [name for name, _ in mix], [weight for _, weight in mix]
+        plan = [
+            (rng.choices(names, weights)[0], rng.randrange(args.articles) if args.articles else index)
+            for index in range(args.requests)
+        ]
+
+        def run(item, scheduled: float = None):
+            endpoint, n = item
+            article_url = f"{article_base}/article/{n}"
+            result = send(base_url, endpoint, n, article_url, args)
+            if scheduled is not None:
+                # 열린 부하: 예정 도착 시각부터 측정 (동시성 한도에서 기다린 시간 포함)
+                result['seconds'] = time.perf_counter() - scheduled
+            if result['ok']:
+                result['problems'] = verify(result, output_dir, article_url)
+            return result
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            if args.rate > 0:
+                # 열린 부하: 포아송 도착 (앞 요청이 밀려도 다음 요청은 예정대로 도착)
+                futures, scheduled = [], started
+                for item in plan:
+                    scheduled += rng.expovariate(args.rate)
+                    time.sleep(max(0.0, scheduled - time.perf_counter()))
+                    futures.append(executor.submit(run, item, scheduled))
+                results = [future.result() for future in futures]
+            else:
+                results = list(executor.map(run, plan))
+        elapsed = time.perf_counter() - started
+    finally:
+        sampler.stop()
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        for stub in (article_server, llm_server, tts_server):
+            stub.shutdown()
+
+    report(results, elapsed, sampler.samples, args)
+    if args.keep:
+        print(f"\n출력/캐시 보존: {work_dir}")
+    else:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def report(results: list, elapsed: float, rss: list, args):
+    by_endpoint = defaultdict(list)
+    for result in results:
+        by_endpoint[result['endpoint']].append(result)
+
+    # 같은 출력 파일을 받은 generate 요청 (동시 작업 출력 충돌)
+    outputs = defaultdict(list)
+    for result in by_endpoint.get('generate', []):
+        if result['ok']:
+            outputs[result['data'].get('filename')].append(result['n'])
+    collisions = {name: ns for name, ns in outputs.items() if len(ns) > 1}
+
+    mode = f"rate {args.rate}/s" if args.rate > 0 else 'closed loop'
+    print(f"\n{len(results)} requests, concurrency {args.concurrency}, {mode}, "
+          f"{args.server} {args.workers}x{args.threads}, {elapsed:.1f}s")
+    print(f"{'endpoint':<10}{'n':>5}{'req/s':>8}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}"
+          f"{'errors':>8}{'wrong':>7}")
+    for endpoint, items in sorted(by_endpoint.items()):
+        latencies = [item['seconds'] for item in items if item['ok']]
+        errors = sum(1 for item in items if not item['ok'])
+        wrong = sum(1 for item in items if item.get('problems'))
+        print(f"{endpoint:<10}{len(items):>5}{len(items) / elapsed:>8.2f}"
+              f"{percentile(latencies, 50):>8.2f}{percentile(latencies, 95):>8.2f}"
+              f"{percentile(latencies, 99):>8.2f}{max(latencies, default=0):>8.2f}"
+              f"{errors / len(items):>8.1%}{wrong:>7}")
+    if rss:
+        print(f"server RSS (workers + ffmpeg): peak {max(rss):.0f}MB, mean {statistics.mean(rss):.0f}MB")
+
+    errors = defaultdict(int)
+    for result in results:
+        if not result['ok']:
+            errors[result['error']] += 1
+        for problem in result.get('problems') or []:
+            errors[f"검증 실패: {problem}"] += 1
+    for name, ns in collisions.items():
+        errors[f"출력 충돌: {name} ← 기사 {ns}"] += 1
+    for message, count in sorted(errors.items(), key=lambda item: -item[1]):
+        print(f"  {count:>4} × {message}")
+    if not errors:
+        print("all outputs verified (독립된 출력, 기사/스크립트 일치)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Ken Burns 모션 벤치마크
+프레임 생성 속도(fps)를 기존 방식(프레임마다 전체 이미지 리사이즈)과
+미리 계산한 크롭 경로 + 오버샘플링 소스 방식, 정지 프레임 기준으로 비교하고
+ffmpeg 경로의 필터 비용(zoompan)과 segments 엔진 정지/모션 세그먼트 인코딩 시간을 비교
+
+사용법:
+    python benchmarks/motion_benchmark.py [--frames 90] [--transition fast]
+"""
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import VIDEO_SETTINGS
+from modules.image_cache import ImageCache
+from modules.ffmpeg_utils import run_ffmpeg
+from modules.motion import KenBurns, crop_boxes, source_size, zoompan_filter
+from modules.segment_renderer import SegmentRenderer
+
+
+def timed(func, frames: int) -> float:
+    """frames개 프레임 생성 fps"""
+    start = time.perf_counter()
+    for index in range(frames):
+        func(index)
+    return frames / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ken Burns 모션 벤치마크')
+    parser.add_argument('--frames', type=int, default=90)
+    parser.add_argument('--transition', default='fast')
+    parser.add_argument('--no-encode', action='store_true', help='ffmpeg 인코딩 비교 생략')
+    args = parser.parse_args()
+
+    width, height, fps = VIDEO_SETTINGS['width'], VIDEO_SETTINGS['height'], VIDEO_SETTINGS['fps']
+    rng = np.random.default_rng(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        source = tmp / 'source.jpg'
+        # 사진에 가까운 부드러운 그라디언트 + 도형 (노이즈는 인코딩 비용을 과장함)
+        y, x = np.mgrid[0:1200, 0:1600]
+        pattern = np.stack([x * 255 / 1600, y * 255 / 1200, 128 + 100 * np.sin(x / 60) * np.cos(y / 45)], axis=-1)
+        pattern += rng.normal(0, 4, pattern.shape)
+        Image.fromarray(np.clip(pattern, 0, 255).astype(np.uint8)).save(source, quality=90)
+
+        cache = ImageCache(width, height, cache_dir=tmp / 'cache')
+        still_path = cache.prepare(str(source))
+        motion_path = cache.prepare(str(source), source_size(width, height))
+
+        # 기존 방식: 출력 크기 프레임을 매 프레임 zoom 배율로 통째로 리사이즈 후 중앙 크롭
+        still = Image.open(still_path).convert('RGB')
+        boxes = crop_boxes(args.frames, (width, height), args.transition)
+        zooms = width / (boxes[:, 2] - boxes[:, 0])
+
+        def slow_frame(index):
+            zoom = zooms[index]
+            scaled = still.resize((int(width * zoom), int(height * zoom)), Image.LANCZOS)
+            left = (scaled.width - width) // 2
+            top = (scaled.height - height) // 2
+            return np.asarray(scaled.crop((left, top, left + width, top + height)))
+
+        motion = KenBurns(motion_path, width, height, fps, args.frames, args.transition)
+        still_array = np.asarray(still)
+
+        results = [
+            ('static still', timed(lambda index: still_array.copy(), args.frames)),
+            ('full resize (old)', timed(slow_frame, args.frames)),
+            ('crop path (new)', timed(motion.frame, args.frames)),
+        ]
+
+        print(f"\n{width}x{height}, {args.frames} frames, transition={args.transition}")
+        print(f"{'frame source':<20}{'fps':>10}")
+        for name, rate in results:
+            print(f"{name:<20}{rate:>10.1f}")
+
+        if args.no_encode:
+            return
+
+        # 필터만 (인코딩 없이 null 출력): 모션 프레임 생성 비용
+        filters = [
+            ('still (tpad)', still_path, f"format=yuv420p,tpad=stop_mode=clone:stop={args.frames - 1}"),
+            ('zoompan', motion_path,
+             f"{zoompan_filter(args.frames, width, height, fps, args.transition)},format=yuv420p"),
+        ]
+        print(f"\n{'ffmpeg filter only':<20}{'seconds':>10}")
+        for name, path, chain in filters:
+            start = time.perf_counter()
+            run_ffmpeg(['-framerate', fps, '-i', path, '-vf', chain,
+                        '-frames:v', args.frames, '-f', 'null', '-'], name)
+            print(f"{name:<20}{time.perf_counter() - start:>10.2f}")
+
+        renderer = SegmentRenderer(width, height, fps, workers=1)
+        base = {'kind': 'body', 'index': 0, 'start': 0.0, 'duration': args.frames / fps, 'subtitle': None}
+        segments = [
+            ('still', {**base, 'visual': {'type': 'image', 'source': str(source), 'path': still_path}}),
+            ('zoompan', {**base, 'visual': {'type': 'image', 'source': str(source), 'path': motion_path,
+                                            'motion': args.transition, 'variant': 0}}),
+        ]
+        print(f"\n{'segment encode':<20}{'seconds':>10}")
+        for name, segment in segments:
+            start = time.perf_counter()
+            renderer.encode_segment(segment, args.frames, None, tmp / f'{name}.mp4')
+            print(f"{name:<20}{time.perf_counter() - start:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
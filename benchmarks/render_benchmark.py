@@ -0,0 +1,101 @@
+"""
+렌더 엔진 벤치마크
+합성 작업(사인파 나레이션 + 로컬 이미지)으로 moviepy / ffmpeg / segments / stream 엔진의
+렌더링 시간, 출력 길이, 최대 메모리(프로세스 + ffmpeg 자식 RSS)를 비교 (네트워크/API 키 불필요)
+
+사용법:
+    python benchmarks/render_benchmark.py [moviepy ffmpeg segments stream] [--sentences 6] [--profile final] [--renditions 720p,poster]
+"""
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import AUDIO_SETTINGS, ensure_directories
+from modules.audio_utils import write_pcm
+from modules.ffmpeg_utils import probe_duration
+from modules.subtitle_generator import SubtitleGenerator
+from modules.video_composer import VideoComposer
+
+
+def make_job(workdir: Path, sentences: int) -> dict:
+    """합성 작업 입력(오디오/자막/이미지) 생성"""
+    sample_rate = AUDIO_SETTINGS['sample_rate']
+    rng = np.random.default_rng(0)
+
+    def tone(seconds, freq):
+        t = np.arange(int(seconds * sample_rate)) / sample_rate
+        mono = 0.2 * np.sin(2 * np.pi * freq * t).astype(np.float32)
+        return np.repeat(mono[:, None], AUDIO_SETTINGS['channels'], axis=1)
+
+    scripts = {
+        'intro': '속보입니다. 벤치마크 뉴스입니다.',
+        'narration': [f'{i + 1}번째 문장입니다.' for i in range(sentences)],
+        'outro': '구독과 좋아요로 더 많은 뉴스를 받아보세요',
+    }
+    audio_files = {
+        'intro': write_pcm(workdir / 'intro.wav', tone(3.0, 220)),
+        'narration': [
+            write_pcm(workdir / f'narration_{i}.wav', tone(3.0 + 0.37 * i, 330 + 20 * i))
+            for i in range(sentences)
+        ],
+        'outro': write_pcm(workdir / 'outro.wav', tone(4.0, 440)),
+    }
+
+    images = []
+    for i in range(3):
+        array = rng.integers(0, 255, (720, 1280, 3), dtype=np.uint8)
+        path = workdir / f'image_{i}.jpg'
+        Image.fromarray(array).save(path, quality=90)
+        images.append(str(path))
+
+    subtitles = SubtitleGenerator().generate(scripts, audio_files)
+    return {
+        'scripts': scripts,
+        'audio_files': audio_files,
+        'subtitles': subtitles,
+        'broll_data': {'images': images, 'stock_videos': []},
+        'article': {'title': '벤치마크', 'category': 'economy'},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='렌더 엔진 벤치마크')
+    parser.add_argument('engines', nargs='*', default=['moviepy', 'ffmpeg', 'segments', 'stream'])
+    parser.add_argument('--sentences', type=int, default=6)
+    parser.add_argument('--profile', default=None, help='렌더 프로필 (draft | final)')
+    parser.add_argument('--renditions', default=None, help='추가 렌디션 (쉼표 구분, 예: 720p,poster)')
+    args = parser.parse_args()
+    ensure_directories()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        job = make_job(Path(tmp), args.sentences)
+        composer = VideoComposer(profile=args.profile)
+        expected = composer.build_plan(
+            job['audio_files'], job['subtitles'], job['broll_data'], job['article']
+        )['duration']
+
+        renditions = [r for r in args.renditions.split(',') if r] if args.renditions is not None else None
+        results = []
+        for engine in args.engines:
+            stats = {}
+            start = time.perf_counter()
+            output = composer.compose(**job, engine=engine, renditions=renditions, stats=stats)
+            elapsed = time.perf_counter() - start
+            results.append((engine, elapsed, probe_duration(output), stats['memory'], output))
+
+    print(f"\n계획 길이: {expected:.3f}s")
+    print(f"{'engine':<10}{'render(s)':>11}{'output(s)':>11}{'x realtime':>12}{'peak MB':>10}{'ffmpeg MB':>11}")
+    for engine, elapsed, duration, memory, output in results:
+        print(f"{engine:<10}{elapsed:>11.2f}{duration or 0:>11.3f}{expected / elapsed:>12.1f}"
+              f"{memory['peak_rss_mb']:>10.0f}{memory['peak_children_mb']:>11.0f}  {output.name}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+시작 비용 벤치마크
+새 인터프리터에서 `import app` 시간, 워밍업(gunicorn 마스터 preload) 시간, 첫 요청/두 번째 요청 지연시간과
+import 시간이 큰 모듈(-X importtime)을 측정 (로컬 스텁 기사/LLM 서버 사용, 네트워크 불필요)
+
+    cold: import 직후 첫 요청 (워밍업 없음 - 첫 요청이 단계 모듈 import/생성을 떠안음)
+    warm: 워밍업 후 첫 요청 (gunicorn.conf.py가 fork 전에 하는 것과 같음)
+
+사용법:
+    python benchmarks/startup_benchmark.py [--runs 3] [--top 15]
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+import statistics
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from load_test import ArticleHandler, LLMHandler, start_stub
+
+
+# 측정용 자식 프로세스 (결과를 JSON 한 줄로 출력)
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app
+result = {'import': time.perf_counter() - started}
+if sys.argv[1] == 'warm':
+    started = time.perf_counter()
+    app.warm_up()
+    result['warm_up'] = time.perf_counter() - started
+client = app.app.test_client()
+for name, url in (('first', sys.argv[2]), ('second', sys.argv[3])):
+    started = time.perf_counter()
+    response = client.post('/api/preview', json={'url': url})
+    result[name] = time.perf_counter() - started
+    result[name + '_status'] = response.status_code
+print(json.dumps(result))
+"""
+
+
+def probe(mode: str, env: dict, urls: tuple) -> dict:
+    result = subprocess.run([sys.executable, '-c', PROBE, mode, *urls], cwd=ROOT, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'probe 실패')
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def import_times(env: dict, top: int) -> list:
+    """-X importtime 결과에서 누적 import 시간이 큰 최상위 패키지"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    packages = {}
+    for line in result.stderr.splitlines():
+        parts = line[len('import time:'):].split('|')
+        if not line.startswith('import time:') or len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        # 중첩 import는 이름 앞에 깊이만큼 공백이 붙음 → app이 직접 import한 모듈만
+        name = parts[2][1:]
+        if not name.startswith(' '):
+            packages[name] = int(parts[1]) / 1e6
+    return sorted(packages.items(), key=lambda item: -item[1])[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='시작 비용 벤치마크')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    article_server = start_stub(ArticleHandler, 0.0)
+    llm_server = start_stub(LLMHandler, 0.0)
+    base = f"http://127.0.0.1:{article_server.server_address[1]}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            'OUTPUT_DIR': str(Path(tmp) / 'output'), 'CACHE_DIR': str(Path(tmp) / 'cache'),
+            'OPENAI_API_KEY': 'stub', 'OPENAI_BASE_URL': f"http://127.0.0.1:{llm_server.server_address[1]}/v1",
+        }
+        runs = {'cold': [], 'warm': []}
+        for index in range(args.runs):
+            for mode in runs:
+                urls = (f"{base}/article/{index * 2}", f"{base}/article/{index * 2 + 1}")
+                runs[mode].append(probe(mode, env, urls))
+        packages = import_times(env, args.top)
+
+    article_server.shutdown()
+    llm_server.shutdown()
+
+    print(f"\nmedian of {args.runs} runs (seconds)")
+    print(f"{'mode':<8}{'import app':>12}{'warm-up':>10}{'1st req':>10}{'2nd req':>10}{'status':>8}")
+    for mode, results in runs.items():
+        def median(key):
+            values = [result[key] for result in results if key in result]
+            return statistics.median(values) if values else 0.0
+        status = results[-1]['first_status']
+        print(f"{mode:<8}{median('import'):>12.3f}{median('warm_up'):>10.3f}"
+              f"{median('first'):>10.3f}{median('second'):>10.3f}{status:>8}")
+
+    print(f"\nimport app: slowest top-level imports (cumulative s)")
+    for name, seconds in packages:
+        print(f"  {name:<28}{seconds:>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
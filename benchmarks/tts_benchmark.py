@@ -0,0 +1,95 @@
+"""
+TTS 백엔드 벤치마크
+백엔드별 문장당 지연시간과 동시 처리량(throughput) 비교
+
+사용법:
+    python benchmarks/tts_benchmark.py [gtts elevenlabs local] [--rounds 3]
+"""
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.tts_backends import BACKENDS
+
+
+SAMPLE_SENTENCES = [
+    "속보입니다. 오늘 오전 국회에서 예산안이 통과됐습니다.",
+    "정부는 내년 경제성장률을 2퍼센트로 전망했습니다.",
+    "관련 당국은 조사를 진행 중입니다.",
+    "시장은 이번 발표에 긍정적으로 반응했습니다.",
+    "앞으로의 진행 상황을 지켜봐야 할 것 같습니다.",
+    "구독과 좋아요로 더 많은 뉴스를 받아보세요",
+]
+
+
+def bench_backend(name: str, rounds: int, workdir: Path) -> dict:
+    """단일 백엔드의 순차 지연시간 및 동시 처리량 측정"""
+    backend = BACKENDS[name]()
+    if not backend.is_available():
+        return {'backend': name, 'available': False}
+
+    # 순차 실행: 문장당 지연시간
+    latencies = []
+    for r in range(rounds):
+        for idx, text in enumerate(SAMPLE_SENTENCES):
+            path = workdir / f"{name}_seq_{r}_{idx}.{backend.extension}"
+            start = time.perf_counter()
+            backend.synthesize(text, path)
+            latencies.append(time.perf_counter() - start)
+
+    # 병렬 실행: 백엔드 동시성 한도까지 처리량
+    jobs = [
+        (text, workdir / f"{name}_par_{r}_{idx}.{backend.extension}")
+        for r in range(rounds)
+        for idx, text in enumerate(SAMPLE_SENTENCES)
+    ]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=backend.concurrency) as executor:
+        list(executor.map(lambda job: backend.synthesize(*job), jobs))
+    elapsed = time.perf_counter() - start
+
+    chars = sum(len(text) for text, _ in jobs)
+    return {
+        'backend': name,
+        'available': True,
+        'concurrency': backend.concurrency,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'max_ms': max(latencies) * 1000,
+        'segments_per_sec': len(jobs) / elapsed,
+        'chars_per_sec': chars / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TTS 백엔드 벤치마크')
+    parser.add_argument('backends', nargs='*', default=list(BACKENDS.keys()))
+    parser.add_argument('--rounds', type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = []
+        for name in args.backends:
+            try:
+                results.append(bench_backend(name, args.rounds, Path(tmp)))
+            except Exception as e:
+                results.append({'backend': name, 'available': False, 'error': str(e)})
+
+    print(f"{'backend':<12}{'conc':>6}{'p50(ms)':>10}{'max(ms)':>10}{'seg/s':>8}{'char/s':>9}")
+    for r in results:
+        if not r['available']:
+            print(f"{r['backend']:<12}  사용 불가 {r.get('error', '')}")
+            continue
+        print(
+            f"{r['backend']:<12}{r['concurrency']:>6}{r['p50_ms']:>10.0f}"
+            f"{r['max_ms']:>10.0f}{r['segments_per_sec']:>8.2f}{r['chars_per_sec']:>9.1f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -21,12 +21,101 @@ VIDEO_SETTINGS = {
     'height': int(os.getenv('VIDEO_HEIGHT', 1920)),
     'fps': int(os.getenv('VIDEO_FPS', 30)),
     'target_duration': int(os.getenv('TARGET_DURATION', 60)),
+    # 렌더 엔진: moviepy(Python 프레임 루프) | ffmpeg(단일 filter_complex 호출)
+    #           | segments(세그먼트별 인코딩 + 스트림 복사 연결, 정지 세그먼트 고속 경로)
+    #           | stream(세그먼트 순서대로 프레임을 인코더에 흘려보냄, 저메모리)
+    'engine': os.getenv('RENDER_ENGINE', 'moviepy'),
+    'codec': 'libx264',
+    'preset': os.getenv('VIDEO_PRESET', 'medium'),
+    'crf': int(os.getenv('VIDEO_CRF', 23)),
+    'pix_fmt': 'yuv420p',
+    'threads': int(os.getenv('VIDEO_THREADS', 4)),
+    # segments 엔진 병렬 인코딩 프로세스 수 (1이면 순차)
+    'workers': int(os.getenv('RENDER_WORKERS', os.cpu_count() or 1)),
+    # 메인 영상과 같은 합성 패스에서 함께 만드는 추가 렌디션 (RENDITIONS 키, 쉼표 구분)
+    'renditions': [name for name in os.getenv('OUTPUT_RENDITIONS', 'poster').split(',') if name],
+    # segments 엔진: 모든 세그먼트 인코딩 결과를 캐시해 스크립트 수정 후 재렌더링에서 바뀐 세그먼트만 인코딩
+    # (false면 작업마다 같은 아웃트로만 캐시)
+    'incremental': os.getenv('INCREMENTAL_RENDER', 'true').lower() in ('1', 'true', 'yes'),
+    # 세그먼트 캐시 최대 크기 MB (넘으면 오래 안 쓴 세그먼트부터 삭제, 0이면 제한 없음)
+    'segment_cache_mb': int(os.getenv('SEGMENT_CACHE_MAX_MB', 2048)),
+}
+
+# 렌더링 메모리 (작업마다 프로세스 + 자식 프로세스 최대 RSS 측정)
+MEMORY_SETTINGS = {
+    # RSS 합계 한도 MB (0이면 측정만, stream 엔진은 넘는 즉시 중단)
+    'budget_mb': int(os.getenv('RENDER_MEMORY_BUDGET_MB', 0)),
+    'sample_interval': float(os.getenv('MEMORY_SAMPLE_INTERVAL', 0.05)),
+}
+
+# 출력 렌디션 (메인 출력 = 렌더 프로필 해상도, 아래는 split으로 함께 인코딩하는 추가 출력)
+RENDITIONS = {
+    '720p': {'type': 'video', 'width': 720, 'height': 1280, 'crf': 24,
+             'maxrate': '3M', 'bufsize': '6M', 'audio_bitrate': '128k'},
+    '480p': {'type': 'video', 'width': 480, 'height': 854, 'crf': 26,
+             'maxrate': '1500k', 'bufsize': '3M', 'audio_bitrate': '96k'},
+    'poster': {'type': 'image', 'width': 1080, 'height': 1920, 'quality': 2},
+}
+
+# 렌더 프로필 (VIDEO_SETTINGS 위에 덮어쓰는 값)
+RENDER_PROFILES = {
+    # 편집 확인용 초안: 1/4 픽셀, 절반 프레임, 최저 인코딩 비용
+    'draft': {
+        'width': int(os.getenv('DRAFT_WIDTH', 540)),
+        'height': int(os.getenv('DRAFT_HEIGHT', 960)),
+        'fps': int(os.getenv('DRAFT_FPS', 15)),
+        'engine': os.getenv('DRAFT_ENGINE', 'segments'),
+        'preset': 'ultrafast',
+        'crf': int(os.getenv('DRAFT_CRF', 30)),
+        'renditions': [],
+        'output_prefix': 'draft',
+    },
+    # 배포용 최종본: VIDEO_SETTINGS 그대로
+    'final': {
+        'output_prefix': 'shorts',
+    },
+}
+DEFAULT_RENDER_PROFILE = os.getenv('RENDER_PROFILE', 'final')
+
+
+def render_settings(profile: str = None) -> dict:
+    """렌더 프로필을 적용한 VIDEO_SETTINGS 반환 (알 수 없는 프로필이면 ValueError)"""
+    profile = profile or DEFAULT_RENDER_PROFILE
+    if profile not in RENDER_PROFILES:
+        raise ValueError(f"알 수 없는 렌더 프로필: {profile} (사용 가능: {', '.join(RENDER_PROFILES)})")
+    return {**VIDEO_SETTINGS, **RENDER_PROFILES[profile]}
+
+
+# 오디오 설정 (TTS 결과는 이 포맷의 PCM WAV로 한 번만 정규화)
+AUDIO_SETTINGS = {
+    'sample_rate': int(os.getenv('AUDIO_SAMPLE_RATE', 44100)),
+    'channels': int(os.getenv('AUDIO_CHANNELS', 2)),
+    'codec': 'aac',
+    'bitrate': os.getenv('AUDIO_BITRATE', '192k'),
+    # 믹싱 (dBFS 기준)
+    'target_loudness': float(os.getenv('AUDIO_TARGET_LOUDNESS', -16.0)),
+    'peak_ceiling': -1.0,
+    'bgm_level': float(os.getenv('BGM_LEVEL', -24.0)),
+    'duck_gain': float(os.getenv('BGM_DUCK_GAIN', -12.0)),  # 음성 구간 BGM 감쇠량
+    'duck_attack': 0.08,   # 초
+    'duck_release': 0.35,  # 초
 }
 
 # 아바타 설정
 AVATAR_SETTINGS = {
     'intro_duration': int(os.getenv('INTRO_DURATION', 5)),
     'outro_duration': int(os.getenv('OUTRO_DURATION', 5)),
+    # 메자닌 키프레임 간격(초): 짧을수록 스트림 복사로 자를 수 있는 지점이 촘촘함
+    'gop_seconds': float(os.getenv('AVATAR_GOP_SECONDS', 0.5)),
+}
+
+# 로컬 B-roll 라이브러리 (BROLL_DIR 색인, 문장/기사 키워드로 클립 선택)
+BROLL_SETTINGS = {
+    'enabled': os.getenv('BROLL_LIBRARY', 'true').lower() in ('1', 'true', 'yes'),
+    # 디렉토리 변경 확인 최소 간격(초) - 바뀐 디렉토리만 다시 읽음
+    'refresh_interval': float(os.getenv('BROLL_REFRESH_INTERVAL', 60)),
+    # 클립 선택 최소 점수 (문장 단어 일치 2점, 기사 키워드 일치 1점)
+    'min_score': int(os.getenv('BROLL_MIN_SCORE', 2)),
 }
 
 # 디렉토리 설정
@@ -35,10 +124,50 @@ ASSETS_DIR = BASE_DIR / os.getenv('ASSETS_DIR', 'assets')
 AVATARS_DIR = ASSETS_DIR / 'avatars'
 BGM_DIR = ASSETS_DIR / 'bgm'
 BROLL_DIR = ASSETS_DIR / 'broll'
+FONTS_DIR = ASSETS_DIR / 'fonts'  # NanumGothicBold.ttf 등 자막 폰트
+CACHE_DIR = BASE_DIR / os.getenv('CACHE_DIR', 'cache')  # 디코딩/전처리 결과 캐시
+
+# 렌더 작업 큐 (SQLite, 웹 프로세스와 렌더 워커가 같은 볼륨의 DB 파일을 공유)
+JOB_SETTINGS = {
+    'db_path': Path(os.getenv('JOB_DB_PATH', str(OUTPUT_DIR / 'jobs.db'))),
+    # wal: 같은 호스트의 여러 프로세스 / delete: 네트워크 파일시스템(WAL 공유 메모리 미지원)
+    'journal_mode': os.getenv('JOB_DB_JOURNAL', 'wal'),
+    'lease_seconds': int(os.getenv('JOB_LEASE_SECONDS', 120)),
+    'heartbeat_interval': int(os.getenv('JOB_HEARTBEAT_INTERVAL', 20)),
+    'max_attempts': int(os.getenv('JOB_MAX_ATTEMPTS', 3)),
+    'backoff_seconds': int(os.getenv('JOB_BACKOFF_SECONDS', 30)),  # 재시도 대기 (시도마다 2배)
+    'poll_interval': float(os.getenv('JOB_POLL_INTERVAL', 2)),
+}
+
+# 생성 영상 카탈로그 (합성이 끝날 때 기록, /api/videos가 디렉토리 스캔 없이 조회)
+VIDEO_CATALOG_SETTINGS = {
+    'db_path': Path(os.getenv('VIDEO_CATALOG_PATH', str(OUTPUT_DIR / 'videos.db'))),
+    'journal_mode': os.getenv('JOB_DB_JOURNAL', 'wal'),  # 작업 큐와 같은 기준
+    'page_size': int(os.getenv('VIDEO_PAGE_SIZE', 50)),
+    'max_page_size': 200,
+}
+
+# 영상 다운로드 (출력 파일은 이름이 고유하고 바뀌지 않으므로 장기 캐시)
+DOWNLOAD_SETTINGS = {
+    'max_age': int(os.getenv('DOWNLOAD_MAX_AGE', 31536000)),  # 초 (기본 1년)
+    # 앞단 nginx의 internal location (예: /protected-output/) - 설정하면 파일 전송을 X-Accel-Redirect로 넘김
+    'accel_redirect': os.getenv('DOWNLOAD_ACCEL_REDIRECT', ''),
+}
+
+# 요청 단위 프로파일링 (X-Profile 헤더 / 작업 profile 플래그, X-Profile-Token이 PROFILE_TOKEN과 같을 때만)
+PROFILING_SETTINGS = {
+    'token': os.getenv('PROFILE_TOKEN', ''),  # 비어 있으면 프로파일링 비활성
+    'mode': os.getenv('PROFILE_MODE', 'sample'),  # sample (스택 샘플링) | cprofile
+    'sample_interval': float(os.getenv('PROFILE_SAMPLE_INTERVAL', 0.005)),
+    'dir': Path(os.getenv('PROFILE_DIR', str(OUTPUT_DIR / 'profiles'))),
+}
+
+
+def ensure_directories():
+    """디렉토리 생성 (import 시 파일시스템을 건드리지 않도록 렌더링을 시작할 때 호출)"""
+    for directory in [OUTPUT_DIR, ASSETS_DIR, AVATARS_DIR, BGM_DIR, BROLL_DIR, FONTS_DIR, CACHE_DIR]:
+        directory.mkdir(parents=True, exist_ok=True)
 
-# 디렉토리 생성
-for directory in [OUTPUT_DIR, ASSETS_DIR, AVATARS_DIR, BGM_DIR, BROLL_DIR]:
-    directory.mkdir(parents=True, exist_ok=True)
 
 # 템플릿 설정
 TEMPLATES = {
@@ -62,22 +191,66 @@ TEMPLATES = {
     }
 }
 
+# Ken Burns 모션 설정 (템플릿 transition별 줌/팬 곡선)
+MOTION_SETTINGS = {
+    # 기본 꺼짐: 정지 이미지는 segments 엔진 정지 세그먼트 고속 경로 (렌더 프로필 'motion': True로 프로필별 켜기)
+    'enabled': os.getenv('KEN_BURNS', 'false').lower() in ('1', 'true', 'yes'),
+    # 모션 소스 이미지를 출력 해상도의 몇 배로 캐시할지 (줌 최대값 이상, 클수록 떨림 감소)
+    'oversample': float(os.getenv('KEN_BURNS_OVERSAMPLE', 1.5)),
+    'transitions': {
+        # zoom: (시작, 끝) 배율, pan: 가로 이동량(화면 너비 대비), easing: linear | smooth
+        'fast': {'zoom': (1.0, 1.15), 'pan': 0.06, 'easing': 'linear'},
+        'gentle': {'zoom': (1.0, 1.06), 'pan': 0.0, 'easing': 'smooth'},
+        'professional': {'zoom': (1.03, 1.08), 'pan': 0.04, 'easing': 'smooth'},
+    },
+}
+
 # 자막 설정
 SUBTITLE_SETTINGS = {
     'font': 'NanumGothicBold',
+    'font_path': os.getenv('SUBTITLE_FONT_PATH', ''),  # 지정 시 폰트 검색 생략
     'font_size': 60,
     'color': 'white',
     'stroke_color': 'black',
     'stroke_width': 3,
     'position': ('center', 'bottom'),
     'padding': 100,
+    'max_width_ratio': 0.9,  # 화면 너비 대비 자막 최대 너비
+    'line_spacing': 1.25,
+    # overlay: Python 프레임 합성 | burn: ASS 파일을 인코딩 중 ffmpeg subtitles 필터로 입힘
+    'mode': os.getenv('SUBTITLE_MODE', 'overlay'),
+}
+
+# 템플릿별 자막 스타일 (TEMPLATES[...]['subtitle_style'] → SUBTITLE_SETTINGS 덮어쓰기)
+SUBTITLE_STYLES = {
+    'bold': {'font_size': 66, 'stroke_width': 4},
+    'smooth': {'font_size': 58, 'stroke_width': 2, 'color': '#FFF8E7'},
+    'clean': {'font_size': 56, 'stroke_width': 2},
 }
 
 # 나레이션 설정
 NARRATION_SETTINGS = {
-    'voice_id': 'ko-KR-Standard-A',  # Google TTS 기본값
-    'speaking_rate': 1.0,
-    'pitch': 0.0,
+    'voice_id': os.getenv('TTS_VOICE_ID', 'ko-KR-Standard-A'),  # Google TTS 기본값
+    'speaking_rate': float(os.getenv('TTS_SPEAKING_RATE', 1.0)),
+    'pitch': float(os.getenv('TTS_PITCH', 0.0)),
+}
+
+# TTS 백엔드 설정
+# backend: gtts(Google, 무료) | elevenlabs(유료, 고품질) | local(오프라인 espeak-ng/piper)
+TTS_SETTINGS = {
+    'backend': os.getenv('TTS_BACKEND', 'gtts'),
+    # 백엔드별 동시 요청 수 제한 (원격 서비스 rate limit 보호)
+    'concurrency': {
+        'gtts': int(os.getenv('TTS_GTTS_CONCURRENCY', 2)),
+        'elevenlabs': int(os.getenv('TTS_ELEVENLABS_CONCURRENCY', 3)),
+        'local': int(os.getenv('TTS_LOCAL_CONCURRENCY', os.cpu_count() or 2)),
+    },
+    'elevenlabs_api_base': os.getenv('ELEVENLABS_API_BASE', 'https://api.elevenlabs.io'),
+    'elevenlabs_voice_id': os.getenv('ELEVENLABS_VOICE_ID', ''),
+    'elevenlabs_model': os.getenv('ELEVENLABS_MODEL', 'eleven_multilingual_v2'),
+    'local_engine': os.getenv('TTS_LOCAL_ENGINE', 'espeak-ng'),  # espeak-ng | piper
+    'piper_model': os.getenv('PIPER_MODEL', ''),
+    'timeout': int(os.getenv('TTS_TIMEOUT', 30)),
 }
 
 # 스크립트 생성 프롬프트
@@ -114,3 +287,5 @@ SCRIPT_PROMPTS = {
 # Flask 설정
 SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
 DEBUG = os.getenv('FLASK_DEBUG', 'True') == 'True'
+# gunicorn 마스터에서 fork 전에 단계 모듈/인덱스 미리 로드 (gunicorn.conf.py)
+WARM_UP = os.getenv('WARM_UP', 'true').lower() in ('1', 'true', 'yes')
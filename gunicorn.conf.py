@@ -0,0 +1,23 @@
+"""
+gunicorn 설정 (gunicorn app:app 실행 시 자동으로 읽음)
+앱을 마스터에서 한 번 로드(preload_app)하고 fork 전에 단계 모듈/폰트/인덱스를 미리 올려
+모든 워커가 copy-on-write로 공유 - 워커 재시작과 오토스케일 콜드 스타트의 첫 요청 지연 제거
+"""
+import gc
+
+from config import WARM_UP
+
+
+preload_app = True
+# /api/download 전체 전송은 wsgi.file_wrapper → sendfile(2)로 커널이 바로 소켓에 복사
+sendfile = True
+
+
+def on_starting(server):
+    """워커 fork 전 마스터에서 워밍업"""
+    if not WARM_UP:
+        return
+    from app import warm_up
+    warm_up()
+    # 워밍업으로 만든 객체를 GC 추적 대상에서 빼서 워커의 GC가 공유 페이지를 건드려 복사되지 않도록
+    gc.freeze()
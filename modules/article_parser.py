@@ -3,8 +3,6 @@
 기사 URL로부터 제목, 본문, 이미지 등을 추출
 """
 import requests
-from bs4 import BeautifulSoup
-from newspaper import Article
 import validators
 
 
@@ -16,6 +14,11 @@ class ArticleParser:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
     
+    def warm_up(self):
+        """newspaper3k/BeautifulSoup 미리 import (fork 전 호출 시 워커가 공유)"""
+        import newspaper
+        import bs4
+    
     def parse(self, url: str) -> dict:
         """
         기사 URL을 파싱하여 필요한 정보 추출
@@ -39,7 +42,9 @@ class ArticleParser:
             raise ValueError("유효하지 않은 URL입니다")
         
         try:
-            # newspaper3k 사용
+            # newspaper3k 사용 (import 시 NLTK/lxml 로드 비용이 커서 첫 파싱 때 import)
+            from newspaper import Article
+            
             article = Article(url, language='ko')
             article.download()
             article.parse()
@@ -68,6 +73,8 @@ class ArticleParser:
     def _extract_images(self, url: str) -> list:
         """기사 내 이미지 URL 추출"""
         try:
+            from bs4 import BeautifulSoup
+            
             response = requests.get(url, headers=self.headers, timeout=10)
             soup = BeautifulSoup(response.content, 'html.parser')
             
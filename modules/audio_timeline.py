@@ -0,0 +1,169 @@
+"""
+오디오 타임라인 모듈
+인트로/나레이션/아웃트로 음성과 BGM을 하나의 NumPy 버퍼로 믹싱
+(렌더링 계획의 세그먼트 위치에 배치, BGM 루프/트림, 음성 구간 더킹, 라우드니스 정규화)
+"""
+from pathlib import Path
+
+import numpy as np
+
+from config import AUDIO_SETTINGS
+from modules.audio_utils import load_pcm, pcm_to_float, write_pcm
+
+
+def db_to_gain(db: float) -> float:
+    """dB를 선형 게인으로 변환"""
+    return float(10.0 ** (db / 20.0))
+
+
+def measure_loudness(samples: np.ndarray, sample_rate: int) -> float:
+    """
+    게이팅된 RMS 라우드니스 측정 (dBFS)
+    400ms 블록 단위, 절대 게이트 -70dB / 상대 게이트 -10dB (EBU R128 근사, K-가중치 생략)
+    """
+    block = int(sample_rate * 0.4)
+    if samples.size == 0 or len(samples) < block:
+        energy = float(np.mean(np.square(samples))) if samples.size else 0.0
+        return 10 * np.log10(energy) if energy > 0 else -120.0
+
+    usable = len(samples) - len(samples) % block
+    blocks = samples[:usable].reshape(-1, block * samples.shape[1])
+    energies = np.mean(np.square(blocks, dtype=np.float64), axis=1)
+    levels = 10 * np.log10(np.maximum(energies, 1e-12))
+
+    gated = energies[levels > -70.0]
+    if gated.size == 0:
+        return -120.0
+    relative_gate = 10 * np.log10(np.mean(gated)) - 10.0
+    gated = energies[(levels > -70.0) & (levels > relative_gate)]
+    return float(10 * np.log10(np.mean(gated)))
+
+
+def normalize_loudness(samples: np.ndarray, sample_rate: int, target_db: float) -> np.ndarray:
+    """라우드니스를 목표 레벨로 맞춤 (in-place 게인)"""
+    level = measure_loudness(samples, sample_rate)
+    if level <= -100.0:
+        return samples
+    samples *= db_to_gain(target_db - level)
+    return samples
+
+
+def soft_limit(samples: np.ndarray, ceiling_db: float) -> np.ndarray:
+    """피크가 ceiling을 넘는 부분만 tanh 소프트 클리핑"""
+    ceiling = db_to_gain(ceiling_db)
+    knee = ceiling * 0.8
+    magnitude = np.abs(samples)
+    over = magnitude > knee
+    if np.any(over):
+        span = ceiling - knee
+        limited = knee + span * np.tanh((magnitude[over] - knee) / span)
+        samples[over] = np.sign(samples[over]) * limited
+    return samples
+
+
+class AudioTimeline:
+    """오디오 타임라인 조립 클래스"""
+
+    def __init__(self):
+        self.sample_rate = AUDIO_SETTINGS['sample_rate']
+        self.channels = AUDIO_SETTINGS['channels']
+        self._bgm_library = None
+    
+    @property
+    def bgm_library(self):
+        """BGM 캐시 (최초 사용 시 생성)"""
+        if self._bgm_library is None:
+            from modules.bgm_library import BGMLibrary
+            self._bgm_library = BGMLibrary()
+        return self._bgm_library
+
+    def build(self, segments: list, template: str = None, duration: float = None) -> np.ndarray:
+        """
+        전체 사운드트랙 버퍼 생성
+        영상과 같은 타임라인을 쓰도록 VideoComposer.build_plan()의 세그먼트 위치에 음성 배치
+        (음성 없는 인트로나 건너뛴 문장이 있어도 화면과 어긋나지 않음)
+
+        Args:
+            segments: build_plan()의 세그먼트 ('start', 'duration', 'audio': 정규화된 WAV 경로 또는 None)
+            template: TEMPLATES 키 (BGM 태그 선택용)
+            duration: 전체 길이(초), None이면 마지막 음성 종료 시점
+
+        Returns:
+            np.ndarray: (frames, channels) float32 믹스
+        """
+        placements = self._collect_placements(segments)
+
+        end_time = max([start + length for start, length, _ in placements] + [0.0])
+        total_frames = int(round((duration or end_time) * self.sample_rate))
+
+        # 1. 음성 버스
+        voice = np.zeros((total_frames, self.channels), dtype=np.float32)
+        intervals = []
+        for start, _, path in placements:
+            offset = int(round(start * self.sample_rate))
+            if offset >= total_frames:
+                continue
+            samples = load_pcm(path)
+            length = min(len(samples), total_frames - offset)
+            voice[offset:offset + length] += pcm_to_float(samples[:length])
+            intervals.append((offset, offset + length))
+        normalize_loudness(voice, self.sample_rate, AUDIO_SETTINGS['target_loudness'])
+
+        # 2. BGM 버스 (루프/트림 + 더킹)
+        bgm = self._load_bgm(template, total_frames)
+        if bgm is not None:
+            bgm *= self._duck_envelope(intervals, total_frames)[:, None]
+            voice += bgm
+
+        return soft_limit(voice, AUDIO_SETTINGS['peak_ceiling'])
+
+    def save(self, samples: np.ndarray, output_path: Path) -> Path:
+        """믹스 버퍼를 PCM WAV로 저장"""
+        return write_pcm(output_path, samples, self.sample_rate)
+
+    def _collect_placements(self, segments: list) -> list:
+        """(시작 시각, 길이, 경로) 배치 목록 - 렌더링 계획의 세그먼트 위치 기준"""
+        return [
+            (segment['start'], segment['duration'], segment['audio'])
+            for segment in segments
+            if segment.get('audio') and Path(segment['audio']).exists()
+        ]
+
+    def _load_bgm(self, template: str, total_frames: int) -> np.ndarray:
+        """
+        템플릿 BGM 태그에 맞는 스템을 길이에 맞게 루프/트림
+        (BGMLibrary에 정규화된 PCM으로 캐시되어 있어 디코딩 없음)
+        """
+        if total_frames == 0:
+            return None
+        try:
+            name = self.bgm_library.find_for_template(template)
+            if name is None:
+                return None
+            return self.bgm_library.slice(name, total_frames)
+        except Exception as e:
+            print(f"⚠️ BGM 로드 실패: {e}")
+            return None
+
+    def _duck_envelope(self, intervals: list, total_frames: int) -> np.ndarray:
+        """
+        음성 구간 BGM 게인 곡선 (벡터 연산)
+        각 구간을 attack/release 사다리꼴로 만들어 최대값을 취한 뒤 dB 게인 적용
+        """
+        attack = AUDIO_SETTINGS['duck_attack'] * self.sample_rate
+        release = AUDIO_SETTINGS['duck_release'] * self.sample_rate
+        t = np.arange(total_frames, dtype=np.float32)
+
+        envelope = np.zeros(total_frames, dtype=np.float32)
+        for start, end in intervals:
+            if end <= start:
+                continue
+            shape = np.interp(
+                t,
+                [start - attack, start, end, end + release],
+                [0.0, 1.0, 1.0, 0.0]
+            ).astype(np.float32)
+            np.maximum(envelope, shape, out=envelope)
+
+        duck_db = AUDIO_SETTINGS['duck_gain']
+        return np.power(10.0, envelope * (duck_db / 20.0), dtype=np.float32)
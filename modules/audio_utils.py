@@ -0,0 +1,209 @@
+"""
+오디오 유틸리티 모듈
+TTS 결과를 PCM WAV 중간 포맷으로 한 번만 정규화하고,
+이후 단계는 디코딩 없이 메모리 매핑으로 읽음
+"""
+import os
+import struct
+import tempfile
+import subprocess
+from pathlib import Path
+
+import numpy as np
+
+from config import AUDIO_SETTINGS
+from modules.ffmpeg_utils import ffmpeg_binary
+
+
+def read_wav_info(path: Path) -> dict:
+    """
+    WAV 헤더만 읽어 포맷 정보 반환 (샘플 데이터는 읽지 않음)
+
+    Returns:
+        dict: {
+            'sample_rate', 'channels', 'bits', 'format',
+            'data_offset': 샘플 데이터 시작 바이트,
+            'frames': 프레임(샘플/채널) 수
+        }
+    """
+    file_size = os.path.getsize(path)
+    info = {}
+    with open(path, 'rb') as f:
+        riff, _, wave_id = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave_id != b'WAVE':
+            raise ValueError(f"WAV 파일이 아닙니다: {path}")
+
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                break
+            chunk_id, chunk_size = struct.unpack('<4sI', header)
+
+            if chunk_id == b'fmt ':
+                fmt = f.read(chunk_size)
+                audio_format, channels, sample_rate, _, _, bits = struct.unpack('<HHIIHH', fmt[:16])
+                info.update({
+                    'format': audio_format,
+                    'channels': channels,
+                    'sample_rate': sample_rate,
+                    'bits': bits,
+                })
+                if chunk_size % 2:
+                    f.seek(1, os.SEEK_CUR)
+            elif chunk_id == b'data':
+                offset = f.tell()
+                # 스트리밍으로 쓰인 WAV는 크기 필드가 비어 있을 수 있음
+                size = min(chunk_size, file_size - offset)
+                info['data_offset'] = offset
+                info['data_size'] = size
+                break
+            else:
+                f.seek(chunk_size + (chunk_size % 2), os.SEEK_CUR)
+
+    if 'data_offset' not in info or 'channels' not in info:
+        raise ValueError(f"WAV 헤더를 해석할 수 없습니다: {path}")
+
+    frame_bytes = info['channels'] * info['bits'] // 8
+    info['frames'] = info['data_size'] // frame_bytes
+    return info
+
+
+def is_normalized_wav(path: Path) -> bool:
+    """목표 포맷(PCM s16, 설정된 샘플레이트/채널)의 WAV인지 확인"""
+    try:
+        info = read_wav_info(path)
+    except (ValueError, OSError, struct.error):
+        return False
+    return (
+        info['format'] == 1
+        and info['bits'] == 16
+        and info['sample_rate'] == AUDIO_SETTINGS['sample_rate']
+        and info['channels'] == AUDIO_SETTINGS['channels']
+    )
+
+
+def normalize_to_pcm(source: Path, output_path: Path = None) -> Path:
+    """
+    임의의 오디오 파일을 목표 포맷 PCM WAV로 변환 (한 번만 디코딩)
+
+    Args:
+        source: 원본 오디오 (mp3, wav 등)
+        output_path: 저장 경로 (기본: 같은 이름의 .wav)
+
+    Returns:
+        Path: 정규화된 WAV 경로
+    """
+    source = Path(source)
+    output_path = Path(output_path) if output_path else source.with_suffix('.wav')
+
+    if is_normalized_wav(source):
+        if source != output_path:
+            os.replace(source, output_path)
+        return output_path
+
+    # 같은 캐시 파일을 동시에 만드는 작업끼리 임시 파일을 공유하지 않도록 고유 이름
+    fd, tmp_path = tempfile.mkstemp(suffix='.tmp.wav', dir=output_path.parent)
+    os.close(fd)
+    cmd = [
+        ffmpeg_binary(), '-y', '-loglevel', 'error',
+        '-i', str(source),
+        '-vn', '-map_metadata', '-1', '-bitexact',
+        '-ac', str(AUDIO_SETTINGS['channels']),
+        '-ar', str(AUDIO_SETTINGS['sample_rate']),
+        '-c:a', 'pcm_s16le',
+        str(tmp_path),
+    ]
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise Exception(f"PCM 변환 실패 ({source.name}): {result.stderr.decode(errors='ignore').strip()}")
+
+    os.replace(tmp_path, output_path)
+    if source != output_path:
+        source.unlink(missing_ok=True)
+    return output_path
+
+
+def decode_audio(source: Path) -> np.ndarray:
+    """
+    임의의 오디오 파일을 목표 포맷 float32 배열로 디코딩 (파일 저장 없음)
+
+    Returns:
+        np.ndarray: (frames, channels) float32, [-1, 1]
+    """
+    cmd = [
+        ffmpeg_binary(), '-loglevel', 'error',
+        '-i', str(source),
+        '-vn',
+        '-ac', str(AUDIO_SETTINGS['channels']),
+        '-ar', str(AUDIO_SETTINGS['sample_rate']),
+        '-f', 's16le', '-c:a', 'pcm_s16le',
+        'pipe:1',
+    ]
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise Exception(f"오디오 디코딩 실패 ({Path(source).name}): {result.stderr.decode(errors='ignore').strip()}")
+
+    samples = np.frombuffer(result.stdout, dtype='<i2')
+    samples = samples[:len(samples) - len(samples) % AUDIO_SETTINGS['channels']]
+    return pcm_to_float(samples.reshape(-1, AUDIO_SETTINGS['channels']))
+
+
+def load_pcm(path: Path) -> np.ndarray:
+    """
+    정규화된 WAV를 메모리 매핑으로 로드 (복사/디코딩 없음)
+
+    Returns:
+        np.ndarray: (frames, channels) int16 memmap
+    """
+    info = read_wav_info(path)
+    if info['bits'] != 16 or info['format'] != 1:
+        raise ValueError(f"PCM s16 WAV가 아닙니다: {path}")
+    if info['frames'] == 0:
+        return np.zeros((0, info['channels']), dtype=np.int16)
+    return np.memmap(
+        path, dtype='<i2', mode='r',
+        offset=info['data_offset'],
+        shape=(info['frames'], info['channels'])
+    )
+
+
+def pcm_duration(path: Path) -> float:
+    """WAV 재생 시간(초) - 헤더만 읽음"""
+    info = read_wav_info(path)
+    return info['frames'] / float(info['sample_rate'])
+
+
+def pcm_to_float(samples: np.ndarray) -> np.ndarray:
+    """int16 PCM을 [-1, 1] float32로 변환"""
+    return samples.astype(np.float32) / 32768.0
+
+
+def write_pcm(path: Path, samples: np.ndarray, sample_rate: int = None) -> Path:
+    """
+    float32 [-1, 1] 또는 int16 (frames, channels) 배열을 PCM WAV로 저장
+
+    Returns:
+        Path: 저장된 WAV 경로
+    """
+    sample_rate = sample_rate or AUDIO_SETTINGS['sample_rate']
+    if samples.ndim == 1:
+        samples = samples[:, None]
+    if samples.dtype != np.int16:
+        samples = (np.clip(samples, -1.0, 1.0) * 32767.0).astype('<i2')
+
+    channels = samples.shape[1]
+    data = np.ascontiguousarray(samples, dtype='<i2').tobytes()
+    header = struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + len(data), b'WAVE',
+        b'fmt ', 16, 1, channels, sample_rate,
+        sample_rate * channels * 2, channels * 2, 16,
+        b'data', len(data)
+    )
+    fd, tmp_path = tempfile.mkstemp(suffix='.tmp.wav', dir=Path(path).parent)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(header)
+        f.write(data)
+    os.replace(tmp_path, path)
+    return Path(path)
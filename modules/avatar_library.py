@@ -0,0 +1,120 @@
+"""
+아바타 라이브러리 모듈
+AVATARS_DIR의 인트로/아웃트로 아바타를 출력 해상도/fps/픽셀 포맷으로 한 번만 트랜스코딩한
+메자닌(짧은 closed GOP)으로 캐시 - 렌더링 때는 디코딩/리사이즈 없이 GOP 단위 스트림 복사로 자름
+"""
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+
+from config import VIDEO_SETTINGS, AVATAR_SETTINGS, AVATARS_DIR, CACHE_DIR
+from modules.ffmpeg_utils import run_ffmpeg, count_frames, video_encoder_args
+
+
+AVATAR_EXTENSIONS = ('.mp4', '.mov', '.webm', '.mkv')
+
+
+class AvatarLibrary:
+    """아바타 메자닌 캐시 관리 클래스"""
+
+    def __init__(self, settings: dict = None, source_dir: Path = AVATARS_DIR, cache_dir: Path = None):
+        # settings: 렌더 프로필이 적용된 VIDEO_SETTINGS (프로필마다 별도 메자닌)
+        self.settings = {**VIDEO_SETTINGS, **(settings or {})}
+        self.width = self.settings['width']
+        self.height = self.settings['height']
+        self.fps = self.settings['fps']
+        self.gop = max(1, int(round(self.fps * AVATAR_SETTINGS['gop_seconds'])))
+        self.source_dir = Path(source_dir)
+        self.cache_dir = Path(cache_dir) if cache_dir else CACHE_DIR / 'avatars'
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # 메모리 인덱스: 소스 경로 → 메자닌 정보 / 디렉토리 목록은 디렉토리 mtime이 바뀔 때만 다시 읽음
+        self._entries = {}
+        self._listing = []
+        self._listing_mtime = None
+        self._lock = threading.Lock()
+
+    def find(self, kind: str) -> dict:
+        """
+        종류('intro' | 'outro')의 아바타 메자닌 정보
+
+        Returns:
+            dict: {'source', 'path', 'frames', 'gop', 'fps'} 또는 None (아바타 없음)
+        """
+        sources = [path for path in self._list_sources() if path.name.startswith(f'{kind}_')]
+        if not sources:
+            return None
+        return self.get(sources[0])
+
+    def get(self, source: Path) -> dict:
+        """소스 아바타의 메자닌 정보 (소스가 바뀌었거나 캐시가 없으면 트랜스코딩)"""
+        source = Path(source)
+        stat = source.stat()
+        signature = (stat.st_size, int(stat.st_mtime))
+
+        with self._lock:
+            entry = self._entries.get(str(source))
+            if entry and entry['signature'] == signature and Path(entry['path']).exists():
+                return entry
+
+            path = self.cache_dir / f"{source.stem}_{self._cache_key(source, signature)}.mp4"
+            meta_path = path.with_suffix('.json')
+            if not (path.exists() and meta_path.exists()):
+                self._transcode(source, path)
+                meta = {'frames': count_frames(path), 'gop': self.gop, 'fps': self.fps}
+                meta_path.write_text(json.dumps(meta), encoding='utf-8')
+            else:
+                meta = json.loads(meta_path.read_text(encoding='utf-8'))
+
+            entry = {'source': str(source), 'path': str(path), 'signature': signature, **meta}
+            self._entries[str(source)] = entry
+            return entry
+
+    def _list_sources(self) -> list:
+        """AVATARS_DIR 아바타 파일 목록 (디렉토리가 바뀌었을 때만 다시 스캔)"""
+        if not self.source_dir.exists():
+            return []
+        mtime = self.source_dir.stat().st_mtime
+        if mtime != self._listing_mtime:
+            self._listing = sorted(
+                path for path in self.source_dir.iterdir()
+                if path.suffix.lower() in AVATAR_EXTENSIONS
+            )
+            self._listing_mtime = mtime
+        return self._listing
+
+    def _cache_key(self, source: Path, signature: tuple) -> str:
+        """소스 + 출력 형식 + 인코더 설정 기준 캐시 키 (하나라도 바뀌면 새 메자닌)"""
+        parts = [
+            str(source.resolve()), *signature,
+            self.width, self.height, self.fps, self.gop,
+            self.settings['codec'], self.settings['preset'], self.settings['crf'], self.settings['pix_fmt'],
+        ]
+        return hashlib.sha1('|'.join(map(str, parts)).encode()).hexdigest()[:16]
+
+    def _transcode(self, source: Path, path: Path):
+        """
+        출력 해상도(커버 크롭)/fps/픽셀 포맷 + 세그먼트와 같은 인코더 인자로 트랜스코딩
+        키프레임을 gop 프레임마다 고정(-sc_threshold 0)해 GOP 경계에서 스트림 복사로 자를 수 있게 함
+        """
+        print(f"아바타 메자닌 생성 중... {source.name}")
+        fd, tmp_path = tempfile.mkstemp(suffix='.mp4', dir=self.cache_dir)
+        os.close(fd)
+        try:
+            args = [
+                '-i', source, '-an',
+                '-vf', (
+                    f"scale={self.width}:{self.height}:force_original_aspect_ratio=increase,"
+                    f"crop={self.width}:{self.height},setsar=1,fps={self.fps},format={self.settings['pix_fmt']}"
+                ),
+            ] + video_encoder_args(self.settings, self.fps) + [
+                '-g', self.gop, '-keyint_min', self.gop, '-sc_threshold', 0,
+                '-movflags', '+faststart', tmp_path,
+            ]
+            run_ffmpeg(args, f'아바타 메자닌 생성 ({source.name})')
+            os.replace(tmp_path, path)
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
@@ -0,0 +1,244 @@
+"""
+BGM 라이브러리 모듈
+BGM_DIR의 스템을 한 번만 디코딩하여 정규화된 PCM(.npy)으로 캐시하고,
+작업마다 메모리 매핑으로 잘라 씀 (워커 간 페이지 캐시 공유)
+"""
+import os
+import json
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from config import AUDIO_SETTINGS, BGM_DIR, CACHE_DIR, TEMPLATES
+from modules.audio_utils import decode_audio
+
+
+BGM_EXTENSIONS = ('.mp3', '.wav', '.m4a', '.ogg', '.flac')
+
+# 태그별 기본 분위기 (사이드카 JSON이 없을 때)
+DEFAULT_MOODS = {
+    'tense': 'tense',
+    'soft': 'calm',
+    'smart': 'neutral',
+}
+
+
+def estimate_tempo(samples: np.ndarray, sample_rate: int) -> float:
+    """
+    에너지 엔벨로프 자기상관으로 템포(BPM) 추정
+    60~180 BPM 범위에서 가장 강한 주기를 반환 (추정 불가 시 0)
+    """
+    hop = sample_rate // 100  # 10ms
+    mono = samples.mean(axis=1) if samples.ndim == 2 else samples
+    usable = len(mono) - len(mono) % hop
+    if usable < hop * 200:
+        return 0.0
+
+    energy = np.sqrt(np.mean(np.square(mono[:usable].reshape(-1, hop)), axis=1))
+    onset = np.maximum(np.diff(energy), 0.0)
+    onset -= onset.mean()
+
+    n = 1 << int(np.ceil(np.log2(len(onset) * 2)))
+    spectrum = np.fft.rfft(onset, n)
+    autocorr = np.fft.irfft(spectrum * np.conj(spectrum), n)[:len(onset)]
+
+    min_lag, max_lag = int(100 * 60 / 180), int(100 * 60 / 60)
+    lag = min_lag + int(np.argmax(autocorr[min_lag:max_lag + 1]))
+    return round(60.0 * 100 / lag, 1)
+
+
+class BGMLibrary:
+    """BGM 스템 캐시 관리 클래스"""
+
+    def __init__(self, source_dir: Path = BGM_DIR, cache_dir: Path = None):
+        self.source_dir = Path(source_dir)
+        self.cache_dir = Path(cache_dir) if cache_dir else CACHE_DIR / 'bgm'
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.cache_dir / 'index.json'
+        self._index_mtime = None
+        self.index = self._load_index()
+        self._arrays = {}
+        self.refresh()
+
+    def refresh(self) -> int:
+        """
+        BGM_DIR 변경 사항(추가/수정/삭제)을 캐시에 반영
+
+        Returns:
+            int: 새로 디코딩한 스템 수
+        """
+        if not self.source_dir.exists():
+            return 0
+
+        # 다른 워커가 갱신한 인덱스가 있으면 먼저 반영 (중복 디코딩 방지)
+        if self._current_index_mtime() != self._index_mtime:
+            self.index = self._load_index()
+            self._arrays.clear()
+
+        stems = self.index['stems']
+        current = {}
+        for path in self.source_dir.iterdir():
+            if path.suffix.lower() in BGM_EXTENSIONS:
+                stat = path.stat()
+                current[path.name] = (stat.st_size, stat.st_mtime)
+
+        decoded = 0
+        for name, (size, mtime) in sorted(current.items()):
+            entry = stems.get(name)
+            if entry and entry['size'] == size and entry['mtime'] == mtime \
+                    and (self.cache_dir / entry['cache']).exists():
+                continue
+            try:
+                stems[name] = self._decode_stem(self.source_dir / name, size, mtime)
+                self._arrays.pop(name, None)
+                decoded += 1
+                print(f"✓ BGM 캐시 생성: {name}")
+            except Exception as e:
+                print(f"⚠️ BGM 캐시 생성 실패 ({name}): {e}")
+
+        for name in set(stems) - set(current):
+            (self.cache_dir / stems[name]['cache']).unlink(missing_ok=True)
+            self._arrays.pop(name, None)
+            del stems[name]
+            decoded += 1
+
+        if decoded:
+            self._save_index()
+        return decoded
+
+    def find(self, tag: str) -> str:
+        """BGM 태그(tense/soft/smart)에 해당하는 스템 이름"""
+        self.refresh()
+        candidates = sorted(
+            name for name, entry in self.index['stems'].items()
+            if entry['tag'] == tag
+        )
+        return candidates[0] if candidates else None
+
+    def find_for_template(self, template: str) -> str:
+        """템플릿 키로 스템 이름 검색"""
+        tag = TEMPLATES.get(template, {}).get('bgm')
+        return self.find(tag) if tag else None
+
+    def get(self, name: str) -> np.ndarray:
+        """
+        스템 PCM 메모리 매핑 (int16, 디코딩 없음)
+
+        Returns:
+            np.ndarray: (frames, channels) int16 memmap
+        """
+        if name not in self._arrays:
+            entry = self.index['stems'][name]
+            self._arrays[name] = np.load(self.cache_dir / entry['cache'], mmap_mode='r')
+        return self._arrays[name]
+
+    def slice(self, name: str, total_frames: int) -> np.ndarray:
+        """
+        스템을 total_frames 길이로 루프/트림하여 float32로 반환
+        (메모리 매핑에서 필요한 구간만 읽음)
+        """
+        stem = self.get(name)
+        out = np.empty((total_frames, stem.shape[1]), dtype=np.float32)
+        position = 0
+        while position < total_frames:
+            length = min(len(stem), total_frames - position)
+            np.multiply(stem[:length], 1.0 / 32768.0, out=out[position:position + length], casting='unsafe')
+            position += length
+        return out
+
+    def describe(self) -> list:
+        """인덱스 요약 (이름, 태그, 분위기, 템포, 길이)"""
+        sample_rate = self.index['sample_rate']
+        return [
+            {
+                'name': name,
+                'tag': entry['tag'],
+                'mood': entry['mood'],
+                'tempo': entry['tempo'],
+                'duration': entry['frames'] / float(sample_rate),
+            }
+            for name, entry in sorted(self.index['stems'].items())
+        ]
+
+    def _decode_stem(self, path: Path, size: int, mtime: float) -> dict:
+        """스템 디코딩 → 라우드니스 정규화 → int16 .npy 저장"""
+        from modules.audio_timeline import normalize_loudness, soft_limit
+
+        samples = decode_audio(path)
+        if len(samples) == 0:
+            raise ValueError("빈 오디오 파일입니다")
+        sample_rate = AUDIO_SETTINGS['sample_rate']
+        normalize_loudness(samples, sample_rate, AUDIO_SETTINGS['bgm_level'])
+        soft_limit(samples, AUDIO_SETTINGS['peak_ceiling'])
+
+        tag = self._tag_for(path.stem)
+        sidecar = self._read_sidecar(path)
+        cache_name = f"{path.name}.npy"
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp.npy', dir=self.cache_dir)
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, (samples * 32767.0).astype('<i2'))
+        os.replace(tmp_path, self.cache_dir / cache_name)
+
+        return {
+            'cache': cache_name,
+            'size': size,
+            'mtime': mtime,
+            'frames': len(samples),
+            'tag': sidecar.get('tag', tag),
+            'mood': sidecar.get('mood', DEFAULT_MOODS.get(tag, 'neutral')),
+            'tempo': sidecar.get('tempo') or estimate_tempo(samples, sample_rate),
+        }
+
+    def _tag_for(self, stem: str) -> str:
+        """파일명 접두어로 TEMPLATES bgm 태그 결정"""
+        tags = {template['bgm'] for template in TEMPLATES.values()}
+        for tag in sorted(tags, key=len, reverse=True):
+            if stem.startswith(tag):
+                return tag
+        return None
+
+    def _read_sidecar(self, path: Path) -> dict:
+        """<스템>.json 사이드카 메타데이터 (tag/mood/tempo)"""
+        sidecar = path.with_suffix('.json')
+        if not sidecar.exists():
+            return {}
+        try:
+            return json.loads(sidecar.read_text(encoding='utf-8'))
+        except Exception as e:
+            print(f"⚠️ BGM 메타데이터 읽기 실패 ({sidecar.name}): {e}")
+            return {}
+
+    def _settings_key(self) -> dict:
+        return {
+            'sample_rate': AUDIO_SETTINGS['sample_rate'],
+            'channels': AUDIO_SETTINGS['channels'],
+            'bgm_level': AUDIO_SETTINGS['bgm_level'],
+        }
+
+    def _load_index(self) -> dict:
+        """인덱스 로드 (출력 포맷 설정이 바뀌면 전체 무효화)"""
+        settings = self._settings_key()
+        self._index_mtime = self._current_index_mtime()
+        if self.index_path.exists():
+            try:
+                index = json.loads(self.index_path.read_text(encoding='utf-8'))
+                if all(index.get(key) == value for key, value in settings.items()):
+                    return index
+            except Exception as e:
+                print(f"⚠️ BGM 인덱스 손상, 재생성합니다: {e}")
+        return {**settings, 'stems': {}}
+
+    def _save_index(self):
+        # 임시 파일 이름을 프로세스마다 다르게 (여러 워커가 동시에 저장해도 서로의 임시 파일을 덮어쓰지 않음)
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.cache_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(self.index, ensure_ascii=False, indent=2))
+        os.replace(tmp_path, self.index_path)
+        self._index_mtime = self._current_index_mtime()
+
+    def _current_index_mtime(self) -> float:
+        try:
+            return self.index_path.stat().st_mtime
+        except FileNotFoundError:
+            return None
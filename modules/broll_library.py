@@ -0,0 +1,313 @@
+"""
+B-roll 라이브러리 모듈
+BROLL_DIR의 영상/이미지를 색인하여 키워드 → 클립 역색인을 디스크에 유지하고,
+문장 단어와 기사 키워드로 클립을 선택 (시작 시 전체 재스캔 없음, 바뀐 디렉토리만 다시 읽음)
+"""
+import os
+import re
+import json
+import time
+import tempfile
+import threading
+from collections import Counter
+from pathlib import Path
+
+from PIL import Image
+
+from config import BROLL_DIR, BROLL_SETTINGS, CACHE_DIR
+from modules.ffmpeg_utils import probe_video
+
+
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.webm', '.mkv', '.m4v')
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+BROLL_EXTENSIONS = VIDEO_EXTENSIONS + IMAGE_EXTENSIONS
+
+# 인덱스 형식이 바뀌면 올려서 기존 인덱스 무효화
+INDEX_VERSION = 1
+# 문장 단어 / 기사 키워드 일치 점수
+SENTENCE_WEIGHT = 2
+KEYWORD_WEIGHT = 1
+
+TOKEN_PATTERN = re.compile(r'[0-9a-z가-힣]+')
+
+
+def tokenize(text: str) -> list:
+    """소문자 단어 목록 (2자 이상, 숫자만 있는 단어 제외)"""
+    return [token for token in TOKEN_PATTERN.findall(str(text).lower())
+            if len(token) >= 2 and not token.isdigit()]
+
+
+def query_terms(text: str) -> set:
+    """
+    검색어 집합
+    한글 단어는 조사/어미가 붙은 형태('주식시장은')도 태그('주식시장', '주식')와 맞도록 앞부분도 포함
+    """
+    terms = set()
+    for token in tokenize(text):
+        terms.add(token)
+        if re.match(r'[가-힣]', token):
+            terms.update(token[:n] for n in range(2, len(token)))
+    return terms
+
+
+class BrollLibrary:
+    """로컬 B-roll 색인 관리 클래스"""
+
+    def __init__(self, source_dir: Path = BROLL_DIR, cache_dir: Path = None):
+        self.source_dir = Path(source_dir)
+        self.cache_dir = Path(cache_dir) if cache_dir else CACHE_DIR / 'broll'
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.cache_dir / 'index.json'
+        self._index_mtime = None
+        self._refreshed = 0.0
+        self._lock = threading.Lock()
+        self.index = self._load_index()
+
+    @property
+    def clips(self) -> dict:
+        return self.index['clips']
+
+    def refresh(self, force: bool = False) -> int:
+        """
+        BROLL_DIR 변경 사항을 인덱스에 반영
+        디렉토리 mtime이 그대로인 디렉토리는 파일 목록을 읽지 않음
+        (force=True면 모든 파일의 크기/수정 시각을 확인 - 제자리 수정된 파일/사이드카 반영)
+
+        Returns:
+            int: 추가/갱신/삭제된 클립 수
+        """
+        with self._lock:
+            self._refreshed = time.monotonic()
+            if not self.source_dir.exists():
+                return 0
+
+            # 다른 워커가 갱신한 인덱스가 있으면 먼저 반영 (중복 프로브 방지)
+            if self._current_index_mtime() != self._index_mtime:
+                self.index = self._load_index()
+
+            dirs = self.index['dirs']
+            changed = 0
+            seen = set()
+            pending = ['']
+            while pending:
+                rel_dir = pending.pop()
+                try:
+                    mtime = (self.source_dir / rel_dir).stat().st_mtime
+                except OSError:
+                    continue
+                seen.add(rel_dir)
+                known = dirs.get(rel_dir)
+                if force or not known or known['mtime'] != mtime:
+                    changed += self._scan_dir(rel_dir, mtime)
+                pending.extend(dirs[rel_dir]['subdirs'])
+
+            for rel_dir in set(dirs) - seen:
+                for rel in dirs.pop(rel_dir)['files']:
+                    changed += self._remove(rel)
+
+            if changed:
+                self._save_index()
+                print(f"✓ B-roll 색인 갱신: {changed}개 변경 (전체 {len(self.clips)}개)")
+            return changed
+
+    def search(self, text: str, keywords: list = None, limit: int = 5) -> list:
+        """
+        텍스트(문장)와 키워드에 맞는 클립 (점수 높은 순)
+
+        Returns:
+            list: [(점수, 클립 상대 경로), ...]
+        """
+        scores = self._score(query_terms(text), query_terms(' '.join(keywords or [])))
+        return sorted(((score, rel) for rel, score in scores.items()),
+                      key=lambda item: (-item[0], item[1]))[:limit]
+
+    def select(self, sentences: list, keywords: list = None) -> list:
+        """
+        문장마다 B-roll 클립 선택 (같은 영상에서는 가능한 한 다른 클립 사용)
+
+        Args:
+            sentences: 본문 나레이션 문장 리스트
+            keywords: 기사 키워드 리스트
+
+        Returns:
+            list: 문장 순서대로 클립 정보 dict 또는 None (min_score 미만)
+                  {'path': 절대 경로, 'type': 'video' | 'image', 'duration', 'width', 'height', 'tags', 'score'}
+        """
+        if time.monotonic() - self._refreshed >= BROLL_SETTINGS['refresh_interval']:
+            self.refresh()
+        if not self.clips:
+            return [None] * len(sentences)
+
+        keyword_terms = query_terms(' '.join(keywords or []))
+        used = set()
+        selected = []
+        for sentence in sentences:
+            scores = self._score(query_terms(sentence), keyword_terms)
+            candidates = [(score, rel) for rel, score in scores.items()
+                          if score >= BROLL_SETTINGS['min_score']]
+            if not candidates:
+                selected.append(None)
+                continue
+            # 이미 사용한 클립은 다른 후보가 없을 때만 반복 사용
+            score, rel = min(candidates, key=lambda item: (item[1] in used, -item[0], item[1]))
+            used.add(rel)
+            selected.append({**self.clips[rel], 'path': str(self.source_dir / rel), 'score': score})
+        return selected
+
+    def describe(self) -> dict:
+        """색인 요약 (클립 수, 종류별 수, 태그 수)"""
+        kinds = Counter(entry['type'] for entry in self.clips.values())
+        return {'clips': len(self.clips), 'videos': kinds['video'], 'images': kinds['image'],
+                'terms': len(self.index['terms'])}
+
+    def _score(self, sentence_terms: set, keyword_terms: set) -> Counter:
+        """역색인으로 클립별 점수 합산 (일치한 태그마다 문장 2점 / 키워드 1점)"""
+        terms = self.index['terms']
+        scores = Counter()
+        for term in sentence_terms:
+            for rel in terms.get(term, ()):
+                scores[rel] += SENTENCE_WEIGHT
+        for term in keyword_terms:
+            for rel in terms.get(term, ()):
+                scores[rel] += KEYWORD_WEIGHT
+        return scores
+
+    def _scan_dir(self, rel_dir: str, mtime: float) -> int:
+        """디렉토리 하나의 파일 목록을 읽어 추가/수정/삭제 반영 (바뀐 파일만 프로브)"""
+        directory = self.source_dir / rel_dir
+        files, subdirs = [], []
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            entries = []
+        for entry in entries:
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if entry.is_dir():
+                subdirs.append(rel)
+            elif os.path.splitext(entry.name)[1].lower() in BROLL_EXTENSIONS:
+                files.append(rel)
+
+        changed = 0
+        previous = self.index['dirs'].get(rel_dir, {}).get('files', [])
+        for rel in set(previous) - set(files):
+            changed += self._remove(rel)
+
+        for rel in files:
+            path = self.source_dir / rel
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            sidecar_mtime = self._sidecar_mtime(path)
+            entry = self.clips.get(rel)
+            if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime \
+                    and entry['sidecar_mtime'] == sidecar_mtime:
+                continue
+            try:
+                described = self._describe(path, rel, stat, sidecar_mtime)
+            except Exception as e:
+                print(f"⚠️ B-roll 색인 실패 ({rel}): {e}")
+                continue
+            self._remove(rel)
+            self._add(rel, described)
+            changed += 1
+
+        self.index['dirs'][rel_dir] = {'mtime': mtime, 'subdirs': sorted(subdirs), 'files': sorted(files)}
+        return changed
+
+    def _describe(self, path: Path, rel: str, stat: os.stat_result, sidecar_mtime: float) -> dict:
+        """클립 메타데이터: 사이드카 JSON 우선, 없으면 파일명/디렉토리 태그 + 헤더 프로브"""
+        sidecar = self._read_sidecar(path)
+        kind = 'video' if path.suffix.lower() in VIDEO_EXTENSIONS else 'image'
+
+        if all(sidecar.get(key) for key in ('width', 'height')) and (kind == 'image' or sidecar.get('duration')):
+            info = {key: sidecar.get(key) for key in ('duration', 'width', 'height')}
+        elif kind == 'video':
+            info = probe_video(path)
+        else:
+            with Image.open(path) as img:
+                info = {'duration': None, 'width': img.width, 'height': img.height}
+
+        tags = sidecar.get('tags')
+        if isinstance(tags, str):
+            tags = [tags]
+        if not tags:
+            # 파일명 + 상위 디렉토리 이름 (예: economy/stock_market_01.mp4 → economy, stock, market)
+            tags = Path(rel).with_suffix('').parts
+        terms = sorted({token for tag in tags for token in tokenize(tag)})
+
+        return {
+            'type': kind,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'sidecar_mtime': sidecar_mtime,
+            'duration': info['duration'],
+            'width': info['width'],
+            'height': info['height'],
+            'tags': terms,
+        }
+
+    def _add(self, rel: str, entry: dict):
+        self.clips[rel] = entry
+        terms = self.index['terms']
+        for term in entry['tags']:
+            terms.setdefault(term, []).append(rel)
+
+    def _remove(self, rel: str) -> int:
+        entry = self.clips.pop(rel, None)
+        if entry is None:
+            return 0
+        terms = self.index['terms']
+        for term in entry['tags']:
+            postings = terms.get(term)
+            if postings and rel in postings:
+                postings.remove(rel)
+                if not postings:
+                    del terms[term]
+        return 1
+
+    @staticmethod
+    def _sidecar_mtime(path: Path) -> float:
+        try:
+            return path.with_suffix('.json').stat().st_mtime
+        except OSError:
+            return None
+
+    @staticmethod
+    def _read_sidecar(path: Path) -> dict:
+        """<클립>.json 사이드카 메타데이터 (tags/duration/width/height)"""
+        sidecar = path.with_suffix('.json')
+        if not sidecar.exists():
+            return {}
+        try:
+            return json.loads(sidecar.read_text(encoding='utf-8'))
+        except Exception as e:
+            print(f"⚠️ B-roll 메타데이터 읽기 실패 ({sidecar.name}): {e}")
+            return {}
+
+    def _load_index(self) -> dict:
+        """인덱스 로드 (형식 버전이 다르거나 손상되면 빈 인덱스 → 다음 refresh에서 재생성)"""
+        self._index_mtime = self._current_index_mtime()
+        if self.index_path.exists():
+            try:
+                index = json.loads(self.index_path.read_text(encoding='utf-8'))
+                if index.get('version') == INDEX_VERSION:
+                    return index
+            except Exception as e:
+                print(f"⚠️ B-roll 인덱스 손상, 재생성합니다: {e}")
+        return {'version': INDEX_VERSION, 'dirs': {}, 'clips': {}, 'terms': {}}
+
+    def _save_index(self):
+        # 임시 파일 이름을 프로세스마다 다르게 (웹/렌더 워커가 동시에 refresh해도 서로의 임시 파일을 덮어쓰지 않음)
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.cache_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(self.index, ensure_ascii=False))
+        os.replace(tmp_path, self.index_path)
+        self._index_mtime = self._current_index_mtime()
+
+    def _current_index_mtime(self) -> float:
+        try:
+            return self.index_path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
@@ -0,0 +1,244 @@
+"""
+ffmpeg 렌더 엔진 모듈
+VideoComposer.build_plan()의 렌더링 계획을 단일 ffmpeg filter_complex 호출로 컴파일
+(Python 프레임 루프 없이 디코딩/스케일/합성/인코딩을 모두 ffmpeg 내부에서 처리)
+"""
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from config import VIDEO_SETTINGS, AUDIO_SETTINGS, CACHE_DIR
+from modules.audio_utils import write_pcm
+from modules.ffmpeg_utils import run_ffmpeg, color_hex, video_encoder_args
+from modules.image_cache import ImageCache
+from modules.motion import source_size, zoompan_filter
+from modules.renditions import poster_frame, rendition_graph, rendition_output_args
+
+
+# 영상 파일 배경 (아바타 메자닌, B-roll 클립)
+VIDEO_VISUALS = ('avatar', 'video')
+
+
+def frame_boundaries(segments: list, fps: int) -> list:
+    """
+    세그먼트별 프레임 수 (전체 타임라인 격자 기준으로 반올림)
+    build_plan()이 길이를 프레임 단위로 맞추므로 각 세그먼트 자체의 프레임 수와 같음
+    (격자 기준 반올림은 부동소수점 오차가 누적되지 않도록)
+    """
+    counts = []
+    for segment in segments:
+        start = int(round(segment['start'] * fps))
+        end = int(round((segment['start'] + segment['duration']) * fps))
+        counts.append(max(1, end - start))
+    return counts
+
+
+class FFmpegRenderer:
+    """ffmpeg filter_complex 렌더러"""
+
+    def __init__(self, width: int = None, height: int = None, fps: int = None,
+                 subtitle_renderer=None, threads: int = None, settings: dict = None):
+        # settings: 렌더 프로필이 적용된 VIDEO_SETTINGS (None이면 기본값)
+        self.settings = {**VIDEO_SETTINGS, **(settings or {})}
+        self.width = width or self.settings['width']
+        self.height = height or self.settings['height']
+        self.fps = fps or self.settings['fps']
+        self.subtitle_renderer = subtitle_renderer
+        self.threads = threads or self.settings['threads']
+        self._image_cache = None
+
+    def render(self, plan: dict, soundtrack: np.ndarray, output_path: Path,
+               subtitles_filter: str = None, renditions: list = None) -> Path:
+        """
+        렌더링 계획을 mp4로 인코딩
+
+        Args:
+            plan: VideoComposer.build_plan()의 결과
+            soundtrack: (frames, channels) float32 사운드트랙 버퍼
+            output_path: 출력 파일 경로
+            subtitles_filter: burn 모드일 때 concat 이후 적용할 subtitles 필터
+                              (None이면 Pillow 자막 비트맵을 세그먼트별로 overlay)
+            renditions: 같은 호출에서 함께 인코딩할 추가 렌디션 (resolve_renditions() 결과)
+
+        Returns:
+            Path: 출력 파일 경로
+        """
+        work_dir = Path(tempfile.mkdtemp(prefix='ffr_', dir=self._work_root()))
+        try:
+            args = self.build_command(plan, soundtrack, output_path, work_dir,
+                                      subtitles_filter, renditions)
+            run_ffmpeg(args, 'ffmpeg 렌더링')
+            return output_path
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def build_command(self, plan: dict, soundtrack: np.ndarray, output_path: Path,
+                      work_dir: Path, subtitles_filter: str = None,
+                      renditions: list = None) -> list:
+        """ffmpeg 인자 리스트 생성 (입력 자산은 work_dir에 준비)"""
+        segments = plan['segments']
+        frame_counts = frame_boundaries(segments, self.fps)
+
+        inputs = []
+        filters = []
+        labels = []
+
+        for idx, (segment, frames) in enumerate(zip(segments, frame_counts)):
+            input_index = self._count_inputs(inputs)
+            inputs += self._segment_input(segment, frames, work_dir, idx)
+            chain = self._segment_chain(input_index, segment, frames)
+
+            label = f"v{idx}"
+            bitmap = None
+            if not subtitles_filter and segment.get('subtitle') and self.subtitle_renderer:
+                bitmap = self._subtitle_bitmap(segment['subtitle'], plan.get('style'), work_dir, idx)
+
+            if bitmap:
+                bitmap_path, (x, y) = bitmap
+                sub_index = self._count_inputs(inputs)
+                inputs += ['-i', bitmap_path]
+                filters.append(f"{chain}[b{idx}]")
+                filters.append(f"[b{idx}][{sub_index}:v]overlay={x}:{y}:format=auto,format=yuv420p[{label}]")
+            else:
+                filters.append(f"{chain}[{label}]")
+            labels.append(f"[{label}]")
+
+        filters.append(f"{''.join(labels)}concat=n={len(labels)}:v=1:a=0[vcat]")
+        if subtitles_filter:
+            filters.append(f"[vcat]{subtitles_filter}[vout]")
+        else:
+            filters.append("[vcat]null[vout]")
+
+        # 추가 렌디션: 합성 결과를 split으로 나눠 같은 호출에서 인코딩
+        main_label = 'vout'
+        rendition_labels = {}
+        if renditions:
+            split_filters, main_label, rendition_labels = rendition_graph(
+                'vout', renditions, main=True, poster_frame=poster_frame(plan, self.fps)
+            )
+            filters += split_filters
+
+        total_frames = sum(frame_counts)
+        args = list(inputs)
+        audio_index = None
+        if soundtrack is not None and len(soundtrack):
+            audio_path = write_pcm(work_dir / 'soundtrack.wav', soundtrack)
+            audio_index = self._count_inputs(args)
+            args += ['-i', audio_path]
+
+        args += ['-filter_complex', ';'.join(filters), '-map', f'[{main_label}]']
+        if audio_index is not None:
+            args += [
+                '-map', f'{audio_index}:a',
+                '-c:a', AUDIO_SETTINGS['codec'],
+                '-b:a', AUDIO_SETTINGS['bitrate'],
+                '-ar', AUDIO_SETTINGS['sample_rate'],
+            ]
+        args += self.video_encoder_args()
+        args += [
+            '-frames:v', total_frames,
+            '-t', f"{total_frames / float(self.fps):.6f}",
+            '-movflags', '+faststart',
+            str(output_path),
+        ]
+        if renditions:
+            audio_map = f'{audio_index}:a' if audio_index is not None else None
+            args += rendition_output_args(renditions, rendition_labels, output_path,
+                                          self.settings, audio_map, total_frames / float(self.fps))
+        return args
+
+    def video_encoder_args(self) -> list:
+        """비디오 인코더 인자 (moviepy 경로와 동일한 코덱/프리셋)"""
+        return video_encoder_args(self.settings, self.fps, self.threads)
+
+    def _segment_input(self, segment: dict, frames: int, work_dir: Path, idx: int) -> list:
+        """세그먼트 배경 입력 인자"""
+        visual = segment['visual']
+        seconds = f"{(frames + 1) / float(self.fps):.6f}"
+
+        if visual['type'] == 'avatar':
+            return ['-i', visual['path']]
+
+        if visual['type'] == 'video':
+            # B-roll 클립: 세그먼트 길이만큼만 읽음 (긴 스톡 영상을 끝까지 디코딩하지 않도록)
+            return ['-t', seconds, '-i', visual['path']]
+
+        if visual['type'] == 'image':
+            image_path = self.image_path(visual)
+            if image_path and visual.get('motion'):
+                # 모션: 단일 프레임 입력을 zoompan이 프레임 수만큼 펼침
+                return ['-i', image_path]
+            if image_path:
+                return ['-loop', '1', '-framerate', self.fps, '-t', seconds, '-i', image_path]
+            color = visual.get('fallback', (60, 70, 90))
+        else:
+            color = visual['color']
+
+        return [
+            '-f', 'lavfi',
+            '-i', f"color=c={color_hex(color)}:s={self.width}x{self.height}:r={self.fps}:d={seconds}",
+        ]
+
+    def _segment_chain(self, input_index: int, segment: dict, frames: int) -> str:
+        """세그먼트 입력 → 출력 해상도(커버 크롭)/fps/프레임 수로 맞춘 yuv420p 스트림 필터 체인"""
+        return (
+            f"[{input_index}:v]{self._motion_filter(segment, frames)}"
+            f"scale={self.width}:{self.height}:force_original_aspect_ratio=increase,"
+            f"crop={self.width}:{self.height},setsar=1,"
+            f"fps={self.fps},{self._pad_filter(segment, frames)}"
+            f"trim=end_frame={frames},setpts=PTS-STARTPTS,format=yuv420p"
+        )
+
+    def _motion_filter(self, segment: dict, frames: int) -> str:
+        """Ken Burns 세그먼트면 zoompan 필터 (이미지 준비 실패로 단색 대체 시 생략)"""
+        visual = segment['visual']
+        if visual['type'] != 'image' or not visual.get('motion') or not self.image_path(visual):
+            return ''
+        return zoompan_filter(frames, self.width, self.height, self.fps,
+                              visual['motion'], visual.get('variant', 0)) + ','
+
+    def _pad_filter(self, segment: dict, frames: int) -> str:
+        """아바타/B-roll 영상이 세그먼트보다 짧으면 마지막 프레임 유지 (moviepy와 동일)"""
+        if segment['visual']['type'] not in VIDEO_VISUALS:
+            return ''
+        return f"tpad=stop_mode=clone:stop={frames},"
+
+    @property
+    def image_cache(self) -> ImageCache:
+        if self._image_cache is None:
+            self._image_cache = ImageCache(self.width, self.height)
+        return self._image_cache
+
+    def image_path(self, visual: dict) -> Path:
+        """
+        커버 크롭된 출력 해상도 이미지 경로 (모션 세그먼트는 오버샘플링 크기, 실패 시 None → 단색 대체)
+        VideoComposer.prepare_images()가 채운 visual['path']가 있으면 그대로 사용
+        """
+        if 'path' not in visual:
+            size = source_size(self.width, self.height) if visual.get('motion') else None
+            try:
+                visual['path'] = self.image_cache.prepare(visual['source'], size)
+            except Exception as e:
+                print(f"⚠️ 이미지 로드 실패 ({visual['source']}): {e}")
+                visual['path'] = None
+        return visual['path']
+
+    def _subtitle_bitmap(self, text: str, style: str, work_dir: Path, idx: int):
+        """Pillow 자막 비트맵을 PNG로 저장하고 (경로, 위치) 반환"""
+        bitmap = self.subtitle_renderer.render(text, style)
+        path = work_dir / f"subtitle_{idx}.png"
+        Image.fromarray(bitmap, 'RGBA').save(path)
+        return path, self.subtitle_renderer.position(bitmap, style)
+
+    @staticmethod
+    def _count_inputs(args: list) -> int:
+        return sum(1 for arg in args if arg == '-i')
+
+    @staticmethod
+    def _work_root() -> Path:
+        root = CACHE_DIR / 'work'
+        root.mkdir(parents=True, exist_ok=True)
+        return root
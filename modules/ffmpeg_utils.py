@@ -0,0 +1,105 @@
+"""
+ffmpeg 유틸리티 모듈
+실행 파일 탐색, 명령 실행, 길이 조회 등 ffmpeg 호출 공통 함수
+"""
+import os
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+
+def ffmpeg_binary() -> str:
+    """ffmpeg 실행 파일 경로 (moviepy와 동일한 탐색 순서)"""
+    env_binary = os.getenv('FFMPEG_BINARY') or os.getenv('IMAGEIO_FFMPEG_EXE')
+    if env_binary:
+        return env_binary
+    system_binary = shutil.which('ffmpeg')
+    if system_binary:
+        return system_binary
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return 'ffmpeg'
+
+
+def run_ffmpeg(args: list, description: str = 'ffmpeg') -> subprocess.CompletedProcess:
+    """
+    ffmpeg 실행 (실패 시 stderr 마지막 부분을 포함한 예외)
+
+    Args:
+        args: ffmpeg 이후 인자 리스트
+        description: 오류 메시지용 작업 설명
+    """
+    cmd = [ffmpeg_binary(), '-hide_banner', '-loglevel', 'error', '-y'] + [str(a) for a in args]
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        stderr = result.stderr.decode(errors='ignore').strip()
+        raise Exception(f"{description} 실패: {stderr[-800:]}")
+    return result
+
+
+def probe_duration(path: Path) -> float:
+    """미디어 파일 길이(초) - ffmpeg 헤더 정보만 읽음 (실패 시 None)"""
+    cmd = [ffmpeg_binary(), '-hide_banner', '-i', str(path)]
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    match = re.search(r'Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)', result.stderr.decode(errors='ignore'))
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def probe_video(path: Path) -> dict:
+    """
+    비디오 길이/해상도 - ffmpeg 헤더 정보만 읽음
+
+    Returns:
+        dict: {'duration', 'width', 'height'} (읽지 못한 값은 None)
+    """
+    cmd = [ffmpeg_binary(), '-hide_banner', '-i', str(path)]
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stderr = result.stderr.decode(errors='ignore')
+    info = {'duration': None, 'width': None, 'height': None}
+    match = re.search(r'Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)', stderr)
+    if match:
+        hours, minutes, seconds = match.groups()
+        info['duration'] = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    match = re.search(r'Stream #.*?Video:.*?\b(\d{2,5})x(\d{2,5})\b', stderr)
+    if match:
+        info['width'], info['height'] = int(match.group(1)), int(match.group(2))
+    return info
+
+
+def count_frames(path: Path) -> int:
+    """비디오 스트림 프레임 수 (디코딩 없이 패킷 수로 계산, 실패 시 None)"""
+    # framecrc 출력은 패킷마다 한 줄 (# 주석 줄 제외)
+    cmd = [ffmpeg_binary(), '-hide_banner', '-loglevel', 'error', '-i', str(path),
+           '-map', '0:v:0', '-c', 'copy', '-f', 'framecrc', '-']
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        return None
+    lines = result.stdout.decode(errors='ignore').splitlines()
+    return sum(1 for line in lines if line and not line.startswith('#')) or None
+
+
+def video_encoder_args(settings: dict, fps: int, threads: int = None) -> list:
+    """
+    비디오 인코더 인자
+    세그먼트/메자닌 등 스트림 복사로 이어 붙일 파일은 모두 이 인자로 인코딩해야 SPS/PPS가 일치함
+    """
+    return [
+        '-c:v', settings['codec'],
+        '-preset', settings['preset'],
+        '-crf', settings['crf'],
+        '-pix_fmt', settings['pix_fmt'],
+        '-r', fps,
+        '-threads', threads or settings['threads'],
+    ]
+
+
+def color_hex(color: tuple) -> str:
+    """(r, g, b) → ffmpeg 색상 문자열 0xRRGGBB"""
+    r, g, b = color
+    return f"0x{r:02X}{g:02X}{b:02X}"
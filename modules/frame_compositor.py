@@ -0,0 +1,92 @@
+"""
+프레임 합성 모듈
+자막/로고 같은 RGBA 오버레이를 미리 할당한 uint8 프레임 버퍼에 제자리(in-place) 알파 합성
+(CompositeVideoClip처럼 레이어마다 새 배열을 만들고 float로 섞지 않음)
+"""
+import numpy as np
+
+
+class Overlay:
+    """프레임 영역으로 잘라 알파 곱셈까지 미리 계산한 오버레이"""
+
+    __slots__ = ('bitmap', 'position', 'box', 'premultiplied', 'inverse_alpha')
+
+    def __init__(self, bitmap: np.ndarray, position: tuple, width: int, height: int):
+        self.bitmap = bitmap
+        self.position = tuple(position)
+        x, y = self.position
+        h, w = bitmap.shape[:2]
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(width, x + w), min(height, y + h)
+        # 프레임 밖이면 box = None (합성 생략)
+        self.box = (x0, y0, x1, y1) if x1 > x0 and y1 > y0 else None
+        if self.box is None:
+            self.premultiplied = self.inverse_alpha = None
+            return
+
+        region = bitmap[y0 - y:y1 - y, x0 - x:x1 - x]
+        alpha = region[..., 3:4].astype(np.uint16)
+        # out = (rgb * a + base * (255 - a) + 127) // 255 에서 base와 무관한 항
+        self.premultiplied = region[..., :3].astype(np.uint16) * alpha + 127
+        self.inverse_alpha = 255 - alpha
+
+
+class FrameCompositor:
+    """
+    프레임 버퍼 하나를 재사용하는 합성기 (렌더링 작업/워커마다 하나씩 사용, 스레드 간 공유 금지)
+    compose()가 반환하는 배열은 다음 호출에서 덮어써지므로 바로 인코더에 넘기거나 복사해서 사용
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.buffer = np.empty((height, width, 3), dtype=np.uint8)
+        # 합성 중간값 (uint16, 오버레이 영역 크기만큼 잘라 씀)
+        self._scratch = np.empty(height * width * 3, dtype=np.uint16)
+        self._overlays = {}
+        self._last = None
+
+    def overlay(self, bitmap: np.ndarray, position: tuple) -> Overlay:
+        """RGBA 비트맵의 합성용 오버레이 (같은 비트맵/위치는 캐시)"""
+        key = (id(bitmap), tuple(position))
+        cached = self._overlays.get(key)
+        # id는 해제된 배열에서 재사용될 수 있으므로 원본 배열까지 확인
+        if cached is None or cached.bitmap is not bitmap:
+            cached = self._overlays[key] = Overlay(bitmap, position, self.width, self.height)
+        return cached
+
+    def compose(self, background: np.ndarray, overlays: tuple = ()) -> np.ndarray:
+        """
+        배경 프레임에 오버레이를 합성한 프레임 버퍼 반환
+
+        Args:
+            background: (H, W, 3) uint8 배경 프레임 (합성기가 수정하지 않음, 호출자도 제자리 수정 금지)
+            overlays: overlay()로 만든 Overlay들 (순서대로 위에 쌓임)
+
+        Returns:
+            np.ndarray: 합성기 프레임 버퍼 (오버레이가 없으면 배경 그대로)
+        """
+        overlays = tuple(o for o in overlays if o.box is not None)
+        if not overlays:
+            return background
+
+        # 배경과 오버레이가 직전 프레임과 같으면 (정지 이미지/아바타 마지막 프레임) 버퍼 그대로 재사용
+        state = (background, overlays)
+        if self._last is not None and self._last[0] is background and self._last[1] == overlays:
+            return self.buffer
+
+        np.copyto(self.buffer, background)
+        for overlay in overlays:
+            self._blend(overlay)
+        self._last = state
+        return self.buffer
+
+    def _blend(self, overlay: Overlay):
+        """오버레이 영역만 정수 연산으로 알파 합성 (새 배열 할당 없음)"""
+        x0, y0, x1, y1 = overlay.box
+        region = self.buffer[y0:y1, x0:x1]
+        scratch = self._scratch[:region.size].reshape(region.shape)
+        np.multiply(region, overlay.inverse_alpha, out=scratch)
+        scratch += overlay.premultiplied
+        scratch //= 255
+        np.copyto(region, scratch, casting='unsafe')
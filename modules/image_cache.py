@@ -0,0 +1,121 @@
+"""
+이미지 캐시 모듈
+기사/B-roll 이미지를 한 번만 RGB로 변환하고 출력 해상도에 맞게 커버 크롭하여
+원본 내용 해시 + 목표 크기 기준의 디스크 캐시에 저장 (렌더링 중 리사이즈 없음)
+"""
+import os
+import hashlib
+import tempfile
+import threading
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+from config import VIDEO_SETTINGS, CACHE_DIR
+from modules.image_utils import is_local_file
+
+
+# 캐시 키에 포함 (변환 방식이 바뀌면 올려서 기존 캐시 무효화)
+CACHE_VERSION = 1
+RESAMPLE = Image.LANCZOS
+
+# EXIF Orientation 태그와 가로/세로가 바뀌는 값 (90/270도 회전, 전치/횡단)
+EXIF_ORIENTATION = 0x0112
+ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def fetch_image_bytes(source: str, timeout: int = 10) -> bytes:
+    """이미지 원본 바이트 (URL 또는 로컬 파일)"""
+    if is_local_file(source):
+        return Path(str(source)).read_bytes()
+
+    import requests
+
+    response = requests.get(source, timeout=timeout)
+    response.raise_for_status()
+    return response.content
+
+
+def to_rgb(img: Image.Image, background: tuple = (0, 0, 0)) -> Image.Image:
+    """
+    RGB로 변환 (EXIF 회전 반영, RGBA/LA/투명 팔레트는 배경색 위에 합성)
+    """
+    img = ImageOps.exif_transpose(img)
+    if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+        rgba = img.convert('RGBA')
+        flat = Image.new('RGB', rgba.size, background)
+        flat.paste(rgba, mask=rgba.getchannel('A'))
+        return flat
+    return img.convert('RGB')
+
+
+def cover_crop(img: Image.Image, size: tuple) -> Image.Image:
+    """비율을 유지한 채 목표 크기를 꽉 채우도록 축소 후 중앙 크롭"""
+    # JPEG는 디코딩 단계에서 미리 축소 (큰 원본의 변환 시간 단축)
+    if img.format == 'JPEG':
+        # draft는 저장된 방향 기준이므로 EXIF로 90/270도 회전할 이미지는 목표 크기를 뒤집어 요청
+        # (그대로 요청하면 회전 후 목표보다 작아져 ImageOps.fit이 다시 확대함)
+        width, height = size
+        rotated = img.getexif().get(EXIF_ORIENTATION) in ROTATED_ORIENTATIONS
+        img.draft('RGB', (height, width) if rotated else size)
+    return ImageOps.fit(to_rgb(img), size, method=RESAMPLE, centering=(0.5, 0.5))
+
+
+class ImageCache:
+    """커버 크롭 이미지 디스크 캐시"""
+
+    def __init__(self, width: int = None, height: int = None, cache_dir: Path = None):
+        self.width = width or VIDEO_SETTINGS['width']
+        self.height = height or VIDEO_SETTINGS['height']
+        self.cache_dir = Path(cache_dir) if cache_dir else CACHE_DIR / 'images'
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # 같은 프로세스에서 반복되는 URL은 다시 내려받지 않도록 (소스, 크기) → 캐시 경로
+        self._sources = {}
+        self._lock = threading.Lock()
+
+    def prepare(self, source: str, size: tuple = None) -> Path:
+        """
+        소스 이미지를 커버 크롭된 RGB JPEG로 준비
+
+        Args:
+            source: 이미지 URL 또는 로컬 파일 경로
+            size: (width, height) 목표 크기 (기본 출력 해상도)
+
+        Returns:
+            Path: 캐시된 이미지 경로 (실패 시 예외)
+        """
+        size = tuple(size or (self.width, self.height))
+        with self._lock:
+            cached = self._sources.get((source, size))
+        if cached and cached.exists():
+            return cached
+
+        data = fetch_image_bytes(source)
+        path = self.cache_path(data, size)
+        if not path.exists():
+            frame = cover_crop(Image.open(BytesIO(data)), size)
+            self._write(frame, path)
+
+        with self._lock:
+            self._sources[(source, size)] = path
+        return path
+
+    def cache_path(self, data: bytes, size: tuple) -> Path:
+        """내용 해시 + 목표 크기 기준 캐시 경로 (앞 2자리로 하위 디렉토리 분산)"""
+        digest = hashlib.sha256(data).hexdigest()
+        key = f"{digest[:32]}_{size[0]}x{size[1]}_v{CACHE_VERSION}"
+        return self.cache_dir / digest[:2] / f"{key}.jpg"
+
+    @staticmethod
+    def _write(frame: Image.Image, path: Path):
+        """임시 파일에 쓴 뒤 교체 (동시에 같은 이미지를 준비하는 워커와 충돌하지 않도록)"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix='.jpg', dir=path.parent)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                frame.save(f, 'JPEG', quality=95, subsampling=0)
+            os.replace(tmp_path, path)
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
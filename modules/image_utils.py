@@ -0,0 +1,15 @@
+"""
+이미지 유틸리티 모듈
+기사 이미지/B-roll 이미지 소스 판별 (URL 또는 로컬 경로)
+"""
+from pathlib import Path
+
+
+def is_local_file(source: str) -> bool:
+    """로컬 파일 경로 여부 (URL이면 False)"""
+    if '://' in str(source):
+        return False
+    try:
+        return Path(str(source)).is_file()
+    except OSError:
+        return False
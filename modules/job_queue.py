@@ -0,0 +1,210 @@
+"""
+렌더 작업 큐 모듈
+SQLite(WAL) 파일 하나에 작업을 영속 저장하여 웹 프로세스가 등록하고 렌더 워커가 리스(lease)로 가져감
+워커는 하트비트로 리스를 연장하고 단계가 끝날 때마다 중간 결과를 저장
+(워커가 죽으면 리스 만료 후 다른 워커가 마지막으로 끝난 단계부터 이어서 실행, 실패는 백오프 후 재시도)
+"""
+import json
+import time
+import uuid
+import sqlite3
+from pathlib import Path
+
+from config import JOB_SETTINGS
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT '{}',
+    stage TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    run_after REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    error TEXT,
+    result TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, run_after);
+"""
+
+# 상태: queued(대기/재시도 대기) → running(리스 보유) → done | failed
+JSON_COLUMNS = ('payload', 'state', 'result')
+
+
+class JobQueue:
+    """SQLite 렌더 작업 큐"""
+
+    def __init__(self, db_path: Path = None, lease_seconds: int = None, max_attempts: int = None):
+        self.db_path = Path(db_path or JOB_SETTINGS['db_path'])
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds or JOB_SETTINGS['lease_seconds']
+        self.max_attempts = max_attempts or JOB_SETTINGS['max_attempts']
+        with self._connect() as db:
+            db.execute(f"PRAGMA journal_mode={JOB_SETTINGS['journal_mode']}")
+            db.executescript(SCHEMA)
+
+    def enqueue(self, kind: str, payload: dict) -> str:
+        """
+        작업 등록
+
+        Args:
+            kind: 'generate' | 'rerender'
+            payload: 작업 입력 (JSON 직렬화 가능)
+
+        Returns:
+            str: 작업 ID
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as db:
+            db.execute(
+                "INSERT INTO jobs (id, kind, status, payload, max_attempts, run_after, created, updated) "
+                "VALUES (?, ?, 'queued', ?, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(payload, ensure_ascii=False), self.max_attempts, now, now, now)
+            )
+        return job_id
+
+    def claim(self, worker_id: str) -> dict:
+        """
+        실행할 작업 하나를 리스와 함께 가져옴 (대기 중이거나 리스가 만료된 작업, 오래된 순)
+        리스가 만료된 작업은 이전 워커가 죽은 것으로 보고 시도 횟수를 센 뒤 이어서 실행
+
+        Returns:
+            dict: 작업 (get()과 같은 형식) 또는 None
+        """
+        now = time.time()
+        with self._connect() as db:
+            # 쓰기 잠금을 먼저 잡아 두 워커가 같은 작업을 가져가지 않도록
+            db.execute("BEGIN IMMEDIATE")
+            db.execute(
+                "UPDATE jobs SET status = 'failed', error = '리스 만료 (최대 시도 횟수 초과)', "
+                "lease_owner = NULL, updated = ? "
+                "WHERE status = 'running' AND lease_expires < ? AND attempts >= max_attempts",
+                (now, now)
+            )
+            row = db.execute(
+                "SELECT id FROM jobs "
+                "WHERE (status = 'queued' AND run_after <= ?) OR (status = 'running' AND lease_expires < ?) "
+                "ORDER BY created LIMIT 1",
+                (now, now)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET status = 'running', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated = ? WHERE id = ?",
+                (worker_id, now + self.lease_seconds, now, row['id'])
+            )
+        return self.get(row['id'])
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """리스 연장 (다른 워커가 가져갔거나 작업이 끝났으면 False)"""
+        now = time.time()
+        with self._connect() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET lease_expires = ?, updated = ? "
+                "WHERE id = ? AND lease_owner = ? AND status = 'running'",
+                (now + self.lease_seconds, now, job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def save_stage(self, job_id: str, worker_id: str, stage: str, state: dict) -> bool:
+        """단계 완료 기록 (중간 결과 state 저장 + 리스 연장, 리스를 잃었으면 False)"""
+        now = time.time()
+        with self._connect() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET stage = ?, state = ?, lease_expires = ?, updated = ? "
+                "WHERE id = ? AND lease_owner = ? AND status = 'running'",
+                (stage, json.dumps(state, ensure_ascii=False, default=str),
+                 now + self.lease_seconds, now, job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: dict) -> bool:
+        """작업 완료"""
+        now = time.time()
+        with self._connect() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_owner = NULL, "
+                "lease_expires = NULL, updated = ? WHERE id = ? AND lease_owner = ?",
+                (json.dumps(result, ensure_ascii=False, default=str), now, job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id: str, worker_id: str, error: str, retry: bool = True) -> str:
+        """
+        작업 실패 처리 (시도 횟수가 남았고 retry면 backoff_seconds * 2^(시도-1) 뒤 재시도)
+
+        Returns:
+            str: 바뀐 상태 'queued' | 'failed' (리스를 잃었으면 None)
+        """
+        now = time.time()
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND lease_owner = ?",
+                (job_id, worker_id)
+            ).fetchone()
+            if row is None:
+                return None
+            if retry and row['attempts'] < row['max_attempts']:
+                status = 'queued'
+                run_after = now + JOB_SETTINGS['backoff_seconds'] * 2 ** (row['attempts'] - 1)
+            else:
+                status, run_after = 'failed', now
+            db.execute(
+                "UPDATE jobs SET status = ?, error = ?, run_after = ?, lease_owner = NULL, "
+                "lease_expires = NULL, updated = ? WHERE id = ?",
+                (status, error, run_after, now, job_id)
+            )
+            return status
+
+    def get(self, job_id: str) -> dict:
+        """작업 조회 (없으면 None)"""
+        with self._connect() as db:
+            row = db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        for column in JSON_COLUMNS:
+            job[column] = json.loads(job[column]) if job[column] else None
+        return job
+
+    def counts(self) -> dict:
+        """상태별 작업 수"""
+        with self._connect() as db:
+            rows = db.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row['status']: row['n'] for row in rows}
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        호출마다 새 연결 (스레드/프로세스 간 공유하지 않음)
+        with 블록이 끝나면 커밋 후 닫힘, 잠금 대기는 busy_timeout으로 처리
+        """
+        return SQLiteConnection(self.db_path)
+
+
+class SQLiteConnection:
+    """sqlite3 연결 컨텍스트 (커밋/롤백 후 닫기 - sqlite3.Connection의 with는 닫지 않음)"""
+
+    def __init__(self, path: Path):
+        self.db = sqlite3.connect(str(path), timeout=30, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA busy_timeout = 30000")
+
+    def __enter__(self) -> sqlite3.Connection:
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if self.db.in_transaction:
+                self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.db.close()
+        return False
@@ -0,0 +1,122 @@
+"""
+메모리 모니터 모듈
+렌더링 중 프로세스(+ ffmpeg 등 자식 프로세스) RSS를 주기적으로 샘플링해 최대값을 기록하고
+메모리 예산을 넘으면 표시 (stream 엔진은 프레임마다 확인해 즉시 중단)
+"""
+import os
+import sys
+import time
+import resource
+import threading
+from pathlib import Path
+
+from config import MEMORY_SETTINGS
+
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+PROC = Path('/proc')
+
+
+class MemoryBudgetExceeded(MemoryError):
+    """렌더링 메모리 예산 초과"""
+
+
+def process_rss(pid: int) -> int:
+    """프로세스 RSS (bytes, /proc 없거나 종료된 프로세스면 0)"""
+    try:
+        with open(PROC / str(pid) / 'statm') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def child_pids(pid: int) -> list:
+    """자식 프로세스 PID 목록 (손자 프로세스 포함)"""
+    children = []
+    try:
+        tasks = list((PROC / str(pid) / 'task').iterdir())
+    except OSError:
+        return children
+    for task in tasks:
+        try:
+            direct = [int(child) for child in (task / 'children').read_text().split()]
+        except (OSError, ValueError):
+            continue
+        for child in direct:
+            children.append(child)
+            children.extend(child_pids(child))
+    return children
+
+
+def peak_rss_fallback() -> int:
+    """/proc이 없는 환경: 프로세스 생애 최대 RSS (bytes, macOS는 bytes / Linux는 KB 단위로 보고됨)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class MemoryMonitor:
+    """
+    작업 단위 메모리 샘플러 (with 블록 동안 백그라운드 스레드로 측정)
+    같은 프로세스에서 여러 작업이 동시에 돌면 프로세스 전체 값이므로 합산되어 보임
+    """
+
+    def __init__(self, budget_mb: int = None, interval: float = None):
+        # budget_mb: 프로세스 + 자식 RSS 합계 한도 (0/None이면 측정만)
+        self.budget = (MEMORY_SETTINGS['budget_mb'] if budget_mb is None else budget_mb) * 1024 * 1024
+        self.interval = interval or MEMORY_SETTINGS['sample_interval']
+        self.pid = os.getpid()
+        self.peak_self = 0
+        self.peak_children = 0
+        self.peak_total = 0
+        self.exceeded = False
+        self._stop = threading.Event()
+        self._thread = None
+        self._started = None
+        self._elapsed = 0.0
+
+    def __enter__(self) -> 'MemoryMonitor':
+        self._started = time.perf_counter()
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name='memory-monitor', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+        self._elapsed = time.perf_counter() - self._started
+        return False
+
+    def sample(self) -> int:
+        """현재 RSS 합계 측정 후 최대값 갱신 (bytes)"""
+        own = process_rss(self.pid) or peak_rss_fallback()
+        children = sum(process_rss(pid) for pid in child_pids(self.pid))
+        total = own + children
+        self.peak_self = max(self.peak_self, own)
+        self.peak_children = max(self.peak_children, children)
+        self.peak_total = max(self.peak_total, total)
+        if self.budget and total > self.budget:
+            self.exceeded = True
+        return total
+
+    def check(self):
+        """예산을 넘었으면 MemoryBudgetExceeded (렌더링 루프에서 자주 호출해도 되는 플래그 확인)"""
+        if self.exceeded:
+            raise MemoryBudgetExceeded(
+                f"메모리 예산 초과: {self.peak_total / 1048576:.0f}MB > {self.budget / 1048576:.0f}MB"
+            )
+
+    def report(self) -> dict:
+        """최대 RSS 보고 (MB)"""
+        return {
+            'peak_rss_mb': round(self.peak_total / 1048576, 1),
+            'peak_process_mb': round(self.peak_self / 1048576, 1),
+            'peak_children_mb': round(self.peak_children / 1048576, 1),
+            'budget_mb': round(self.budget / 1048576) or None,
+            'seconds': round(self._elapsed, 2),
+        }
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
@@ -0,0 +1,107 @@
+"""
+Ken Burns 모션 모듈
+템플릿 transition별 줌/팬 곡선으로 프레임마다의 크롭 사각형을 미리 계산하고,
+오버샘플링된 소스 한 장에서 잘라 리샘플링 (moviepy 경로) 또는 같은 곡선의 ffmpeg zoompan 필터 생성
+"""
+import numpy as np
+from PIL import Image
+
+from config import MOTION_SETTINGS
+
+
+def motion_params(transition: str, variant: int = 0) -> dict:
+    """
+    transition 프리셋 + 세그먼트 순번 → 곡선 파라미터
+    짝수 순번은 줌 인, 홀수는 줌 아웃 / 팬 방향은 두 세그먼트마다 반전 (연속 컷이 같은 움직임이 되지 않도록)
+    """
+    preset = MOTION_SETTINGS['transitions'].get(transition) or MOTION_SETTINGS['transitions']['gentle']
+    z0, z1 = preset['zoom']
+    if variant % 2:
+        z0, z1 = z1, z0
+    direction = 1 if (variant // 2) % 2 == 0 else -1
+    half_pan = preset['pan'] / 2 * direction
+    return {
+        'z0': z0, 'z1': z1,
+        'cx0': 0.5 - half_pan, 'cx1': 0.5 + half_pan,
+        'cy0': 0.5, 'cy1': 0.5,
+        'easing': preset['easing'],
+    }
+
+
+def ease(progress: np.ndarray, easing: str) -> np.ndarray:
+    """0~1 진행률 → 이징 적용 (smooth: smoothstep)"""
+    if easing == 'smooth':
+        return progress * progress * (3 - 2 * progress)
+    return progress
+
+
+def crop_boxes(frames: int, source_size: tuple, transition: str, variant: int = 0) -> np.ndarray:
+    """
+    프레임별 크롭 사각형 (frames, 4) float64 [x0, y0, x1, y1] (소스 픽셀 좌표)
+    창 크기 = 소스 / zoom, 중심은 팬 곡선을 따르되 소스 밖으로 나가지 않도록 클램프
+    """
+    params = motion_params(transition, variant)
+    src_w, src_h = source_size
+    progress = ease(np.linspace(0.0, 1.0, frames) if frames > 1 else np.zeros(1), params['easing'])
+
+    zoom = params['z0'] + (params['z1'] - params['z0']) * progress
+    width = src_w / zoom
+    height = src_h / zoom
+    cx = (params['cx0'] + (params['cx1'] - params['cx0']) * progress) * src_w
+    cy = (params['cy0'] + (params['cy1'] - params['cy0']) * progress) * src_h
+    x0 = np.clip(cx - width / 2, 0, src_w - width)
+    y0 = np.clip(cy - height / 2, 0, src_h - height)
+    return np.stack([x0, y0, x0 + width, y0 + height], axis=1)
+
+
+def source_size(width: int, height: int) -> tuple:
+    """모션 소스(오버샘플링) 이미지 크기"""
+    scale = max(1.0, MOTION_SETTINGS['oversample'])
+    return int(round(width * scale / 2)) * 2, int(round(height * scale / 2)) * 2
+
+
+def zoompan_filter(frames: int, width: int, height: int, fps: int,
+                   transition: str, variant: int = 0) -> str:
+    """
+    crop_boxes()와 같은 곡선의 ffmpeg zoompan 필터 (단일 프레임 입력 → frames + 1개 출력)
+    zoompan은 크롭 좌표를 크로마 단위로 맞추므로 yuv444p에서 실행해 떨림을 줄임
+    마지막 한 프레임은 여유분 (뒤따르는 fps 필터가 끝 프레임을 버리므로 trim으로 frames개에 맞춤)
+    """
+    params = motion_params(transition, variant)
+    progress = f"(on/{max(1, frames - 1)})"
+    if params['easing'] == 'smooth':
+        progress = f"({progress}*{progress}*(3-2*{progress}))"
+
+    def curve(start, end):
+        return f"({start:.6f}{end - start:+.6f}*{progress})"
+
+    zoom = curve(params['z0'], params['z1'])
+    x = f"max(0,min(iw-iw/zoom,{curve(params['cx0'], params['cx1'])}*iw-iw/zoom/2))"
+    y = f"max(0,min(ih-ih/zoom,{curve(params['cy0'], params['cy1'])}*ih-ih/zoom/2))"
+    return (
+        f"format=yuv444p,zoompan=z='{zoom}':x='{x}':y='{y}'"
+        f":d={frames + 1}:s={width}x{height}:fps={fps}"
+    )
+
+
+class KenBurns:
+    """오버샘플링된 소스 한 장 + 미리 계산한 크롭 경로로 프레임 생성"""
+
+    def __init__(self, source_path, width: int, height: int, fps: int, frames: int,
+                 transition: str, variant: int = 0, resample=Image.BILINEAR):
+        self.image = Image.open(source_path).convert('RGB')
+        self.image.load()
+        self.size = (width, height)
+        self.fps = fps
+        self.frames = max(1, frames)
+        self.resample = resample
+        self.boxes = crop_boxes(self.frames, self.image.size, transition, variant)
+
+    def frame(self, index: int) -> np.ndarray:
+        """index번째 프레임 (H, W, 3) uint8 - 크롭 영역만 리샘플링"""
+        box = tuple(self.boxes[min(max(index, 0), self.frames - 1)])
+        return np.asarray(self.image.resize(self.size, self.resample, box=box))
+
+    def make_frame(self, t: float) -> np.ndarray:
+        """moviepy VideoClip용 (시간 → 프레임)"""
+        return self.frame(int(round(t * self.fps)))
@@ -0,0 +1,184 @@
+"""
+렌더 파이프라인 모듈
+기사 파싱 → 스크립트 → TTS → 자막 → B-roll → 합성 단계를 실행하고 단계마다 중간 결과(state)를 남김
+웹 프로세스(동기 API)와 렌더 워커(작업 큐)가 같은 파이프라인을 사용하며,
+워커는 state를 작업 큐에 저장해 중단된 작업을 마지막으로 끝난 단계 다음부터 이어서 실행
+"""
+import uuid
+import importlib
+import threading
+from pathlib import Path
+
+from config import OUTPUT_DIR, ensure_directories
+from modules.renditions import find_renditions
+from modules.render_manifest import load_manifest
+from modules.profiler import Profiler
+
+
+# 단계 순서 (state에 같은 이름의 키로 결과 저장)
+STAGES = ('article', 'scripts', 'audio_files', 'subtitles', 'broll_data', 'video')
+
+# 단계 모듈 (처음 쓸 때 import - moviepy/newspaper/openai 등 무거운 의존성을 앱 import에서 제외)
+STAGE_MODULES = {
+    'article_parser': ('modules.article_parser', 'ArticleParser'),
+    'script_generator': ('modules.script_generator', 'ScriptGenerator'),
+    'tts_engine': ('modules.tts_engine', 'TTSEngine'),
+    'subtitle_generator': ('modules.subtitle_generator', 'SubtitleGenerator'),
+    'video_composer': ('modules.video_composer', 'VideoComposer'),
+}
+
+
+class StageAborted(Exception):
+    """단계 콜백이 중단을 요청함 (워커가 작업 리스를 잃음)"""
+
+
+class RenderPipeline:
+    """영상 생성 파이프라인 (단계 모듈은 처음 사용할 때 생성)"""
+
+    def __init__(self):
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    @property
+    def article_parser(self):
+        return self._stage('article_parser')
+
+    @property
+    def script_generator(self):
+        return self._stage('script_generator')
+
+    @property
+    def tts_engine(self):
+        return self._stage('tts_engine')
+
+    @property
+    def subtitle_generator(self):
+        return self._stage('subtitle_generator')
+
+    @property
+    def video_composer(self):
+        return self._stage('video_composer')
+
+    def _stage(self, name: str):
+        """단계 모듈 인스턴스 (처음 호출 시 import/생성, 동시 요청에도 한 번만)"""
+        stage = self._stages.get(name)
+        if stage is None:
+            with self._lock:
+                if name not in self._stages:
+                    if not self._stages:
+                        ensure_directories()
+                    module_name, class_name = STAGE_MODULES[name]
+                    self._stages[name] = getattr(importlib.import_module(module_name), class_name)()
+                stage = self._stages[name]
+        return stage
+
+    def preload(self):
+        """
+        모든 단계 모듈 생성 + 폰트/아바타/B-roll/BGM 인덱스 미리 로드
+        gunicorn 마스터에서 fork 전에 호출하면 워커가 copy-on-write로 공유 (첫 요청 지연 제거)
+        """
+        for name in STAGE_MODULES:
+            self._stage(name)
+        self.article_parser.warm_up()
+        self.video_composer.warm_up()
+
+    def run(self, kind: str, payload: dict, state: dict = None, on_stage=None,
+            profile_id: str = None) -> dict:
+        """
+        작업 실행
+        payload['profiling'] ('sample' | 'cprofile')이 있으면 실행 전체를 프로파일링해
+        state['video']['profiling']에 요약 정보 저장 (파일은 PROFILE_DIR/<profile_id>.*, 실패해도 저장)
+
+        Args:
+            kind: 'generate' ({'url', 'profile', 'renditions'})
+                  | 'rerender' ({'filename', 'scripts': 바꿀 항목})
+                  | 'create' ({'article', 'scripts', 'profile', 'renditions'} - 파싱/스크립트 생략)
+            payload: 작업 입력
+            state: 이전 실행에서 끝난 단계의 결과 (있으면 해당 단계 생략)
+            on_stage: 단계가 끝날 때마다 on_stage(stage, state) 호출, False를 반환하면 StageAborted
+            profile_id: 프로파일 파일 이름 (작업 ID, 없으면 새로 생성)
+
+        Returns:
+            dict: state (state['video']: {'video_path', 'filename', 'renditions', 'article_title',
+                                           'memory', 'segments', 'profiling'})
+        """
+        if not payload.get('profiling'):
+            return self._run(kind, payload, state, on_stage)
+        with Profiler(profile_id or uuid.uuid4().hex, payload['profiling']) as profiler:
+            state = self._run(kind, payload, state, on_stage)
+        state['video']['profiling'] = profiler.report()
+        return state
+
+    def _run(self, kind: str, payload: dict, state: dict, on_stage) -> dict:
+        state = dict(state or {})
+        previous = None
+        if kind == 'rerender':
+            previous = load_manifest(OUTPUT_DIR / Path(payload['filename']).name)
+            state.setdefault('article', previous['article'])
+            state.setdefault('scripts', {**previous['scripts'], **(payload.get('scripts') or {})})
+            profile, renditions = previous['profile'], previous['renditions']
+        else:
+            if kind == 'create':
+                state.setdefault('article', payload['article'])
+                state.setdefault('scripts', payload['scripts'])
+            profile, renditions = payload.get('profile'), payload.get('renditions')
+
+        def stage(name: str, message: str, func):
+            if name in state:
+                return
+            print(message)
+            state[name] = func()
+            if on_stage and on_stage(name, state) is False:
+                raise StageAborted(name)
+
+        stage('article', f"[1/6] 기사 파싱 중... {payload.get('url')}",
+              lambda: self.article_parser.parse(payload['url']))
+        stage('scripts', "[2/6] 스크립트 생성 중...",
+              lambda: self.script_generator.generate(state['article']))
+        # TTS는 문장 단위 캐시 - 재시도해도 이미 합성한 문장은 다시 합성하지 않음
+        stage('audio_files', "[3/6] 음성 생성 중...",
+              lambda: self.tts_engine.generate(state['scripts']))
+        audio_files = self.audio_paths(state['audio_files'])
+        stage('subtitles', "[4/6] 자막 생성 중...",
+              lambda: self.subtitle_generator.generate(state['scripts'], audio_files))
+        stage('broll_data', "[5/6] 자료화면 선택 중...",
+              lambda: self.video_composer.select_broll(state['article'], state['scripts'], previous))
+        stage('video', f"[6/6] 영상 합성 중... ({profile or self.video_composer.profile})",
+              lambda: self._compose(state, audio_files, profile, renditions, previous))
+        return state
+
+    def _compose(self, state: dict, audio_files: dict, profile: str, renditions: list,
+                 previous: dict) -> dict:
+        stats = {}
+        video_path = self.video_composer.compose(
+            scripts=state['scripts'],
+            audio_files=audio_files,
+            subtitles=state['subtitles'],
+            broll_data=state['broll_data'],
+            article=state['article'],
+            profile=profile,
+            renditions=renditions,
+            stats=stats,
+            previous=previous
+        )
+        return {
+            'video_path': str(video_path),
+            'filename': video_path.name,
+            'renditions': {name: path.name for name, path in find_renditions(video_path).items()},
+            'article_title': state['article'].get('title'),
+            'memory': stats.get('memory'),
+            'segments': stats.get('segments'),
+        }
+
+    @staticmethod
+    def audio_paths(audio_files: dict) -> dict:
+        """state에서 읽은 음성 경로(JSON 문자열)를 Path로 복원"""
+        def to_path(value):
+            return Path(value) if value else None
+
+        return {
+            'intro': to_path(audio_files.get('intro')),
+            'narration': [to_path(path) for path in audio_files.get('narration', [])],
+            'outro': to_path(audio_files.get('outro')),
+        }
+
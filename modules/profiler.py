@@ -0,0 +1,215 @@
+"""
+요청 단위 프로파일러 모듈
+권한 있는 호출자가 요청 헤더(X-Profile) 또는 작업 플래그(profiling)로 켜면 파이프라인 전체를 프로파일링해
+PROFILE_DIR에 저장 (sample: 스택 샘플링 → collapsed stack, cprofile: cProfile → pstats)
+"""
+import re
+import sys
+import hmac
+import time
+import pstats
+import cProfile
+import threading
+from collections import Counter
+from pathlib import Path
+
+from config import PROFILING_SETTINGS
+
+
+PROFILE_MODES = ('sample', 'cprofile')
+PROFILE_ID = re.compile(r'[0-9a-f]{32}')
+
+# cProfile은 한 번에 하나만 (Python 3.12+는 인터프리터 전체에서 프로파일러 하나만 허용)
+_cprofile_lock = threading.Lock()
+
+
+def authorize(token: str) -> bool:
+    """프로파일링 권한 확인 (PROFILE_TOKEN이 설정되지 않았으면 항상 False)"""
+    expected = PROFILING_SETTINGS['token']
+    return bool(expected and token) and hmac.compare_digest(token, expected)
+
+
+def profile_files(profile_id: str, directory: Path = None) -> dict:
+    """
+    저장된 프로파일 파일
+
+    Returns:
+        dict: {'collapsed': Path, 'pstats': Path} 중 있는 것 (잘못된 ID면 빈 dict)
+    """
+    if not PROFILE_ID.fullmatch(profile_id or ''):
+        return {}
+    directory = Path(directory or PROFILING_SETTINGS['dir'])
+    files = {
+        'collapsed': directory / f"{profile_id}.collapsed.txt",
+        'pstats': directory / f"{profile_id}.pstats",
+    }
+    return {name: path for name, path in files.items() if path.exists()}
+
+
+def frame_label(code) -> str:
+    """collapsed stack 프레임 이름 (모듈:함수, 구분자 ; 와 공백 제외)"""
+    return f"{Path(code.co_filename).stem}:{code.co_name}".replace(';', ',').replace(' ', '_')
+
+
+class StackSampler:
+    """
+    스레드 하나의 호출 스택을 주기적으로 샘플링 (계측 없이 sys._current_frames로 읽어 오버헤드가 작음)
+    같은 스택은 collapsed stack 한 줄로 합산
+    """
+
+    def __init__(self, thread_id: int, interval: float = None):
+        self.thread_id = thread_id
+        self.interval = interval or PROFILING_SETTINGS['sample_interval']
+        self.counts = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self) -> 'StackSampler':
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    @property
+    def samples(self) -> int:
+        return sum(self.counts.values())
+
+    def write(self, path: Path):
+        """collapsed stack 형식으로 저장 (flamegraph.pl / speedscope에서 바로 열림)"""
+        lines = [f"{stack} {count}" for stack, count in self.counts.most_common()]
+        Path(path).write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            # GIL을 오래 잡은 구간은 샘플이 늦게 오므로 실제 지난 간격 수만큼 가중
+            now = time.perf_counter()
+            weight = max(1, round((now - last) / self.interval))
+            last = now
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.counts[';'.join(reversed(stack))] += weight
+
+
+class Profiler:
+    """
+    with 블록을 실행하는 스레드 프로파일링 (블록이 예외로 끝나도 결과 저장)
+    세그먼트 병렬 인코딩 프로세스와 ffmpeg는 별도 프로세스라 포함되지 않음 (대기 시간으로 보임)
+    """
+
+    def __init__(self, profile_id: str, mode: str = None, directory: Path = None):
+        mode = mode or PROFILING_SETTINGS['mode']
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"지원하지 않는 프로파일링 모드: {mode} ({', '.join(PROFILE_MODES)})")
+        self.profile_id = profile_id
+        self.mode = mode
+        self.directory = Path(directory or PROFILING_SETTINGS['dir'])
+        self._sampler = None
+        self._profile = None
+        self._started = None
+        self._elapsed = 0.0
+
+    def __enter__(self) -> 'Profiler':
+        if self.mode == 'cprofile' and not _cprofile_lock.acquire(blocking=False):
+            print("⚠️ 다른 요청이 cProfile 사용 중 - 스택 샘플링으로 대체")
+            self.mode = 'sample'
+        if self.mode == 'cprofile':
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._sampler = StackSampler(threading.get_ident())
+            self._sampler.__enter__()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._elapsed = time.perf_counter() - self._started
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self._profile:
+            self._profile.disable()
+            _cprofile_lock.release()
+            self._profile.dump_stats(str(self.directory / f"{self.profile_id}.pstats"))
+        else:
+            self._sampler.__exit__(exc_type, exc, tb)
+            self._sampler.write(self.directory / f"{self.profile_id}.collapsed.txt")
+        return False
+
+    def report(self) -> dict:
+        """프로파일 요약 정보 (API 응답/작업 결과에 포함)"""
+        report = {
+            'id': self.profile_id,
+            'mode': self.mode,
+            'seconds': round(self._elapsed, 2),
+            'files': sorted(path.name for path in profile_files(self.profile_id, self.directory).values()),
+        }
+        if self._sampler:
+            report['samples'] = self._sampler.samples
+        return report
+
+
+def summarize(profile_id: str, limit: int = 30, directory: Path = None) -> dict:
+    """
+    저장된 프로파일의 상위 함수
+
+    Returns:
+        dict: collapsed → {'samples', 'self': [...], 'inclusive': [...]} (함수별 샘플 수/비율)
+              pstats → {'calls', 'seconds', 'cumulative': [...], 'self': [...]} (함수별 호출 수/시간)
+              (프로파일이 없으면 None)
+    """
+    files = profile_files(profile_id, directory)
+    if 'collapsed' in files:
+        return _summarize_collapsed(files['collapsed'], limit)
+    if 'pstats' in files:
+        return _summarize_pstats(files['pstats'], limit)
+    return None
+
+
+def _summarize_collapsed(path: Path, limit: int) -> dict:
+    own, inclusive = Counter(), Counter()
+    total = 0
+    for line in path.read_text(encoding='utf-8').splitlines():
+        stack, _, count = line.rpartition(' ')
+        if not stack:
+            continue
+        count = int(count)
+        frames = stack.split(';')
+        total += count
+        own[frames[-1]] += count
+        for frame in set(frames):
+            inclusive[frame] += count
+
+    def top(counter: Counter) -> list:
+        return [
+            {'function': name, 'samples': count, 'percent': round(100 * count / total, 1)}
+            for name, count in counter.most_common(limit)
+        ]
+
+    return {'mode': 'sample', 'samples': total, 'self': top(own), 'inclusive': top(inclusive)}
+
+
+def _summarize_pstats(path: Path, limit: int) -> dict:
+    stats = pstats.Stats(str(path))
+    rows = [
+        {
+            'function': f"{Path(filename).stem}:{name}" if lineno else name,
+            'calls': calls,
+            'self_seconds': round(own, 4),
+            'cumulative_seconds': round(cumulative, 4),
+        }
+        for (filename, lineno, name), (_, calls, own, cumulative, _) in stats.stats.items()
+    ]
+    return {
+        'mode': 'cprofile',
+        'calls': stats.total_calls,
+        'seconds': round(stats.total_tt, 2),
+        'cumulative': sorted(rows, key=lambda row: row['cumulative_seconds'], reverse=True)[:limit],
+        'self': sorted(rows, key=lambda row: row['self_seconds'], reverse=True)[:limit],
+    }
@@ -0,0 +1,96 @@
+"""
+렌더 매니페스트 모듈
+영상마다 세그먼트 구성(문장별 음성 해시, 배경 소스, 자막, 렌더 설정, 세그먼트 캐시 키)을
+출력 파일 옆에 저장하고, 스크립트 수정 후 재렌더링할 때 바뀐 세그먼트만 골라냄
+"""
+import os
+import json
+import hashlib
+from difflib import SequenceMatcher
+from pathlib import Path
+
+
+# 매니페스트 형식이 바뀌면 올림 (다른 버전은 재렌더링에 사용하지 않음)
+MANIFEST_VERSION = 1
+
+
+def manifest_path(output_path: Path) -> Path:
+    """출력 영상 기준 매니페스트 경로 (shorts_x.mp4 → shorts_x.manifest.json)"""
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}.manifest.json")
+
+
+def file_digest(path: Path) -> str:
+    """파일 내용 SHA-1 앞 16자리 (파일이 없으면 None)"""
+    if not path or not Path(path).exists():
+        return None
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def write_manifest(output_path: Path, manifest: dict) -> Path:
+    """매니페스트 저장 (임시 파일 후 교체)"""
+    path = manifest_path(output_path)
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_text(
+        json.dumps({'version': MANIFEST_VERSION, **manifest}, ensure_ascii=False, indent=2, default=str),
+        encoding='utf-8'
+    )
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_manifest(output_path: Path) -> dict:
+    """
+    출력 영상의 매니페스트 로드
+
+    Raises:
+        FileNotFoundError: 매니페스트 없음 (이 기능 이전에 만든 영상)
+        ValueError: 다른 형식 버전
+    """
+    path = manifest_path(output_path)
+    if not path.exists():
+        raise FileNotFoundError(f"렌더 매니페스트가 없습니다: {path.name}")
+    manifest = json.loads(path.read_text(encoding='utf-8'))
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError(f"지원하지 않는 매니페스트 버전: {manifest.get('version')}")
+    return manifest
+
+
+def match_sentences(old: list, new: list) -> list:
+    """
+    수정된 문장 리스트를 이전 문장에 대응
+
+    같은 문장과 같은 자리에서 고쳐 쓴 문장은 이전 인덱스에 대응하고 (배경 유지),
+    새로 끼워 넣은 문장은 None
+
+    Returns:
+        list: 새 문장 순서대로 이전 문장 인덱스 또는 None
+    """
+    mapping = [None] * len(new)
+    for tag, i1, i2, j1, j2 in SequenceMatcher(a=old, b=new, autojunk=False).get_opcodes():
+        if tag in ('equal', 'replace'):
+            for offset in range(min(i2 - i1, j2 - j1)):
+                mapping[j1 + offset] = i1 + offset
+    return mapping
+
+
+def changed_segments(previous: dict, segments: list) -> list:
+    """
+    이전 매니페스트에 없는 세그먼트 (음성/배경/자막/설정/프레임 수 중 하나라도 바뀐 세그먼트)
+
+    Args:
+        previous: 이전 매니페스트
+        segments: 새 매니페스트의 'segments'
+
+    Returns:
+        list: 바뀐 세그먼트의 (kind, index)
+    """
+    before = {(segment['key'], segment['audio_hash']) for segment in previous.get('segments', [])}
+    return [
+        (segment['kind'], segment['index']) for segment in segments
+        if (segment['key'], segment['audio_hash']) not in before
+    ]
@@ -0,0 +1,148 @@
+"""
+출력 렌디션 모듈
+메인 영상과 함께 저해상도 영상/포스터 JPEG 등 추가 렌디션을 같은 ffmpeg 호출에서 생성
+(합성 결과를 split으로 나눠 한 번의 디코딩/합성으로 모든 렌디션을 인코딩)
+"""
+from pathlib import Path
+
+from config import AUDIO_SETTINGS, RENDITIONS
+from modules.ffmpeg_utils import run_ffmpeg
+
+
+def resolve_renditions(names: list) -> list:
+    """
+    렌디션 이름 리스트 → [(이름, 설정)] (알 수 없는 이름이면 ValueError)
+    """
+    resolved = []
+    for name in names or []:
+        if name not in RENDITIONS:
+            raise ValueError(f"알 수 없는 렌디션: {name} (사용 가능: {', '.join(RENDITIONS)})")
+        resolved.append((name, RENDITIONS[name]))
+    return resolved
+
+
+def rendition_path(output_path: Path, name: str) -> Path:
+    """메인 출력 경로 기준 렌디션 파일 경로 (shorts_x.mp4 → shorts_x_720p.mp4 / shorts_x_poster.jpg)"""
+    output_path = Path(output_path)
+    suffix = '.jpg' if RENDITIONS[name]['type'] == 'image' else output_path.suffix
+    return output_path.with_name(f"{output_path.stem}_{name}{suffix}")
+
+
+def find_renditions(output_path: Path) -> dict:
+    """디스크에 존재하는 렌디션 {이름: 경로}"""
+    found = {}
+    for name in RENDITIONS:
+        path = rendition_path(output_path, name)
+        if path.exists():
+            found[name] = path
+    return found
+
+
+def is_rendition_file(path: Path) -> bool:
+    """렌디션 파일인지 (영상 목록에서 메인 영상만 보여주기 위함)"""
+    stem = Path(path).stem
+    return any(stem.endswith(f"_{name}") for name in RENDITIONS)
+
+
+def poster_frame(plan: dict, fps: int) -> int:
+    """포스터 프레임 번호 (첫 본문 세그먼트 중간, 본문이 없으면 타임라인 중간)"""
+    body = [segment for segment in plan['segments'] if segment['kind'] == 'body']
+    if body:
+        seconds = body[0]['start'] + body[0]['duration'] / 2
+    else:
+        seconds = plan['duration'] / 2
+    return int(seconds * fps)
+
+
+def rendition_graph(source: str, renditions: list, main: bool = False,
+                    poster_frame: int = 0) -> tuple:
+    """
+    합성 결과를 렌디션 수만큼 split하는 필터 체인
+
+    Args:
+        source: 합성 결과 필터 라벨 또는 입력 스트림 (예: 'vcat', '0:v')
+        renditions: resolve_renditions() 결과
+        main: True면 메인 출력용 분기도 만듦
+        poster_frame: 포스터로 쓸 프레임 번호
+
+    Returns:
+        (filters, main_label, {이름: 라벨})
+    """
+    branches = len(renditions) + (1 if main else 0)
+    labels = [f"rend{idx}" for idx in range(branches)]
+    filters = [f"[{source}]split={branches}{''.join(f'[{label}]' for label in labels)}"]
+
+    main_label = labels.pop(0) if main else None
+    outputs = {}
+    for (name, spec), label in zip(renditions, labels):
+        out_label = f"{label}out"
+        # 포스터 분기는 select가 프레임 하나만 통과시키므로 스케일/인코딩 비용이 거의 없음
+        select = f"select=eq(n\\,{poster_frame})," if spec['type'] == 'image' else ''
+        filters.append(
+            f"[{label}]{select}scale={spec['width']}:{spec['height']}:flags=lanczos,setsar=1[{out_label}]"
+        )
+        outputs[name] = out_label
+    return filters, main_label, outputs
+
+
+def rendition_output_args(renditions: list, labels: dict, output_path: Path,
+                          settings: dict, audio_map: str = None, duration: float = None) -> list:
+    """
+    렌디션별 출력 인자 (메인 출력 뒤에 이어 붙이는 ffmpeg 출력 옵션들)
+
+    Args:
+        renditions: resolve_renditions() 결과
+        labels: rendition_graph()의 {이름: 라벨}
+        output_path: 메인 출력 경로
+        settings: 렌더 프로필이 적용된 VIDEO_SETTINGS
+        audio_map: 오디오 스트림 지정자 (None이면 영상만)
+        duration: 출력 길이(초) - 메인 출력과 같은 길이로 자름
+    """
+    args = []
+    for name, spec in renditions:
+        path = rendition_path(output_path, name)
+        if spec['type'] == 'image':
+            args += [
+                '-map', f"[{labels[name]}]",
+                '-frames:v', 1, '-q:v', spec.get('quality', 2), '-update', 1,
+                str(path),
+            ]
+            continue
+
+        args += ['-map', f"[{labels[name]}]"]
+        args += [
+            '-c:v', settings['codec'],
+            '-preset', settings['preset'],
+            '-crf', spec.get('crf', settings['crf']),
+            '-pix_fmt', settings['pix_fmt'],
+            '-r', settings['fps'],
+        ]
+        if spec.get('maxrate'):
+            args += ['-maxrate', spec['maxrate'], '-bufsize', spec.get('bufsize', spec['maxrate'])]
+        if audio_map:
+            args += [
+                '-map', audio_map,
+                '-c:a', AUDIO_SETTINGS['codec'],
+                '-b:a', spec.get('audio_bitrate', AUDIO_SETTINGS['bitrate']),
+            ]
+        if duration:
+            args += ['-t', f"{duration:.6f}"]
+        args += ['-movflags', '+faststart', str(path)]
+    return args
+
+
+def render_renditions(video_path: Path, renditions: list, settings: dict,
+                      poster_frame: int = 0) -> dict:
+    """
+    완성된 영상에서 렌디션을 한 번의 디코딩으로 생성 (필터 그래프를 직접 만들지 않는 moviepy 경로용)
+
+    Returns:
+        dict: {이름: 경로}
+    """
+    if not renditions:
+        return {}
+    filters, _, labels = rendition_graph('0:v', renditions, poster_frame=poster_frame)
+    args = ['-i', str(video_path), '-filter_complex', ';'.join(filters)]
+    args += rendition_output_args(renditions, labels, video_path, settings, '0:a?')
+    run_ffmpeg(args, '렌디션 생성')
+    return {name: rendition_path(video_path, name) for name, _ in renditions}
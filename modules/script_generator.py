@@ -3,7 +3,6 @@
 기사 내용을 기반으로 인트로/본문/아웃트로 스크립트 생성
 """
 import os
-from openai import OpenAI
 from config import OPENAI_API_KEY, SCRIPT_PROMPTS
 
 
@@ -15,6 +14,8 @@ class ScriptGenerator:
             print("⚠️ OPENAI_API_KEY가 설정되지 않았습니다. 테스트 모드로 작동합니다.")
             self.client = None
         else:
+            # openai SDK(httpx/pydantic)는 import 비용이 커서 클라이언트를 만들 때 import
+            from openai import OpenAI
             self.client = OpenAI(api_key=OPENAI_API_KEY)
     
     def generate(self, article: dict) -> dict:
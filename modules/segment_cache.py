@@ -0,0 +1,91 @@
+"""
+세그먼트 캐시 모듈
+작업마다 내용이 같은 세그먼트(아웃트로 등)의 인코딩 결과를 디스크에 보관하고
+segments 엔진이 다시 인코딩하지 않고 연결(스트림 복사)에 그대로 사용하도록 함
+캐시 크기는 SEGMENT_CACHE_MAX_MB로 제한 (사용 시각 기준 LRU 삭제)
+"""
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+from pathlib import Path
+
+from config import CACHE_DIR, VIDEO_SETTINGS
+
+
+# 캐시 키에 포함 (세그먼트 인코딩 방식이 바뀌면 올려서 기존 캐시 무효화)
+CACHE_VERSION = 1
+
+# 최근 사용한 세그먼트는 용량을 넘어도 삭제하지 않음 (다른 렌더링이 연결 중일 수 있음)
+PRUNE_GRACE_SECONDS = 600
+
+
+def cache_key(*parts) -> str:
+    """키 구성 요소(dict/list/문자열/숫자) → 16자리 해시 (dict는 키 순서와 무관)"""
+    payload = json.dumps([CACHE_VERSION, *parts], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class SegmentCache:
+    """인코딩된 세그먼트 파일 캐시"""
+
+    def __init__(self, cache_dir: Path = None, max_mb: int = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else CACHE_DIR / 'segments'
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = (VIDEO_SETTINGS['segment_cache_mb'] if max_mb is None else max_mb) * 1024 * 1024
+
+    def path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.mp4"
+
+    def get(self, key: str) -> Path:
+        """캐시된 세그먼트 경로 (없으면 None, 있으면 수정 시각을 갱신해 LRU 사용 시각으로 씀)"""
+        path = self.path(key)
+        try:
+            # atime은 noatime/relatime 마운트에서 믿을 수 없으므로 mtime 사용
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key: str, source: Path) -> Path:
+        """인코딩된 세그먼트를 캐시에 복사 (임시 파일 후 교체 - 동시 렌더링과 충돌하지 않도록)"""
+        path = self.path(key)
+        fd, tmp_path = tempfile.mkstemp(suffix='.mp4', dir=self.cache_dir)
+        os.close(fd)
+        try:
+            shutil.copyfile(source, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        self.prune()
+        return path
+
+    def prune(self) -> int:
+        """
+        캐시가 max_bytes를 넘으면 오래 사용하지 않은 세그먼트부터 삭제
+
+        Returns:
+            int: 삭제한 파일 수
+        """
+        if not self.max_bytes:
+            return 0
+        entries = []
+        for path in self.cache_dir.glob('*.mp4'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # 다른 프로세스가 먼저 삭제
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        cutoff = time.time() - PRUNE_GRACE_SECONDS
+        for mtime, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes or mtime > cutoff:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,317 @@
+"""
+세그먼트 렌더 엔진 모듈
+렌더링 계획의 세그먼트를 각각 인코딩한 뒤 concat demuxer + 스트림 복사로 이어 붙임
+정지 세그먼트(이미지/단색 + 자막)는 한 장의 프레임으로 합성해 긴 GOP의 루프 스틸로 인코딩
+세그먼트 인코딩은 프로세스 풀에서 병렬 실행
+"""
+import os
+import shutil
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from config import AUDIO_SETTINGS
+from modules.audio_utils import write_pcm
+from modules.ffmpeg_renderer import FFmpegRenderer, frame_boundaries
+from modules.ffmpeg_utils import run_ffmpeg
+from modules.renditions import poster_frame, rendition_graph, rendition_output_args
+from modules.segment_cache import SegmentCache
+from modules.subtitle_renderer import SubtitleRenderer
+
+
+STATIC_VISUALS = ('image', 'color')
+
+
+def is_static(segment: dict) -> bool:
+    """화면 변화가 없는 세그먼트인지 (Ken Burns 모션이 없는 이미지/단색 배경)"""
+    visual = segment['visual']
+    return visual['type'] in STATIC_VISUALS and not visual.get('motion')
+
+
+_worker_renderer = None
+
+
+def _init_worker(width: int, height: int, fps: int, threads: int, subtitles: bool,
+                 settings: dict):
+    """풀 워커 프로세스마다 렌더러를 한 번 생성 (폰트/자막 캐시는 프로세스별로 유지)"""
+    global _worker_renderer
+    subtitle_renderer = SubtitleRenderer(width, height) if subtitles else None
+    _worker_renderer = SegmentRenderer(width, height, fps, subtitle_renderer,
+                                       threads=threads, settings=settings, workers=1)
+
+
+def _encode_in_worker(job: tuple) -> Path:
+    return _worker_renderer.encode_segment(*job)
+
+
+class SegmentRenderer(FFmpegRenderer):
+    """세그먼트 단위 인코딩 + 무손실 연결 렌더러"""
+
+    def __init__(self, width: int = None, height: int = None, fps: int = None,
+                 subtitle_renderer=None, threads: int = None, settings: dict = None,
+                 workers: int = None):
+        super().__init__(width, height, fps, subtitle_renderer, threads, settings)
+        self.workers = max(1, workers or self.settings['workers'])
+        self._segment_cache = None
+        # 마지막 render_segments()에서 인코딩한 / 세그먼트 캐시에서 가져온 세그먼트 수
+        self.encoded = 0
+        self.reused = 0
+
+    @property
+    def segment_cache(self) -> SegmentCache:
+        """세그먼트 캐시 (최초 사용 시 생성)"""
+        if self._segment_cache is None:
+            self._segment_cache = SegmentCache()
+        return self._segment_cache
+
+    def render(self, plan: dict, soundtrack: np.ndarray, output_path: Path,
+               subtitles_filter: str = None, renditions: list = None) -> Path:
+        """
+        렌더링 계획을 세그먼트별로 인코딩한 뒤 스트림 복사로 연결하고 오디오를 한 번 먹싱
+
+        Args:
+            plan: VideoComposer.build_plan()의 결과
+            soundtrack: (frames, channels) float32 사운드트랙 버퍼
+            output_path: 출력 파일 경로
+            subtitles_filter: burn 모드 subtitles 필터 (세그먼트 시작 시각만큼 PTS를 옮겨 적용)
+            renditions: 연결 단계에서 함께 인코딩할 추가 렌디션 (resolve_renditions() 결과)
+        """
+        work_dir = Path(tempfile.mkdtemp(prefix='seg_', dir=self._work_root()))
+        try:
+            segment_paths = self.render_segments(plan, work_dir, subtitles_filter)
+            total_frames = sum(frame_boundaries(plan['segments'], self.fps))
+            self.assemble(segment_paths, soundtrack, output_path, work_dir, renditions,
+                          poster_frame(plan, self.fps), total_frames / float(self.fps))
+            return output_path
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def render_segments(self, plan: dict, work_dir: Path, subtitles_filter: str = None) -> list:
+        """
+        모든 세그먼트를 인코딩하여 타임라인 순서의 파일 경로 리스트 반환
+        workers > 1이면 프로세스 풀에서 병렬 인코딩 (세그먼트마다 동일한 인코더 인자)
+        segment['cache_key']가 있는 세그먼트는 세그먼트 캐시에 있으면 인코딩 없이 그대로 사용
+        """
+        jobs = []
+        start_frame = 0
+        frame_counts = frame_boundaries(plan['segments'], self.fps)
+        for idx, (segment, frames) in enumerate(zip(plan['segments'], frame_counts)):
+            jobs.append((
+                segment, frames, plan.get('style'), work_dir / f"segment_{idx:03d}.mp4",
+                self._shift_filter(subtitles_filter, start_frame),
+            ))
+            start_frame += frames
+
+        keys = [job[0].get('cache_key') for job in jobs]
+        paths = [self.segment_cache.get(key) if key else None for key in keys]
+        pending = [i for i, path in enumerate(paths) if path is None]
+        for i, path in enumerate(paths):
+            if path:
+                print(f"✓ 캐시된 세그먼트 사용: {jobs[i][0]['kind']}")
+        self.encoded, self.reused = len(pending), len(jobs) - len(pending)
+
+        for i, path in zip(pending, self._encode_jobs([jobs[i] for i in pending])):
+            paths[i] = path
+            if keys[i]:
+                self.segment_cache.put(keys[i], path)
+        return paths
+
+    def _encode_jobs(self, jobs: list) -> list:
+        """세그먼트 작업 리스트 인코딩 (결과는 작업 순서)"""
+        workers = min(self.workers, len(jobs))
+        if workers <= 1:
+            return [self.encode_segment(*job) for job in jobs]
+
+        # 프로세스마다 x264 스레드를 나눠 전체 코어 수를 넘지 않도록
+        threads = max(1, (os.cpu_count() or workers) // workers)
+        # forkserver: 이미 여러 스레드(gunicorn/하트비트/메모리 측정/TTS 풀)가 도는 프로세스를 fork하면
+        # 다른 스레드가 잡고 있던 잠금이 복제되어 풀 워커가 멈출 수 있음 (워커 상태는 initargs로만 재구성)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('forkserver'),
+            initializer=_init_worker,
+            initargs=(self.width, self.height, self.fps, threads,
+                      self.subtitle_renderer is not None, self.settings),
+        ) as executor:
+            # 긴 세그먼트부터 제출해 워커 간 부하를 고르게 (결과는 타임라인 순서로 수집)
+            order = sorted(range(len(jobs)), key=lambda i: jobs[i][1], reverse=True)
+            futures = {i: executor.submit(_encode_in_worker, jobs[i]) for i in order}
+            return [futures[i].result() for i in range(len(jobs))]
+
+    def encode_segment(self, segment: dict, frames: int, style: str, output_path: Path,
+                       subtitles_filter: str = None) -> Path:
+        """
+        세그먼트 하나를 비디오 전용 mp4로 인코딩
+
+        Args:
+            segment: build_plan()의 세그먼트
+            frames: 프레임 수 (frame_boundaries 기준)
+            style: 자막 스타일
+            output_path: 출력 경로
+            subtitles_filter: 세그먼트 시각에 맞춘 burn 모드 필터 (None이면 Pillow 자막)
+        """
+        if is_static(segment):
+            still_path = output_path.with_suffix('.png')
+            self.compose_still(segment, style, subtitles=not subtitles_filter).save(
+                still_path, compress_level=0
+            )
+            # 프레임을 한 번만 디코딩하고 tpad로 복제 (-loop 1은 매 프레임 이미지를 다시 디코딩)
+            chain = f"format=yuv420p,tpad=stop_mode=clone:stop={frames - 1}"
+            if subtitles_filter:
+                chain += f",{subtitles_filter},format=yuv420p"
+            args = ['-framerate', self.fps, '-i', still_path, '-vf', chain]
+            args += ['-frames:v', frames] + self.video_encoder_args() + [
+                # 화면 변화가 없으므로 세그먼트 전체를 하나의 GOP로
+                # (-tune 등 x264 튜닝은 PPS가 달라져 스트림 복사 연결이 깨지므로 GOP 길이만 조정)
+                '-g', frames,
+                '-an', str(output_path),
+            ]
+            run_ffmpeg(args, f"정지 세그먼트 인코딩 ({segment['kind']})")
+            still_path.unlink(missing_ok=True)
+            return output_path
+
+        if self._can_copy_avatar(segment, frames, subtitles_filter):
+            return self.copy_avatar(segment, frames, output_path)
+
+        # 움직이는 세그먼트 (아바타/B-roll 영상, Ken Burns 이미지): 스케일/모션/트림 + 자막 overlay
+        work_dir = output_path.parent
+        inputs = self._segment_input(segment, frames, work_dir, 0)
+        chain = self._segment_chain(0, segment, frames)
+        if subtitles_filter:
+            graph = f"{chain},{subtitles_filter},format=yuv420p[v]"
+        elif segment.get('subtitle') and self.subtitle_renderer:
+            bitmap_path, (x, y) = self._subtitle_bitmap(
+                segment['subtitle'], style, work_dir, output_path.stem
+            )
+            inputs += ['-i', bitmap_path]
+            graph = f"{chain}[bg];[bg][1:v]overlay={x}:{y}:format=auto,format=yuv420p[v]"
+        else:
+            graph = f"{chain}[v]"
+
+        args = inputs + [
+            '-filter_complex', graph, '-map', '[v]',
+            '-frames:v', frames,
+        ] + self.video_encoder_args() + ['-an', str(output_path)]
+        run_ffmpeg(args, f"세그먼트 인코딩 ({segment['kind']})")
+        return output_path
+
+    def _can_copy_avatar(self, segment: dict, frames: int, subtitles_filter: str = None) -> bool:
+        """자막 없는 아바타 세그먼트이고 메자닌에서 GOP 하나 이상을 그대로 복사할 수 있는지"""
+        visual = segment['visual']
+        if visual['type'] != 'avatar' or not visual.get('gop') or not visual.get('frames'):
+            return False
+        if subtitles_filter or (segment.get('subtitle') and self.subtitle_renderer):
+            return False
+        return min(frames, visual['frames'] - 1) >= visual['gop']
+
+    def copy_avatar(self, segment: dict, frames: int, output_path: Path) -> Path:
+        """
+        아바타 메자닌을 GOP 경계까지 스트림 복사 + 나머지 프레임만 재인코딩해 이어 붙임
+        (메자닌은 출력 형식/인코더 설정이 같으므로 concat 복사로 다른 세그먼트와 합쳐짐)
+        """
+        visual = segment['visual']
+        gop = visual['gop']
+        copy_frames = min(frames, visual['frames'] - 1) // gop * gop
+        tail_frames = frames - copy_frames
+
+        head_path = output_path.with_name(f"{output_path.stem}_head.mp4")
+        run_ffmpeg([
+            '-i', visual['path'], '-map', '0:v:0', '-c', 'copy',
+            '-frames:v', copy_frames, '-an', str(head_path),
+        ], f"아바타 세그먼트 복사 ({segment['kind']})")
+        if not tail_frames:
+            os.replace(head_path, output_path)
+            return output_path
+
+        # 꼬리: 복사 구간 끝(키프레임)부터 디코딩, 아바타보다 길면 마지막 프레임 유지
+        tail_path = output_path.with_name(f"{output_path.stem}_tail.mp4")
+        run_ffmpeg([
+            '-ss', f"{copy_frames / float(self.fps):.6f}", '-i', visual['path'],
+            '-vf', f"tpad=stop_mode=clone:stop={tail_frames},format=yuv420p",
+            '-frames:v', tail_frames,
+        ] + self.video_encoder_args() + ['-an', str(tail_path)],
+            f"아바타 세그먼트 꼬리 인코딩 ({segment['kind']})")
+
+        list_path = output_path.with_suffix('.txt')
+        list_path.write_text(
+            ''.join(f"file '{path.resolve().as_posix()}'\n" for path in (head_path, tail_path)),
+            encoding='utf-8',
+        )
+        run_ffmpeg([
+            '-f', 'concat', '-safe', 0, '-i', list_path,
+            '-c', 'copy', '-an', str(output_path),
+        ], f"아바타 세그먼트 연결 ({segment['kind']})")
+        for path in (head_path, tail_path, list_path):
+            path.unlink(missing_ok=True)
+        return output_path
+
+    def compose_still(self, segment: dict, style: str = None, subtitles: bool = True) -> Image.Image:
+        """정지 세그먼트 프레임 합성 (배경 + 자막 비트맵)"""
+        visual = segment['visual']
+        frame = None
+        if visual['type'] == 'image':
+            image_path = self.image_path(visual)
+            if image_path:
+                frame = Image.open(image_path).convert('RGB')
+        if frame is None:
+            color = visual.get('color') or visual.get('fallback', (60, 70, 90))
+            frame = Image.new('RGB', (self.width, self.height), tuple(color))
+
+        if subtitles and segment.get('subtitle') and self.subtitle_renderer:
+            bitmap = self.subtitle_renderer.render(segment['subtitle'], style)
+            overlay = Image.fromarray(bitmap, 'RGBA')
+            frame.paste(overlay, self.subtitle_renderer.position(bitmap, style), overlay)
+        return frame
+
+    def _shift_filter(self, subtitles_filter: str, start_frame: int) -> str:
+        """전체 타임라인 기준 subtitles 필터를 세그먼트 시작 시각으로 옮겨 적용하는 필터 체인"""
+        if not subtitles_filter:
+            return None
+        offset = f"{start_frame / float(self.fps):.6f}"
+        return f"setpts=PTS+{offset}/TB,{subtitles_filter},setpts=PTS-STARTPTS"
+
+    def assemble(self, segment_paths: list, soundtrack: np.ndarray,
+                 output_path: Path, work_dir: Path, renditions: list = None,
+                 poster_index: int = 0, duration: float = None) -> Path:
+        """
+        세그먼트 파일을 concat demuxer로 스트림 복사 연결하고 사운드트랙을 한 번만 인코딩하여 먹싱
+        추가 렌디션은 같은 호출에서 연결된 스트림을 한 번 디코딩해 split으로 인코딩
+        """
+        list_path = work_dir / 'segments.txt'
+        list_path.write_text(
+            ''.join(f"file '{Path(p).resolve().as_posix()}'\n" for p in segment_paths),
+            encoding='utf-8'
+        )
+
+        args = ['-f', 'concat', '-safe', '0', '-i', list_path]
+        audio_map = None
+        if soundtrack is not None and len(soundtrack):
+            audio_path = write_pcm(work_dir / 'soundtrack.wav', soundtrack)
+            args += ['-i', audio_path]
+            audio_map = '1:a'
+
+        rendition_labels = {}
+        if renditions:
+            filters, _, rendition_labels = rendition_graph('0:v', renditions, poster_frame=poster_index)
+            args += ['-filter_complex', ';'.join(filters)]
+
+        args += ['-map', '0:v', '-c:v', 'copy']
+        if audio_map:
+            args += [
+                '-map', audio_map,
+                '-c:a', AUDIO_SETTINGS['codec'],
+                '-b:a', AUDIO_SETTINGS['bitrate'],
+                '-ar', AUDIO_SETTINGS['sample_rate'],
+                '-shortest',
+            ]
+        args += ['-movflags', '+faststart', str(output_path)]
+
+        if renditions:
+            args += rendition_output_args(renditions, rendition_labels, output_path,
+                                          self.settings, audio_map, duration)
+        run_ffmpeg(args, '세그먼트 연결')
+        return output_path
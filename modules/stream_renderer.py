@@ -0,0 +1,241 @@
+"""
+스트리밍 렌더 엔진 모듈
+렌더링 계획을 세그먼트 순서대로 한 프레임씩 만들어 하나의 ffmpeg 인코더(stdin raw RGB)로 흘려보냄
+각 세그먼트의 소스(이미지/아바타 디코더)는 화면에 나오는 동안만 열고 바로 해제하므로
+메모리 사용량이 영상 길이/세그먼트 수와 무관하게 프레임 몇 장 수준으로 유지됨
+"""
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from config import AUDIO_SETTINGS
+from modules.audio_utils import write_pcm
+from modules.ffmpeg_renderer import frame_boundaries
+from modules.ffmpeg_utils import ffmpeg_binary
+from modules.frame_compositor import FrameCompositor
+from modules.motion import KenBurns
+from modules.renditions import poster_frame, rendition_graph, rendition_output_args, rendition_path
+from modules.segment_renderer import SegmentRenderer, is_static
+
+
+class FramePipe:
+    """ffmpeg 하위 프로세스와 raw 프레임을 주고받는 파이프 (stderr는 임시 파일로 받아 교착 방지)"""
+
+    def __init__(self, args: list, description: str, read: bool = False):
+        self.description = description
+        self._stderr = tempfile.TemporaryFile()
+        cmd = [ffmpeg_binary(), '-hide_banner', '-loglevel', 'error', '-y'] + [str(a) for a in args]
+        self.process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL if read else subprocess.PIPE,
+            stdout=subprocess.PIPE if read else subprocess.DEVNULL,
+            stderr=self._stderr,
+        )
+
+    def write(self, frame: np.ndarray):
+        try:
+            self.process.stdin.write(np.ascontiguousarray(frame).data)
+        except BrokenPipeError:
+            self.close()
+            raise
+
+    def read(self, size: int) -> bytes:
+        return self.process.stdout.read(size)
+
+    def close(self):
+        """입력을 닫고 종료를 기다림 (실패 시 stderr 마지막 부분을 포함한 예외)"""
+        if self.process.stdin:
+            try:
+                self.process.stdin.close()
+            except BrokenPipeError:
+                pass
+        returncode = self.process.wait()
+        self._stderr.seek(0)
+        stderr = self._stderr.read().decode(errors='ignore').strip()
+        self._stderr.close()
+        if returncode != 0:
+            raise Exception(f"{self.description} 실패: {stderr[-800:]}")
+
+    def kill(self):
+        """중단 (출력 결과 버림)"""
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout):
+            if stream:
+                stream.close()
+        self._stderr.close()
+
+
+class StreamRenderer(SegmentRenderer):
+    """세그먼트 순차 스트리밍 렌더러 (단일 인코더, 소스는 세그먼트 구간에서만 유지)"""
+
+    def __init__(self, width: int = None, height: int = None, fps: int = None,
+                 subtitle_renderer=None, threads: int = None, settings: dict = None,
+                 monitor=None):
+        super().__init__(width, height, fps, subtitle_renderer, threads, settings, workers=1)
+        # monitor: MemoryMonitor (프레임마다 예산 확인, None이면 확인 안 함)
+        self.monitor = monitor
+        # 자막 합성용 프레임 버퍼 (프레임은 바로 인코더로 쓰이므로 하나를 재사용)
+        self.compositor = FrameCompositor(self.width, self.height)
+
+    def render(self, plan: dict, soundtrack: np.ndarray, output_path: Path,
+               subtitles_filter: str = None, renditions: list = None) -> Path:
+        """
+        렌더링 계획을 프레임 단위로 인코더에 전달
+
+        Args:
+            plan: VideoComposer.build_plan()의 결과
+            soundtrack: (frames, channels) float32 사운드트랙 버퍼 (WAV로 내보낸 뒤 인코더가 읽음)
+            output_path: 출력 파일 경로
+            subtitles_filter: burn 모드 subtitles 필터 (인코더 입력 전체에 적용)
+            renditions: 같은 인코더 호출에서 함께 만들 추가 렌디션 (resolve_renditions() 결과)
+                        포스터(이미지)는 해당 프레임을 직접 저장 (인코더 split 분기는 프레임을 쌓아 둠)
+                        burn 모드는 자막이 인코더에서 입혀지므로 포스터도 인코더에서 생성
+        """
+        renditions = renditions or []
+        posters = [] if subtitles_filter else [r for r in renditions if r[1]['type'] == 'image']
+        videos = [r for r in renditions if r not in posters]
+        poster_index = poster_frame(plan, self.fps)
+        work_dir = Path(tempfile.mkdtemp(prefix='str_', dir=self._work_root()))
+        encoder = None
+        try:
+            audio_path = None
+            if soundtrack is not None and len(soundtrack):
+                audio_path = write_pcm(work_dir / 'soundtrack.wav', soundtrack)
+
+            frame_counts = frame_boundaries(plan['segments'], self.fps)
+            encoder = FramePipe(
+                self.encoder_args(plan, sum(frame_counts), output_path, audio_path,
+                                  subtitles_filter, videos),
+                '스트리밍 인코딩'
+            )
+            style = plan.get('style')
+            index = 0
+            for segment, frames in zip(plan['segments'], frame_counts):
+                for frame in self.segment_frames(segment, frames, style, subtitles=not subtitles_filter):
+                    if self.monitor:
+                        self.monitor.check()
+                    encoder.write(frame)
+                    if index == poster_index and posters:
+                        self._save_posters(frame, posters, output_path)
+                    index += 1
+            encoder.close()
+            encoder = None
+            return output_path
+        finally:
+            if encoder:
+                encoder.kill()
+                Path(output_path).unlink(missing_ok=True)
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    @staticmethod
+    def _save_posters(frame: np.ndarray, posters: list, output_path: Path):
+        """포스터 렌디션 JPEG 저장 (ffmpeg -q:v 2 ≈ Pillow quality 95)"""
+        image = Image.fromarray(frame)
+        for name, spec in posters:
+            image.resize((spec['width'], spec['height']), Image.LANCZOS).save(
+                rendition_path(output_path, name), 'JPEG', quality=max(10, 100 - spec.get('quality', 2) * 2 - 1)
+            )
+
+    def encoder_args(self, plan: dict, total_frames: int, output_path: Path, audio_path: Path = None,
+                     subtitles_filter: str = None, renditions: list = None) -> list:
+        """stdin raw RGB 프레임 + 사운드트랙 WAV → 메인 출력 (+ 렌디션) ffmpeg 인자"""
+        args = [
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+            '-s', f"{self.width}x{self.height}", '-framerate', self.fps,
+            '-i', '-',
+        ]
+        if audio_path:
+            args += ['-i', audio_path]
+
+        filters = []
+        source = '0:v'
+        if subtitles_filter:
+            filters.append(f"[0:v]{subtitles_filter},format=yuv420p[vsub]")
+            source = 'vsub'
+
+        main_label = source
+        rendition_labels = {}
+        if renditions:
+            split_filters, main_label, rendition_labels = rendition_graph(
+                source, renditions, main=True, poster_frame=poster_frame(plan, self.fps)
+            )
+            filters += split_filters
+
+        if filters:
+            args += ['-filter_complex', ';'.join(filters), '-map', f"[{main_label}]"]
+        else:
+            args += ['-map', '0:v']
+        if audio_path:
+            args += [
+                '-map', '1:a',
+                '-c:a', AUDIO_SETTINGS['codec'],
+                '-b:a', AUDIO_SETTINGS['bitrate'],
+                '-ar', AUDIO_SETTINGS['sample_rate'],
+            ]
+        duration = total_frames / float(self.fps)
+        args += self.video_encoder_args() + [
+            '-frames:v', total_frames,
+            '-t', f"{duration:.6f}",
+            '-movflags', '+faststart',
+            str(output_path),
+        ]
+        if renditions:
+            args += rendition_output_args(renditions, rendition_labels, output_path, self.settings,
+                                          '1:a' if audio_path else None, duration)
+        return args
+
+    def segment_frames(self, segment: dict, frames: int, style: str = None, subtitles: bool = True):
+        """
+        세그먼트 프레임 제너레이터 (H, W, 3) uint8
+        소스는 제너레이터가 끝나거나 닫힐 때 해제됨
+        """
+        visual = segment['visual']
+        motion_path = self.image_path(visual) if visual['type'] == 'image' and visual.get('motion') else None
+        if is_static(segment) or (visual['type'] == 'image' and not motion_path):
+            # 정지 세그먼트: 자막까지 합성한 프레임 한 장을 반복
+            frame = np.asarray(self.compose_still(segment, style, subtitles))
+            for _ in range(frames):
+                yield frame
+            return
+
+        overlays = ()
+        if subtitles and segment.get('subtitle') and self.subtitle_renderer:
+            bitmap = self.subtitle_renderer.render(segment['subtitle'], style)
+            overlays = (self.compositor.overlay(bitmap, self.subtitle_renderer.position(bitmap, style)),)
+
+        if motion_path:
+            source = KenBurns(motion_path, self.width, self.height, self.fps, frames,
+                              visual['motion'], visual.get('variant', 0))
+            for index in range(frames):
+                yield self.compositor.compose(source.frame(index), overlays)
+            return
+
+        # 아바타/B-roll 영상: 디코더 프로세스는 이 세그먼트 동안만 유지, 영상이 짧으면 마지막 프레임 유지
+        reader = self._open_video(visual['path'])
+        frame_size = self.width * self.height * 3
+        last = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        try:
+            for _ in range(frames):
+                data = reader.read(frame_size)
+                if len(data) == frame_size:
+                    last = np.frombuffer(data, dtype=np.uint8).reshape(self.height, self.width, 3)
+                yield self.compositor.compose(last, overlays)
+        finally:
+            reader.kill()
+
+    def _open_video(self, path: str) -> FramePipe:
+        """출력 해상도/fps raw RGB 디코더 (메자닌은 이미 같은 형식이라 scale/fps는 그대로 통과)"""
+        return FramePipe([
+            '-i', path, '-an',
+            '-vf', (
+                f"scale={self.width}:{self.height}:force_original_aspect_ratio=increase,"
+                f"crop={self.width}:{self.height},fps={self.fps}"
+            ),
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-',
+        ], '아바타 디코딩', read=True)
@@ -3,8 +3,9 @@
 스크립트와 오디오 타이밍을 기반으로 자막 데이터 생성
 """
 from pathlib import Path
-import pysrt
 from datetime import timedelta
+from modules.audio_utils import pcm_duration
+from config import VIDEO_SETTINGS, FONTS_DIR
 
 
 class SubtitleGenerator:
@@ -85,6 +86,9 @@ class SubtitleGenerator:
             float: 재생 시간(초)
         """
         try:
+            # 정규화된 PCM WAV는 헤더만 읽어 계산 (디코딩 없음)
+            if Path(audio_path).suffix == '.wav':
+                return pcm_duration(audio_path)
             from pydub import AudioSegment
             audio = AudioSegment.from_file(str(audio_path))
             return len(audio) / 1000.0  # ms to seconds
@@ -102,6 +106,8 @@ class SubtitleGenerator:
             output_path: 저장할 SRT 파일 경로
         """
         try:
+            import pysrt
+            
             srt_subs = pysrt.SubRipFile()
             index = 1
             
@@ -129,6 +135,126 @@ class SubtitleGenerator:
         except Exception as e:
             print(f"⚠️ SRT 파일 저장 실패: {e}")
     
+    def save_ass(self, subtitles: dict, output_path: Path, style: str = None,
+                 width: int = None, height: int = None) -> Path:
+        """
+        자막을 스타일이 적용된 ASS 파일로 저장 (ffmpeg subtitles 필터 번인용)
+        
+        Args:
+            subtitles: 자막 딕셔너리
+            output_path: 저장할 ASS 파일 경로
+            style: SUBTITLE_STYLES 키 (템플릿 subtitle_style)
+            width, height: 출력 해상도 (PlayRes, 기본 VIDEO_SETTINGS)
+            
+        Returns:
+            Path: 저장된 ASS 파일 경로
+        """
+        from modules.subtitle_renderer import resolve_style, find_font
+        
+        width = width or VIDEO_SETTINGS['width']
+        height = height or VIDEO_SETTINGS['height']
+        scale = width / float(VIDEO_SETTINGS['width'])
+        settings = resolve_style(style)
+        
+        # libass는 파일명이 아닌 폰트 패밀리 이름으로 매칭
+        font_name, bold = settings['font'], -1
+        font_path = find_font()
+        if font_path:
+            try:
+                from PIL import ImageFont
+                family, face = ImageFont.truetype(str(font_path), 10).getname()
+                font_name = family
+                bold = -1 if 'bold' in (face or '').lower() else 0
+            except Exception as e:
+                print(f"⚠️ 폰트 이름 읽기 실패, 설정값 사용: {e}")
+        
+        margin_h = int(width * (1 - settings['max_width_ratio']) / 2)
+        style_line = ','.join(str(v) for v in [
+            'Default', font_name,
+            int(settings['font_size'] * scale),
+            self._ass_color(settings['color']),
+            self._ass_color(settings['color']),
+            self._ass_color(settings['stroke_color']),
+            '&H00000000',
+            bold, 0, 0, 0,              # Bold, Italic, Underline, StrikeOut
+            100, 100, 0, 0,             # ScaleX, ScaleY, Spacing, Angle
+            1,                          # BorderStyle: 외곽선
+            round(settings['stroke_width'] * scale, 1), 0,  # Outline, Shadow
+            2,                          # Alignment: 하단 중앙
+            margin_h, margin_h,
+            int(settings['padding'] * scale),
+            1,
+        ])
+        
+        lines = [
+            '[Script Info]',
+            'ScriptType: v4.00+',
+            f'PlayResX: {width}',
+            f'PlayResY: {height}',
+            'WrapStyle: 0',
+            'ScaledBorderAndShadow: yes',
+            '',
+            '[V4+ Styles]',
+            'Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, '
+            'BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, '
+            'BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding',
+            f'Style: {style_line}',
+            '',
+            '[Events]',
+            'Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text',
+        ]
+        for start, end, text in self.to_moviepy_format(subtitles):
+            lines.append(
+                f"Dialogue: 0,{self._ass_time(start)},{self._ass_time(end)},Default,,0,0,0,,"
+                f"{self._ass_text(text)}"
+            )
+        
+        output_path = Path(output_path)
+        output_path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+        return output_path
+    
+    @staticmethod
+    def burn_filter(ass_path: Path) -> str:
+        """ASS 파일을 입히는 ffmpeg 필터 문자열 (폰트 디렉토리 포함)"""
+        def escape(path):
+            # 옵션 값 이스케이프(: ') 후 필터그래프 이스케이프(\ ' , ; [ ])
+            value = str(path).replace('\\', '/')
+            value = value.replace(':', r'\:').replace("'", r"\'")
+            for char in ['\\', "'", ',', ';', '[', ']']:
+                value = value.replace(char, '\\' + char)
+            return value
+        
+        from modules.subtitle_renderer import find_font
+        
+        font_path = find_font()
+        fonts_dir = font_path.parent if font_path else FONTS_DIR
+        
+        option = f"subtitles=filename={escape(ass_path)}"
+        if fonts_dir.exists():
+            option += f":fontsdir={escape(fonts_dir)}"
+        return option
+    
+    @staticmethod
+    def _ass_time(seconds: float) -> str:
+        """초 → H:MM:SS.cc"""
+        centis = int(round(max(seconds, 0) * 100))
+        hours, centis = divmod(centis, 360000)
+        minutes, centis = divmod(centis, 6000)
+        secs, centis = divmod(centis, 100)
+        return f"{hours}:{minutes:02d}:{secs:02d}.{centis:02d}"
+    
+    @staticmethod
+    def _ass_color(color: str) -> str:
+        """CSS 색상 → ASS &HAABBGGRR"""
+        from PIL import ImageColor
+        r, g, b = ImageColor.getrgb(color)[:3]
+        return f"&H00{b:02X}{g:02X}{r:02X}"
+    
+    @staticmethod
+    def _ass_text(text: str) -> str:
+        """ASS 오버라이드 태그/줄바꿈 이스케이프"""
+        return text.replace('\\', '\\\\').replace('{', '\\{').replace('}', '\\}').replace('\n', '\\N')
+    
     def to_moviepy_format(self, subtitles: dict) -> list:
         """
         moviepy TextClip에서 사용할 수 있는 형식으로 변환
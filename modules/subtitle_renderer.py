@@ -0,0 +1,173 @@
+"""
+자막 래스터라이저 모듈
+Pillow로 한글 폰트를 한 번만 로드하여 자막을 RGBA 비트맵으로 렌더링
+(ImageMagick 외부 프로세스 없이 동작, (텍스트, 스타일) 단위 캐시)
+"""
+import os
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from config import SUBTITLE_SETTINGS, SUBTITLE_STYLES, FONTS_DIR, VIDEO_SETTINGS
+
+
+FONT_EXTENSIONS = ('.ttf', '.otf', '.ttc')
+
+
+def font_search_dirs() -> list:
+    """폰트 검색 디렉토리 (프로젝트 → OS 기본 경로 순)"""
+    dirs = [FONTS_DIR]
+    if sys.platform.startswith('win'):
+        dirs.append(Path(os.environ.get('WINDIR', 'C:/Windows')) / 'Fonts')
+    elif sys.platform == 'darwin':
+        dirs += [Path.home() / 'Library/Fonts', Path('/Library/Fonts'), Path('/System/Library/Fonts')]
+    else:
+        dirs += [Path.home() / '.fonts', Path.home() / '.local/share/fonts',
+                 Path('/usr/local/share/fonts'), Path('/usr/share/fonts')]
+    return [d for d in dirs if d.exists()]
+
+
+def find_font(name: str = None) -> Path:
+    """
+    폰트 이름(예: NanumGothicBold)에 해당하는 폰트 파일 검색
+
+    Returns:
+        Path: 폰트 파일 경로 (없으면 None)
+    """
+    if SUBTITLE_SETTINGS['font_path'] and Path(SUBTITLE_SETTINGS['font_path']).exists():
+        return Path(SUBTITLE_SETTINGS['font_path'])
+
+    target = (name or SUBTITLE_SETTINGS['font']).lower().replace(' ', '').replace('-', '')
+    for directory in font_search_dirs():
+        for path in directory.rglob('*'):
+            if path.suffix.lower() not in FONT_EXTENSIONS:
+                continue
+            if path.stem.lower().replace(' ', '').replace('-', '') == target:
+                return path
+    return None
+
+
+def resolve_style(style: str = None) -> dict:
+    """SUBTITLE_SETTINGS에 템플릿 스타일을 덮어쓴 최종 스타일"""
+    resolved = dict(SUBTITLE_SETTINGS)
+    resolved.update(SUBTITLE_STYLES.get(style, {}))
+    return resolved
+
+
+class SubtitleRenderer:
+    """자막 비트맵 렌더링 클래스"""
+
+    def __init__(self, width: int = None, height: int = None, cache_size: int = 256):
+        self.width = width or VIDEO_SETTINGS['width']
+        self.height = height or VIDEO_SETTINGS['height']
+        # 기준 해상도(1080 너비) 대비 폰트 크기 배율
+        self.scale = self.width / float(VIDEO_SETTINGS['width'])
+        self.font_path = find_font()
+        if self.font_path is None:
+            print(f"⚠️ 자막 폰트({SUBTITLE_SETTINGS['font']})를 찾을 수 없습니다. "
+                  f"{FONTS_DIR}에 폰트 파일을 배치하세요.")
+        self._fonts = {}
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def render(self, text: str, style: str = None) -> np.ndarray:
+        """
+        자막 텍스트를 RGBA 비트맵으로 렌더링 (캐시 사용)
+
+        Args:
+            text: 자막 텍스트
+            style: SUBTITLE_STYLES 키 (템플릿 subtitle_style)
+
+        Returns:
+            np.ndarray: (h, w, 4) uint8 RGBA
+        """
+        key = (text, style)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        bitmap = self._rasterize(text, resolve_style(style))
+
+        with self._lock:
+            self._cache[key] = bitmap
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return bitmap
+
+    def preload(self):
+        """템플릿 스타일별 크기의 폰트 미리 로드"""
+        for style in [None, *SUBTITLE_STYLES]:
+            self._font(max(8, int(resolve_style(style)['font_size'] * self.scale)))
+
+    def position(self, bitmap: np.ndarray, style: str = None) -> tuple:
+        """비트맵 좌상단 좌표 (가로 중앙, 하단 여백 padding)"""
+        padding = int(resolve_style(style)['padding'] * self.scale)
+        h, w = bitmap.shape[:2]
+        return ((self.width - w) // 2, self.height - padding - h)
+
+    def _font(self, size: int) -> ImageFont.FreeTypeFont:
+        """크기별 폰트 객체 (한 번만 로드)"""
+        if size not in self._fonts:
+            if self.font_path:
+                self._fonts[size] = ImageFont.truetype(str(self.font_path), size)
+            else:
+                # Pillow 10.1+ 기본 FreeType 폰트 (한글 글리프 없음)
+                self._fonts[size] = ImageFont.load_default(size)
+        return self._fonts[size]
+
+    def _rasterize(self, text: str, style: dict) -> np.ndarray:
+        font = self._font(max(8, int(style['font_size'] * self.scale)))
+        stroke = int(round(style['stroke_width'] * self.scale))
+        max_width = int(self.width * style['max_width_ratio']) - stroke * 2
+
+        lines = self.wrap(text, font, max_width)
+        ascent, descent = font.getmetrics()
+        line_height = int((ascent + descent) * style['line_spacing'])
+        widths = [int(font.getlength(line)) for line in lines]
+
+        image_width = max(widths + [1]) + stroke * 2
+        image_height = line_height * (len(lines) - 1) + ascent + descent + stroke * 2
+        image = Image.new('RGBA', (image_width, image_height), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+
+        for idx, (line, line_width) in enumerate(zip(lines, widths)):
+            x = (image_width - line_width) // 2
+            y = stroke + idx * line_height
+            draw.text(
+                (x, y), line, font=font,
+                fill=style['color'],
+                stroke_width=stroke,
+                stroke_fill=style['stroke_color']
+            )
+
+        return np.asarray(image)
+
+    @staticmethod
+    def wrap(text: str, font, max_width: int) -> list:
+        """측정된 너비 기준 줄바꿈 (공백 단위, 긴 단어는 글자 단위)"""
+        lines = []
+        for paragraph in text.split('\n'):
+            current = ''
+            for word in paragraph.split():
+                candidate = f"{current} {word}" if current else word
+                if font.getlength(candidate) <= max_width:
+                    current = candidate
+                    continue
+                if current:
+                    lines.append(current)
+                # 한 단어가 한 줄보다 긴 경우 글자 단위로 분할
+                current = ''
+                for char in word:
+                    if current and font.getlength(current + char) > max_width:
+                        lines.append(current)
+                        current = char
+                    else:
+                        current += char
+            lines.append(current)
+        return [line for line in lines if line] or ['']
@@ -0,0 +1,189 @@
+"""
+TTS 백엔드 모듈
+gTTS / ElevenLabs / 로컬(오프라인) 음성 합성 엔진을 공통 인터페이스로 제공
+"""
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+
+from config import TTS_SETTINGS, NARRATION_SETTINGS, ELEVENLABS_API_KEY
+
+
+class TTSBackend:
+    """TTS 백엔드 기본 클래스"""
+
+    name = 'base'
+    extension = 'mp3'
+
+    # 백엔드 이름별 세마포어 (프로세스 내 모든 TTSEngine이 공유)
+    _semaphores = {}
+    _semaphore_lock = threading.Lock()
+
+    def __init__(self):
+        self.concurrency = max(1, TTS_SETTINGS['concurrency'].get(self.name, 1))
+        with TTSBackend._semaphore_lock:
+            if self.name not in TTSBackend._semaphores:
+                TTSBackend._semaphores[self.name] = threading.BoundedSemaphore(self.concurrency)
+        self._semaphore = TTSBackend._semaphores[self.name]
+
+    def is_available(self) -> bool:
+        """백엔드 사용 가능 여부"""
+        return True
+
+    def signature(self) -> str:
+        """같은 텍스트면 같은 음성이 나오는 설정 식별자 (고정 멘트 캐시 키용)"""
+        return f"{self.name}|{NARRATION_SETTINGS['speaking_rate']}|{NARRATION_SETTINGS['pitch']}"
+
+    def synthesize(self, text: str, output_path: Path) -> Path:
+        """
+        동시 실행 수 제한을 지키며 음성 합성
+
+        Args:
+            text: 변환할 텍스트
+            output_path: 저장할 파일 경로 (확장자는 self.extension)
+
+        Returns:
+            Path: 생성된 오디오 파일 경로
+        """
+        with self._semaphore:
+            self._synthesize(text, output_path)
+        return output_path
+
+    def _synthesize(self, text: str, output_path: Path):
+        raise NotImplementedError
+
+
+class GTTSBackend(TTSBackend):
+    """gTTS 백엔드 (무료, 한국어 지원 양호, 네트워크 필요)"""
+
+    name = 'gtts'
+    extension = 'mp3'
+
+    def _synthesize(self, text: str, output_path: Path):
+        from gtts import gTTS
+
+        tts = gTTS(text=text, lang='ko', slow=NARRATION_SETTINGS['speaking_rate'] < 1.0)
+        tts.save(str(output_path))
+
+
+class ElevenLabsBackend(TTSBackend):
+    """ElevenLabs REST API 백엔드"""
+
+    name = 'elevenlabs'
+    extension = 'mp3'
+
+    def __init__(self):
+        super().__init__()
+        self.api_base = TTS_SETTINGS['elevenlabs_api_base'].rstrip('/')
+        self.voice_id = TTS_SETTINGS['elevenlabs_voice_id']
+        self.model = TTS_SETTINGS['elevenlabs_model']
+
+    def is_available(self) -> bool:
+        # 음성 ID가 없으면 미설정으로 보고 gTTS로 대체 (NARRATION_SETTINGS의 Google 음성 이름은 쓸 수 없음)
+        return bool(ELEVENLABS_API_KEY and self.voice_id)
+
+    def signature(self) -> str:
+        return f"{super().signature()}|{self.voice_id}|{self.model}"
+
+    def _synthesize(self, text: str, output_path: Path):
+        import requests
+
+        response = requests.post(
+            f"{self.api_base}/v1/text-to-speech/{self.voice_id}",
+            headers={
+                'xi-api-key': ELEVENLABS_API_KEY or '',
+                'Accept': 'audio/mpeg',
+            },
+            json={
+                'text': text,
+                'model_id': self.model,
+            },
+            timeout=TTS_SETTINGS['timeout']
+        )
+        response.raise_for_status()
+        output_path.write_bytes(response.content)
+
+
+class LocalTTSBackend(TTSBackend):
+    """
+    로컬 오프라인 백엔드
+    espeak-ng 또는 piper 실행 파일을 subprocess로 호출 (WAV 출력)
+    """
+
+    name = 'local'
+    extension = 'wav'
+
+    def __init__(self):
+        super().__init__()
+        self.engine = TTS_SETTINGS['local_engine']
+        self.piper_model = TTS_SETTINGS['piper_model']
+
+    def is_available(self) -> bool:
+        if self.engine == 'piper':
+            return bool(shutil.which('piper') and self.piper_model)
+        return bool(shutil.which('espeak-ng') or shutil.which('espeak'))
+
+    def signature(self) -> str:
+        return f"{super().signature()}|{self.engine}|{self.piper_model}"
+
+    def _synthesize(self, text: str, output_path: Path):
+        rate = NARRATION_SETTINGS['speaking_rate']
+
+        if self.engine == 'piper':
+            cmd = [
+                'piper',
+                '--model', self.piper_model,
+                '--output_file', str(output_path),
+                '--length_scale', f"{1.0 / rate:.3f}",
+            ]
+            subprocess.run(
+                cmd, input=text.encode('utf-8'), check=True,
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                timeout=TTS_SETTINGS['timeout']
+            )
+        else:
+            binary = shutil.which('espeak-ng') or 'espeak'
+            # espeak 피치 범위 0~99 (기본 50), NARRATION pitch는 반음 단위
+            pitch = int(min(99, max(0, 50 + NARRATION_SETTINGS['pitch'] * 4)))
+            cmd = [
+                binary,
+                '-v', 'ko',
+                '-s', str(int(175 * rate)),
+                '-p', str(pitch),
+                '-w', str(output_path),
+                text,
+            ]
+            subprocess.run(
+                cmd, check=True,
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                timeout=TTS_SETTINGS['timeout']
+            )
+
+
+BACKENDS = {
+    'gtts': GTTSBackend,
+    'elevenlabs': ElevenLabsBackend,
+    'local': LocalTTSBackend,
+}
+
+
+def get_backend(name: str = None) -> TTSBackend:
+    """
+    설정된 이름으로 TTS 백엔드 생성
+
+    Args:
+        name: 백엔드 이름 (None이면 TTS_SETTINGS['backend'])
+
+    Returns:
+        TTSBackend: 백엔드 인스턴스
+    """
+    name = name or TTS_SETTINGS['backend']
+    if name not in BACKENDS:
+        raise ValueError(f"지원하지 않는 TTS 백엔드입니다: {name}")
+
+    backend = BACKENDS[name]()
+    if not backend.is_available():
+        print(f"⚠️ TTS 백엔드 '{name}'를 사용할 수 없어 gTTS로 대체합니다.")
+        backend = GTTSBackend()
+    return backend
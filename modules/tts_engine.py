@@ -3,17 +3,25 @@ TTS (Text-to-Speech) 엔진 모듈
 스크립트를 음성으로 변환
 """
 import os
+import uuid
+import hashlib
 from pathlib import Path
-from gtts import gTTS
-from config import OUTPUT_DIR
+from concurrent.futures import ThreadPoolExecutor
+from config import OUTPUT_DIR, CACHE_DIR, AUDIO_SETTINGS
+from modules.tts_backends import get_backend
+from modules.audio_utils import normalize_to_pcm, pcm_duration
 
 
 class TTSEngine:
     """TTS 생성 클래스"""
     
-    def __init__(self):
+    def __init__(self, backend: str = None):
         self.audio_dir = OUTPUT_DIR / 'audio'
-        self.audio_dir.mkdir(exist_ok=True)
+        self.audio_dir.mkdir(parents=True, exist_ok=True)
+        self.backend = get_backend(backend)
+        # 모든 멘트를 (백엔드 설정, 텍스트) 기준으로 캐시: 아웃트로 같은 고정 멘트는 한 번만 합성하고,
+        # 스크립트 일부만 고친 재렌더링은 바뀐 문장만 합성
+        self.cache_dir = CACHE_DIR / 'tts'
     
     def generate(self, scripts: dict) -> dict:
         """
@@ -30,68 +38,86 @@ class TTSEngine:
             }
         """
         try:
+            # (키, 텍스트, 파일명) 작업 목록 구성
+            jobs = []
+            if scripts.get('intro'):
+                jobs.append(('intro', scripts['intro'], 'intro'))
+            for idx, sentence in enumerate(scripts.get('narration') or []):
+                jobs.append(('narration', sentence, f'narration_{idx}'))
+            if scripts.get('outro'):
+                jobs.append(('outro', scripts['outro'], 'outro'))
+            
+            # 백엔드 동시성 한도 내에서 병렬 합성 (순서 유지)
+            workers = max(1, min(self.backend.concurrency, len(jobs)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                paths = list(executor.map(
+                    lambda job: self._text_to_speech(job[1], job[2], cache=True),
+                    jobs
+                ))
+            
             audio_files = {
                 'intro': None,
                 'narration': [],
                 'outro': None
             }
-            
-            # 인트로 음성 생성
-            if scripts.get('intro'):
-                audio_files['intro'] = self._text_to_speech(
-                    scripts['intro'], 
-                    'intro.mp3'
-                )
-            
-            # 본문 나레이션 음성 생성
-            if scripts.get('narration'):
-                for idx, sentence in enumerate(scripts['narration']):
-                    audio_path = self._text_to_speech(
-                        sentence,
-                        f'narration_{idx}.mp3'
-                    )
+            for (key, _, _), audio_path in zip(jobs, paths):
+                if key == 'narration':
                     audio_files['narration'].append(audio_path)
-            
-            # 아웃트로 음성 생성
-            if scripts.get('outro'):
-                audio_files['outro'] = self._text_to_speech(
-                    scripts['outro'],
-                    'outro.mp3'
-                )
+                else:
+                    audio_files[key] = audio_path
             
             return audio_files
             
         except Exception as e:
             raise Exception(f"TTS 생성 중 오류: {str(e)}")
     
-    def _text_to_speech(self, text: str, filename: str) -> Path:
+    def _text_to_speech(self, text: str, filename: str, cache: bool = False) -> Path:
         """
         텍스트를 음성 파일로 변환
         
         Args:
             text: 변환할 텍스트
-            filename: 저장할 파일명
+            filename: 저장할 파일명 (확장자 제외)
+            cache: True면 캐시된 음성을 재사용 (같은 텍스트는 다시 합성하지 않음)
             
         Returns:
-            Path: 생성된 오디오 파일 경로
+            Path: PCM WAV로 정규화된 오디오 파일 경로
         """
         try:
-            # gTTS 사용 (무료, 한국어 지원 양호)
-            tts = gTTS(text=text, lang='ko', slow=False)
+            target_path = self.audio_dir / f"{filename}.wav"
+            if cache:
+                target_path = self.cache_path(text)
+                if target_path.exists():
+                    return target_path
+                target_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # 파일 저장
-            audio_path = self.audio_dir / filename
-            tts.save(str(audio_path))
+            # 동시에 도는 다른 작업과 원본 파일이 겹치지 않도록 작업마다 다른 이름
+            raw_path = self.audio_dir / f"{filename}_{uuid.uuid4().hex[:8]}.{self.backend.extension}"
+            self.backend.synthesize(text, raw_path)
             
-            print(f"✓ 음성 생성 완료: {filename}")
+            # 백엔드 출력(mp3 등)을 목표 샘플레이트 PCM으로 한 번만 디코딩
+            audio_path = normalize_to_pcm(raw_path, target_path)
+            
+            print(f"✓ 음성 생성 완료 ({self.backend.name}): {audio_path.name}")
             return audio_path
             
         except Exception as e:
             raise Exception(f"음성 파일 생성 실패 ({filename}): {str(e)}")
     
+    def cache_path(self, text: str) -> Path:
+        """음성 캐시 경로 (백엔드/음성 설정, 출력 포맷, 텍스트 기준)"""
+        key = '|'.join([
+            self.backend.signature(),
+            str(AUDIO_SETTINGS['sample_rate']), str(AUDIO_SETTINGS['channels']),
+            text,
+        ])
+        return self.cache_dir / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}.wav"
+    
     def get_duration(self, audio_path: Path) -> float:
         """오디오 파일 길이(초) 반환"""
         try:
+            if Path(audio_path).suffix == '.wav':
+                return pcm_duration(audio_path)
             from pydub import AudioSegment
             audio = AudioSegment.from_file(str(audio_path))
             return len(audio) / 1000.0  # ms to seconds
@@ -0,0 +1,216 @@
+"""
+영상 카탈로그 모듈
+합성이 끝날 때 생성 영상 정보(파일 크기, 기사, 카테고리, 길이, 렌디션)를 SQLite에 기록해
+영상 목록을 출력 디렉토리 스캔 없이 인덱스로 조회 (커서 페이지네이션 - 파일 수와 무관하게 페이지당 일정 비용)
+"""
+import json
+import base64
+from datetime import datetime
+from pathlib import Path
+
+from config import OUTPUT_DIR, VIDEO_CATALOG_SETTINGS
+from modules.job_queue import SQLiteConnection
+from modules.renditions import find_renditions, is_rendition_file
+from modules.render_manifest import load_manifest
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    filename TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    duration REAL,
+    profile TEXT,
+    category TEXT,
+    article_url TEXT,
+    article_title TEXT,
+    renditions TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS videos_created ON videos (created, filename);
+CREATE INDEX IF NOT EXISTS videos_category ON videos (category, created, filename);
+CREATE INDEX IF NOT EXISTS videos_profile ON videos (profile, created, filename);
+"""
+
+# 목록 필터 (컬럼 = 값, 각각 (컬럼, created, filename) 인덱스 사용)
+FILTERS = ('category', 'profile')
+
+# PRAGMA user_version: 기존 출력 디렉토리를 한 번 색인했는지
+CATALOG_VERSION = 1
+
+
+class VideoCatalog:
+    """생성 영상 카탈로그"""
+
+    def __init__(self, db_path: Path = None, output_dir: Path = None):
+        self.db_path = Path(db_path or VIDEO_CATALOG_SETTINGS['db_path'])
+        self.output_dir = Path(output_dir or OUTPUT_DIR)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute(f"PRAGMA journal_mode={VIDEO_CATALOG_SETTINGS['journal_mode']}")
+            db.executescript(SCHEMA)
+            version = db.execute("PRAGMA user_version").fetchone()[0]
+        if version < CATALOG_VERSION:
+            # 카탈로그 도입 전에 만든 영상 (처음 한 번만 스캔)
+            count = self.rebuild()
+            with self._connect() as db:
+                db.execute(f"PRAGMA user_version = {CATALOG_VERSION}")
+            print(f"✓ 영상 카탈로그 생성: 기존 영상 {count}개 색인")
+
+    def add(self, video_path: Path, manifest: dict = None, duration: float = None) -> dict:
+        """
+        영상 기록 (같은 파일명이면 교체)
+
+        Args:
+            video_path: 메인 영상 경로 (렌디션은 옆에 있는 파일로 조회)
+            manifest: 렌더 매니페스트 (기사/프로필 정보, 없으면 파일 정보만 기록)
+            duration: 영상 길이(초, 없으면 매니페스트 세그먼트로 계산)
+
+        Returns:
+            dict: 기록한 항목 (list()와 같은 형식)
+        """
+        video_path = Path(video_path)
+        manifest = manifest or {}
+        article = manifest.get('article') or {}
+        segments = manifest.get('segments') or []
+        if duration is None and segments:
+            duration = max(segment['start'] + segment['duration'] for segment in segments)
+        stat = video_path.stat()
+        created = stat.st_mtime
+        if manifest.get('created'):
+            created = datetime.fromisoformat(manifest['created']).timestamp()
+        video = {
+            'filename': video_path.name,
+            'size': stat.st_size,
+            'created': created,
+            'duration': round(duration, 2) if duration is not None else None,
+            'profile': manifest.get('profile'),
+            'category': article.get('category'),
+            'article_url': article.get('url'),
+            'article_title': article.get('title'),
+            'renditions': {name: path.name for name, path in find_renditions(video_path).items()},
+        }
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO videos (filename, size, created, duration, profile, category, "
+                "article_url, article_title, renditions) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (*(video[key] for key in ('filename', 'size', 'created', 'duration', 'profile',
+                                          'category', 'article_url', 'article_title')),
+                 json.dumps(video['renditions'], ensure_ascii=False))
+            )
+        return video
+
+    def remove(self, filename: str) -> bool:
+        """영상 항목 삭제 (파일을 지웠을 때)"""
+        with self._connect() as db:
+            return db.execute("DELETE FROM videos WHERE filename = ?", (filename,)).rowcount == 1
+
+    def list(self, limit: int = None, cursor: str = None, since: float = None, until: float = None,
+             **filters) -> dict:
+        """
+        최신순 영상 목록 한 페이지
+
+        Args:
+            limit: 페이지 크기 (기본 VIDEO_PAGE_SIZE, 최대 max_page_size)
+            cursor: 이전 페이지의 next_cursor
+            since, until: 생성 시각 범위 (Unix timestamp, since 이상 until 미만)
+            **filters: category, profile (값이 같은 항목만)
+
+        Returns:
+            dict: {'videos': [{'filename', 'size', 'created', 'duration', 'profile', 'category',
+                               'article_url', 'article_title', 'renditions'}],
+                   'next_cursor': 다음 페이지 커서 또는 None}
+
+        Raises:
+            ValueError: 잘못된 커서/필터
+        """
+        limit = min(limit or VIDEO_CATALOG_SETTINGS['page_size'], VIDEO_CATALOG_SETTINGS['max_page_size'])
+        if limit < 1:
+            raise ValueError("limit은 1 이상이어야 합니다")
+        unknown = set(filters) - set(FILTERS)
+        if unknown:
+            raise ValueError(f"지원하지 않는 필터: {', '.join(sorted(unknown))} (사용 가능: {', '.join(FILTERS)})")
+
+        where, params = [], []
+        for column, value in filters.items():
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            where.append("created >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("created < ?")
+            params.append(until)
+        if cursor:
+            # (created, filename) 키셋: OFFSET 없이 인덱스에서 바로 다음 위치로 이동
+            created, filename = decode_cursor(cursor)
+            where.append("(created < ? OR (created = ? AND filename < ?))")
+            params.extend([created, created, filename])
+
+        query = "SELECT * FROM videos"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY created DESC, filename DESC LIMIT ?"
+        with self._connect() as db:
+            rows = db.execute(query, (*params, limit + 1)).fetchall()
+
+        videos = [dict(row, renditions=json.loads(row['renditions'])) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = videos[-1]
+            next_cursor = encode_cursor(last['created'], last['filename'])
+        return {'videos': videos, 'next_cursor': next_cursor}
+
+    def rebuild(self) -> int:
+        """
+        출력 디렉토리를 스캔해 카탈로그 재구성 (없는 파일 항목 삭제, 매니페스트가 있으면 기사 정보 포함)
+
+        Returns:
+            int: 색인한 영상 수
+        """
+        filenames = []
+        for video_path in self.output_dir.glob('*.mp4'):
+            if is_rendition_file(video_path):
+                continue
+            try:
+                manifest = load_manifest(video_path)
+            except (FileNotFoundError, ValueError):
+                manifest = None
+            try:
+                self.add(video_path, manifest)
+            except FileNotFoundError:
+                continue  # 스캔 중 삭제됨
+            filenames.append(video_path.name)
+        with self._connect() as db:
+            existing = [row['filename'] for row in db.execute("SELECT filename FROM videos")]
+            missing = set(existing) - set(filenames)
+            db.executemany("DELETE FROM videos WHERE filename = ?", [(name,) for name in missing])
+        return len(filenames)
+
+    def _connect(self) -> SQLiteConnection:
+        return SQLiteConnection(self.db_path)
+
+
+def encode_cursor(created: float, filename: str) -> str:
+    """페이지 커서 (마지막 항목의 생성 시각/파일명, URL에 그대로 쓸 수 있는 문자열)"""
+    raw = json.dumps([created, filename], ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """encode_cursor() 역변환 (잘못된 커서면 ValueError)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created, filename = json.loads(raw)
+        return float(created), str(filename)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"잘못된 커서: {cursor}") from e
+
+
+if __name__ == '__main__':
+    # 테스트: 출력 디렉토리 재색인 후 첫 페이지 출력
+    catalog = VideoCatalog()
+    print(f"색인한 영상: {catalog.rebuild()}개")
+    for video in catalog.list(limit=10)['videos']:
+        print(f"{datetime.fromtimestamp(video['created']):%Y-%m-%d %H:%M}  {video['filename']}  "
+              f"{video['category'] or '-'}  {video['article_title'] or ''}")
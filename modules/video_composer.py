@@ -3,52 +3,140 @@
 아바타, 나레이션, 자막, B-roll을 합성하여 최종 영상 생성
 """
 import os
+import uuid
 from pathlib import Path
 from datetime import datetime
-from moviepy.editor import (
-    VideoFileClip, AudioFileClip, ImageClip, 
-    CompositeVideoClip, TextClip, concatenate_videoclips
-)
-from moviepy.video.fx.resize import resize
-from moviepy.video.fx.fadeout import fadeout
-from moviepy.video.fx.fadein import fadein
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 
 from config import (
-    VIDEO_SETTINGS, AVATAR_SETTINGS, OUTPUT_DIR,
-    SUBTITLE_SETTINGS, AVATARS_DIR, BROLL_DIR
+    AVATAR_SETTINGS, OUTPUT_DIR,
+    SUBTITLE_SETTINGS, BROLL_DIR, AUDIO_SETTINGS, TEMPLATES,
+    RENDER_PROFILES, DEFAULT_RENDER_PROFILE, MOTION_SETTINGS, SUBTITLE_STYLES, BROLL_SETTINGS, render_settings
 )
+from modules.audio_utils import pcm_duration
+from modules.audio_timeline import AudioTimeline
+from modules.subtitle_renderer import SubtitleRenderer
+from modules.subtitle_generator import SubtitleGenerator
+from modules.ffmpeg_renderer import FFmpegRenderer, frame_boundaries
+from modules.segment_renderer import SegmentRenderer
+from modules.segment_cache import cache_key
+from modules.stream_renderer import StreamRenderer
+from modules.memory_monitor import MemoryMonitor
+from modules.frame_compositor import FrameCompositor
+from modules.renditions import resolve_renditions, render_renditions, poster_frame
+from modules.image_cache import ImageCache
+from modules.avatar_library import AvatarLibrary
+from modules.broll_library import BrollLibrary
+from modules.render_manifest import write_manifest, file_digest, match_sentences, changed_segments
+from modules.video_catalog import VideoCatalog
+from modules.motion import KenBurns, source_size
 
 
 class VideoComposer:
     """영상 합성 클래스"""
     
-    def __init__(self):
-        self.width = VIDEO_SETTINGS['width']
-        self.height = VIDEO_SETTINGS['height']
-        self.fps = VIDEO_SETTINGS['fps']
+    def __init__(self, engine: str = None, profile: str = None):
+        self.profile = profile or DEFAULT_RENDER_PROFILE
+        self.settings = render_settings(self.profile)
+        self.width = self.settings['width']
+        self.height = self.settings['height']
+        self.fps = self.settings['fps']
+        self.engine_override = engine
+        self.engine = engine or self.settings['engine']
+        self.audio_timeline = AudioTimeline()
+        self.subtitle_renderer = SubtitleRenderer(self.width, self.height)
+        self.subtitle_generator = SubtitleGenerator()
+        self.image_cache = ImageCache(self.width, self.height)
+        self.avatar_library = AvatarLibrary(self.settings)
+        self.broll_library = BrollLibrary() if BROLL_SETTINGS['enabled'] else None
+        self.catalog = VideoCatalog()
+        self._profile_composers = {self.profile: self}
+    
+    def for_profile(self, profile: str = None) -> 'VideoComposer':
+        """
+        렌더 프로필별 합성기 (해상도/fps가 인스턴스 상태이므로 프로필마다 별도 인스턴스를 캐시)
+        """
+        profile = profile or self.profile
+        if profile not in self._profile_composers:
+            render_settings(profile)  # 알 수 없는 프로필이면 여기서 ValueError
+            self._profile_composers[profile] = VideoComposer(self.engine_override, profile)
+        return self._profile_composers[profile]
+    
+    def warm_up(self):
+        """
+        무거운 모듈과 인덱스 미리 로드 (gunicorn 마스터에서 fork 전에 호출하면 워커가 copy-on-write로 공유)
+        렌더 프로필별 자막 폰트/아바타 메자닌, B-roll 인덱스, BGM 캐시 인덱스, moviepy 엔진이면 moviepy.editor
+        """
+        for profile in RENDER_PROFILES:
+            composer = self.for_profile(profile)
+            composer.subtitle_renderer.preload()
+            for kind in ('intro', 'outro'):
+                try:
+                    composer.avatar_library.find(kind)
+                except Exception as e:
+                    print(f"⚠️ 아바타 미리 로드 실패 ({profile}/{kind}): {e}")
+            if composer.engine == 'moviepy':
+                import moviepy.editor
+            if composer.broll_library:
+                composer.broll_library.refresh()
+            # BGM 캐시 (첫 접근 시 인덱스 로드 + 새 스템 디코딩)
+            composer.audio_timeline.bgm_library
     
-    def select_broll(self, article: dict, scripts: dict) -> dict:
+    def select_broll(self, article: dict, scripts: dict, previous: dict = None) -> dict:
         """
         기사 내용에 맞는 B-roll 선택
+        본문 문장 단어와 기사 키워드로 로컬 B-roll 라이브러리(BROLL_DIR) 역색인 검색
         
         Args:
             article: 파싱된 기사 정보
             scripts: 생성된 스크립트
+            previous: 재렌더링할 영상의 매니페스트 (이전 문장에 대응하는 문장은 같은 배경 유지)
             
         Returns:
             dict: {
                 'images': 기사 이미지 리스트,
-                'stock_videos': 스톡 영상 리스트 (추후 구현)
+                'stock_videos': 본문 문장 순서대로 B-roll 클립 정보 또는 None
+                                (BrollLibrary.select() 결과, 없는 문장은 기사 이미지 사용),
+                'visuals': 본문 문장 순서대로 고정할 배경 또는 None (previous가 있을 때만)
             }
         """
-        return {
+        stock_videos = []
+        if self.broll_library:
+            try:
+                stock_videos = self.broll_library.select(
+                    scripts.get('narration', []), article.get('keywords', [])
+                )
+            except Exception as e:
+                print(f"⚠️ B-roll 선택 실패: {e}")
+        broll_data = {
             'images': article.get('images', []),
-            'stock_videos': []  # 추후 Pexels/Unsplash API 연동
+            'stock_videos': stock_videos
         }
+        if previous:
+            broll_data['visuals'] = self.previous_visuals(previous, scripts.get('narration', []))
+        return broll_data
+    
+    def previous_visuals(self, previous: dict, sentences: list) -> list:
+        """
+        이전 매니페스트의 본문 배경을 수정된 문장에 대응 (그대로 두거나 고쳐 쓴 문장은 같은 배경)
+        
+        Returns:
+            list: 문장 순서대로 이전 visual 또는 None (새로 끼워 넣은 문장)
+        """
+        body = [segment for segment in previous['segments'] if segment['kind'] == 'body']
+        old_sentences = previous['scripts'].get('narration', [])
+        by_index = {segment['index']: segment['visual'] for segment in body}
+        return [
+            by_index.get(old) if old is not None else None
+            for old in match_sentences(old_sentences, sentences)
+        ]
     
     def compose(self, scripts: dict, audio_files: dict, 
-                subtitles: dict, broll_data: dict, article: dict) -> Path:
+                subtitles: dict, broll_data: dict, article: dict,
+                subtitle_mode: str = None, engine: str = None,
+                profile: str = None, renditions: list = None,
+                stats: dict = None, previous: dict = None) -> Path:
         """
         최종 영상 합성
         
@@ -58,253 +146,551 @@ class VideoComposer:
             subtitles: 자막 데이터 딕셔너리
             broll_data: B-roll 데이터
             article: 기사 정보
+            subtitle_mode: 'overlay' | 'burn' (기본 SUBTITLE_SETTINGS['mode'])
+            engine: 'moviepy' | 'ffmpeg' | 'segments' | 'stream' (기본 프로필의 engine)
+            profile: 렌더 프로필 'draft' | 'final' (기본 이 인스턴스의 프로필)
+            renditions: 함께 만들 추가 렌디션 이름 리스트 (기본 프로필의 renditions)
+                        결과 파일은 renditions.find_renditions(output_path)로 조회
+            stats: 전달하면 작업 통계를 채움 ({'engine', 'memory': MemoryMonitor.report(),
+                   'segments': {'total', 'encoded', 'reused', 'changed'}})
+            previous: 재렌더링할 영상의 매니페스트 (render_manifest.load_manifest())
+                      엔진/자막 모드 기본값을 segments/이전 모드로 하고 바뀐 세그먼트를 stats에 보고
             
         Returns:
-            Path: 생성된 영상 파일 경로
+            Path: 생성된 (메인) 영상 파일 경로
         """
-        try:
-            clips = []
-            current_time = 0
-            
-            # 1. 인트로 (아바타 영상)
-            intro_clip = self._create_intro_clip(
-                audio_files.get('intro'),
-                subtitles.get('intro', [])
-            )
-            if intro_clip:
-                clips.append(intro_clip)
-                current_time += intro_clip.duration
-            
-            # 2. 본문 (B-roll + 기사 이미지)
-            body_clip = self._create_body_clip(
-                audio_files.get('narration', []),
-                subtitles.get('narration', []),
-                broll_data
-            )
-            if body_clip:
-                clips.append(body_clip)
-                current_time += body_clip.duration
-            
-            # 3. 아웃트로 (아바타 영상)
-            outro_clip = self._create_outro_clip(
-                audio_files.get('outro'),
-                subtitles.get('outro', [])
+        if profile and profile != self.profile:
+            return self.for_profile(profile).compose(
+                scripts, audio_files, subtitles, broll_data, article,
+                subtitle_mode=subtitle_mode, engine=engine, renditions=renditions,
+                stats=stats, previous=previous
             )
-            if outro_clip:
-                clips.append(outro_clip)
-            
-            # 전체 영상 합성
-            if not clips:
-                raise Exception("생성할 클립이 없습니다")
-            
-            final_video = concatenate_videoclips(clips, method="compose")
-            
-            # 파일 저장
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_filename = f"shorts_{timestamp}.mp4"
-            output_path = OUTPUT_DIR / output_filename
-            
-            print("최종 영상 렌더링 중...")
-            final_video.write_videofile(
-                str(output_path),
-                fps=self.fps,
-                codec='libx264',
-                audio_codec='aac',
-                preset='medium',
-                threads=4
-            )
-            
-            # 리소스 정리
-            final_video.close()
-            for clip in clips:
-                clip.close()
-            
-            print(f"✓ 영상 생성 완료: {output_path}")
+        
+        # 알 수 없는 렌디션이면 합성 전에 ValueError
+        extra_renditions = resolve_renditions(
+            self.settings['renditions'] if renditions is None else renditions
+        )
+        
+        if previous:
+            # 재렌더링: 바뀌지 않은 세그먼트는 세그먼트 캐시에서 스트림 복사
+            engine = engine or 'segments'
+            subtitle_mode = subtitle_mode or previous.get('subtitle_mode')
+        engine = engine or self.engine
+        subtitle_mode = subtitle_mode or SUBTITLE_SETTINGS['mode']
+        monitor = MemoryMonitor()
+        job = {}
+        try:
+            # 작업 단위 최대 RSS 측정 (stream 엔진은 프레임마다 예산 확인)
+            with monitor:
+                output_path = self._compose(
+                    scripts, audio_files, subtitles, broll_data, article,
+                    subtitle_mode, engine, extra_renditions, monitor, job, previous
+                )
+            report = monitor.report()
+            if monitor.exceeded:
+                print(f"⚠️ 메모리 예산 초과 ({report['peak_rss_mb']}MB > {report['budget_mb']}MB) - "
+                      f"RENDER_ENGINE=stream 사용을 권장합니다")
+            print(f"✓ 영상 생성 완료: {output_path} (최대 메모리 {report['peak_rss_mb']}MB, "
+                  f"ffmpeg 등 자식 프로세스 {report['peak_children_mb']}MB)")
             return output_path
             
         except Exception as e:
             raise Exception(f"영상 합성 중 오류: {str(e)}")
+        finally:
+            if stats is not None:
+                stats.update({'engine': engine, 'memory': monitor.report(), **job})
     
-    def _create_intro_clip(self, audio_path: Path, subtitle_data: list) -> VideoFileClip:
-        """인트로 클립 생성 (아바타)"""
+    def _compose(self, scripts: dict, audio_files: dict, subtitles: dict, broll_data: dict,
+                 article: dict, subtitle_mode: str, engine: str, extra_renditions: list,
+                 monitor: MemoryMonitor, job: dict, previous: dict = None) -> Path:
+        """compose() 본체 (계획 → 이미지/사운드트랙 준비 → 엔진별 렌더링 → 매니페스트/카탈로그 저장)"""
+        # 렌더링 계획 (모든 엔진이 같은 세그먼트/타이밍 사용)
+        plan = self.build_plan(audio_files, subtitles, broll_data, article)
+        if not plan['segments']:
+            raise Exception("생성할 클립이 없습니다")
+        
+        # 이미지 준비: 출력 해상도로 커버 크롭된 캐시 프레임 (렌더러는 리사이즈 없이 사용)
+        self.prepare_images(plan)
+        
+        # 사운드트랙: 음성 + BGM을 하나의 버퍼로 믹싱하여 단일 오디오 소스로 전달
+        soundtrack = self.audio_timeline.build(
+            plan['segments'],
+            template=plan['template'],
+            duration=plan['duration']
+        )
+        
+        # 파일 저장 (같은 초에 끝나는 동시 작업끼리 겹치지 않도록 임의 접미사)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_filename = f"{self.settings['output_prefix']}_{timestamp}_{uuid.uuid4().hex[:6]}.mp4"
+        output_path = OUTPUT_DIR / output_filename
+        
+        # burn 모드: 프레임 합성 대신 인코딩 중 ffmpeg가 ASS 자막을 입힘
+        subtitles_filter = None
+        if subtitle_mode == 'burn':
+            ass_path = self.subtitle_generator.save_ass(
+                self.plan_subtitles(plan), output_path.with_suffix('.ass'),
+                plan['style'], self.width, self.height
+            )
+            subtitles_filter = self.subtitle_generator.burn_filter(ass_path)
+        
+        print(f"최종 영상 렌더링 중... ({engine})")
+        # 세그먼트 내용 키: segments 엔진은 인코딩 결과를 캐시해 다음 작업/재렌더링에서 스트림 복사로 연결
+        # (INCREMENTAL_RENDER=false면 작업마다 같은 아웃트로만 캐시)
+        self.mark_segment_keys(plan, subtitle_mode,
+                               None if self.settings['incremental'] else ('outro',))
+        renderer = None
+        if engine == 'stream':
+            # 세그먼트 소스를 화면에 나오는 동안만 열고 프레임을 인코더로 바로 흘려보냄 (저메모리)
+            renderer = StreamRenderer(self.width, self.height, self.fps, self.subtitle_renderer,
+                                      settings=self.settings, monitor=monitor)
+            renderer.render(plan, soundtrack, output_path, subtitles_filter, extra_renditions)
+        elif engine in ('ffmpeg', 'segments'):
+            renderer_class = SegmentRenderer if engine == 'segments' else FFmpegRenderer
+            renderer = renderer_class(self.width, self.height, self.fps, self.subtitle_renderer,
+                                      settings=self.settings)
+            renderer.render(plan, soundtrack, output_path, subtitles_filter, extra_renditions)
+        else:
+            self._render_moviepy(plan, soundtrack, output_path, subtitles_filter)
+            # moviepy는 필터 그래프를 직접 만들지 않으므로 완성본을 한 번 디코딩해 렌디션 생성
+            render_renditions(output_path, extra_renditions, self.settings,
+                              poster_frame(plan, self.fps))
+        
+        manifest = self.build_manifest(plan, scripts, article, subtitle_mode, engine, extra_renditions)
+        write_manifest(output_path, manifest)
         try:
-            # 아바타 영상이 있으면 사용, 없으면 단색 배경 생성
-            avatar_files = list(AVATARS_DIR.glob('intro_*.mp4'))
-            
-            if avatar_files:
-                # 아바타 영상 사용
-                clip = VideoFileClip(str(avatar_files[0]))
-            else:
-                # 단색 배경 생성 (더미)
-                duration = self._get_audio_duration(audio_path) if audio_path else 5
-                clip = self._create_colored_clip(duration, color=(20, 30, 60))
-            
-            # 오디오 추가
-            if audio_path and audio_path.exists():
-                audio = AudioFileClip(str(audio_path))
-                clip = clip.set_audio(audio)
-                clip = clip.set_duration(audio.duration)
-            
-            # 자막 추가
-            if subtitle_data:
-                clip = self._add_subtitles(clip, subtitle_data)
-            
-            # 리사이즈 (세로형)
-            clip = clip.resize((self.width, self.height))
-            
-            return clip
-            
+            # 영상 목록(/api/videos)은 디렉토리를 스캔하지 않고 카탈로그만 조회
+            self.catalog.add(output_path, manifest, plan['duration'])
         except Exception as e:
-            print(f"⚠️ 인트로 생성 실패: {e}")
-            return None
+            print(f"⚠️ 영상 카탈로그 기록 실패: {e}")
+        job['segments'] = {
+            'total': len(plan['segments']),
+            'encoded': renderer.encoded if engine == 'segments' else len(plan['segments']),
+            'reused': renderer.reused if engine == 'segments' else 0,
+            'changed': [f"{kind}:{index}" for kind, index in changed_segments(previous, manifest['segments'])]
+                       if previous else None,
+        }
+        return output_path
     
-    def _create_body_clip(self, audio_paths: list, subtitle_data: list, 
-                          broll_data: dict) -> VideoFileClip:
-        """본문 클립 생성 (B-roll + 기사 이미지)"""
-        try:
-            clips = []
-            images = broll_data.get('images', [])
-            
-            # 각 나레이션 문장에 대해 클립 생성
-            for idx, audio_path in enumerate(audio_paths):
-                if not audio_path or not audio_path.exists():
-                    continue
-                
-                audio = AudioFileClip(str(audio_path))
-                duration = audio.duration
-                
+    def build_manifest(self, plan: dict, scripts: dict, article: dict, subtitle_mode: str,
+                       engine: str, extra_renditions: list) -> dict:
+        """
+        재렌더링용 매니페스트 (render_manifest.write_manifest()로 출력 옆에 저장)
+        세그먼트마다 음성 파일 해시, 배경 소스, 자막, 프레임 수, 세그먼트 캐시 키 기록
+        """
+        segments = []
+        for segment, frames in zip(plan['segments'], frame_boundaries(plan['segments'], self.fps)):
+            segments.append({
+                'kind': segment['kind'],
+                'index': segment['index'],
+                'start': segment['start'],
+                'duration': segment['duration'],
+                'frames': frames,
+                'subtitle': segment['subtitle'],
+                'audio': segment.get('audio'),
+                'audio_hash': file_digest(segment.get('audio')),
+                'visual': segment['visual'],
+                'key': segment['key'],
+            })
+        return {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'profile': self.profile,
+            'engine': engine,
+            'subtitle_mode': subtitle_mode,
+            'renditions': [name for name, _ in extra_renditions],
+            'template': plan['template'],
+            'style': plan['style'],
+            'article': article,
+            'scripts': scripts,
+            'segments': segments,
+        }
+    
+    def build_plan(self, audio_files: dict, subtitles: dict,
+                   broll_data: dict, article: dict) -> dict:
+        """
+        렌더링 계획 생성
+        
+        Returns:
+            dict: {
+                'template', 'style': 템플릿 키 / 자막 스타일,
+                'duration': 전체 길이(초),
+                'segments': [{
+                    'kind': 'intro' | 'body' | 'outro',
+                    'index': 본문 문장 인덱스 (인트로/아웃트로는 0),
+                    'start', 'duration': 타임라인 위치(초, 프레임 단위로 맞춘 값),
+                    'visual': {'type': 'avatar', 'path', 'source', 'frames', 'gop'}
+                              | {'type': 'video', 'path', 'source', 'signature'} (B-roll 클립, 서명: 크기/수정 시각)
+                              | {'type': 'image', 'source', 'fallback', 'motion', 'variant'}
+                              | {'type': 'color', 'color'},
+                              (이미지는 prepare_images() 후 커버 크롭 캐시 'path' 추가,
+                               motion은 Ken Burns transition 이름 또는 None)
+                    'subtitle': 자막 텍스트 또는 None,
+                    'audio': 음성 파일 경로 또는 None
+                }, ...]
+            }
+        """
+        template = self._get_template(article)
+        motion = TEMPLATES[template]['transition'] if self.settings.get(
+            'motion', MOTION_SETTINGS['enabled']) else None
+        segments = []
+        
+        # 1. 인트로 (아바타 영상)
+        segments.append(self._plan_avatar_segment(
+            'intro', audio_files.get('intro'), subtitles.get('intro', [])
+        ))
+        
+        # 2. 본문 (기사 이미지, 문장 단위)
+        images = broll_data.get('images', [])
+        clips = broll_data.get('stock_videos') or []
+        pinned = broll_data.get('visuals') or []
+        narration_subtitles = subtitles.get('narration', [])
+        for idx, audio_path in enumerate(audio_files.get('narration', [])):
+            if not audio_path or not audio_path.exists():
+                continue
+            
+            clip = clips[idx] if idx < len(clips) else None
+            if idx < len(pinned) and pinned[idx]:
+                # 재렌더링: 이전 영상에서 이 문장이 쓰던 배경 그대로 (모션 설정이 바뀌었으면 이미지 다시 준비)
+                visual = dict(pinned[idx])
+                if visual['type'] == 'image' and visual.get('motion') != motion:
+                    visual['motion'] = motion
+                    visual.pop('path', None)
+                elif visual['type'] == 'video' and Path(visual['path']).exists():
+                    # 그 사이 같은 경로의 클립이 교체됐으면 서명이 달라져 세그먼트를 다시 인코딩
+                    stat = Path(visual['path']).stat()
+                    visual['signature'] = (stat.st_size, int(stat.st_mtime))
+            elif clip and clip['type'] == 'video':
+                # 문장에 맞는 B-roll 영상 (출력 해상도로 커버 크롭, 짧으면 마지막 프레임 유지)
+                # signature: 같은 경로에서 교체된 클립이 캐시된 세그먼트를 재사용하지 않도록 세그먼트 키에 포함
+                visual = {'type': 'video', 'path': clip['path'], 'source': clip['path'],
+                          'signature': (clip['size'], int(clip['mtime']))}
+            elif clip:
+                # B-roll 이미지는 기사 이미지와 같은 경로 (커버 크롭 캐시, Ken Burns)
+                visual = {
+                    'type': 'image',
+                    'source': clip['path'],
+                    'fallback': (60, 70, 90),
+                    'motion': motion,
+                    'variant': idx,
+                }
+            elif images:
                 # 이미지 선택 (순환)
-                if images:
-                    image_url = images[idx % len(images)]
-                    img_clip = self._create_image_clip(image_url, duration)
-                else:
-                    # 이미지 없으면 단색 배경
-                    img_clip = self._create_colored_clip(duration, color=(40, 50, 70))
-                
-                # 오디오 추가
-                img_clip = img_clip.set_audio(audio)
-                
-                # 해당 문장의 자막 추가
-                if idx < len(subtitle_data):
-                    # 해당 인덱스의 자막만 (시작 시간을 0으로 조정)
-                    subtitle_for_clip = [(0, duration, subtitle_data[idx][2])]
-                    img_clip = self._add_subtitles(img_clip, subtitle_for_clip)
-                
-                clips.append(img_clip)
-            
-            if not clips:
+                visual = {
+                    'type': 'image',
+                    'source': images[idx % len(images)],
+                    'fallback': (60, 70, 90),
+                    'motion': motion,
+                    'variant': idx,
+                }
+            else:
+                # 이미지 없으면 단색 배경
+                visual = {'type': 'color', 'color': (40, 50, 70)}
+            
+            segments.append({
+                'kind': 'body',
+                'index': idx,
+                'duration': self._get_audio_duration(audio_path),
+                'audio': str(audio_path),
+                'visual': visual,
+                'subtitle': narration_subtitles[idx][2] if idx < len(narration_subtitles) else None,
+            })
+        
+        # 3. 아웃트로 (아바타 영상)
+        segments.append(self._plan_avatar_segment(
+            'outro', audio_files.get('outro'), subtitles.get('outro', [])
+        ))
+        
+        current_time = 0.0
+        for segment in segments:
+            # 길이를 프레임 단위로 맞춤: 세그먼트 프레임 수가 타임라인 위치와 무관해져
+            # 앞 문장 길이가 바뀌어도 뒤 세그먼트(아웃트로 포함)의 캐시 키가 그대로 유지됨
+            segment['duration'] = max(1, round(segment['duration'] * self.fps)) / self.fps
+            segment['start'] = current_time
+            current_time += segment['duration']
+        
+        return {
+            'template': template,
+            'style': TEMPLATES[template]['subtitle_style'],
+            'duration': current_time,
+            'segments': segments,
+        }
+    
+    def prepare_images(self, plan: dict, max_workers: int = 4) -> dict:
+        """
+        계획의 이미지 소스를 커버 크롭 캐시로 준비하고 visual['path']에 기록
+        (다운로드가 대부분이므로 스레드로 동시 처리, 실패한 이미지는 path=None → 단색 대체)
+        
+        Returns:
+            dict: {소스: 캐시 경로 또는 None}
+        """
+        def request(visual):
+            # Ken Burns 세그먼트는 줌 여유가 있도록 오버샘플링 크기로 준비
+            size = source_size(self.width, self.height) if visual.get('motion') else (self.width, self.height)
+            return visual['source'], size
+        
+        # 재렌더링에서 고정된 배경은 캐시 파일이 남아 있으면 다시 내려받지 않음
+        visuals = [
+            segment['visual'] for segment in plan['segments']
+            if segment['visual']['type'] == 'image'
+            and not (segment['visual'].get('path') and Path(segment['visual']['path']).exists())
+        ]
+        requests = list(dict.fromkeys(request(visual) for visual in visuals))
+        if not requests:
+            return {}
+        
+        def prepare(item):
+            source, size = item
+            try:
+                return self.image_cache.prepare(source, size)
+            except Exception as e:
+                print(f"⚠️ 이미지 로드 실패 ({source}): {e}")
                 return None
-            
-            # 클립 연결
-            final_clip = concatenate_videoclips(clips, method="compose")
-            return final_clip
-            
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(requests)))) as executor:
+            prepared = dict(zip(requests, executor.map(prepare, requests)))
+        
+        for visual in visuals:
+            visual['path'] = prepared[request(visual)]
+        return {source: path for (source, _), path in prepared.items()}
+    
+    def mark_segment_keys(self, plan: dict, subtitle_mode: str, cache_kinds: tuple = None) -> list:
+        """
+        세그먼트마다 내용 키 segment['key'] 지정 (매니페스트 비교용)
+        배경(아바타 메자닌 경로와 B-roll 영상에 소스 서명 포함, 이미지 캐시 경로에 내용 해시 포함)/배경색,
+        프레임 수, 자막 텍스트/모드/스타일, 프로필 인코딩 설정 중 하나라도 바뀌면 키가 달라짐
+        cache_kinds 종류의 세그먼트(None이면 전부)는 segment['cache_key']도 지정해
+        segments 엔진이 인코딩 결과를 세그먼트 캐시에 보관하고 다음에 그대로 사용
+        
+        Returns:
+            list: 캐시 키가 지정된 세그먼트
+        """
+        encoding = {key: self.settings[key] for key in
+                    ('width', 'height', 'fps', 'codec', 'preset', 'crf', 'pix_fmt')}
+        marked = []
+        for segment in plan['segments']:
+            segment['key'] = cache_key(
+                segment['kind'], plan['template'], segment['visual'],
+                round(segment['duration'] * self.fps), segment['subtitle'],
+                subtitle_mode, plan['style'], SUBTITLE_SETTINGS, SUBTITLE_STYLES.get(plan['style']),
+                encoding,
+            )
+            if cache_kinds is None or segment['kind'] in cache_kinds:
+                segment['cache_key'] = segment['key']
+                marked.append(segment)
+        return marked
+    
+    def plan_subtitles(self, plan: dict) -> dict:
+        """렌더링 계획의 세그먼트 타이밍으로 자막 딕셔너리 재구성 (ASS 출력용)"""
+        sections = {'intro': [], 'narration': [], 'outro': []}
+        for segment in plan['segments']:
+            if segment['subtitle']:
+                section = 'narration' if segment['kind'] == 'body' else segment['kind']
+                sections[section].append((
+                    segment['start'],
+                    segment['start'] + segment['duration'],
+                    segment['subtitle']
+                ))
+        return sections
+    
+    def _plan_avatar_segment(self, kind: str, audio_path: Path, subtitle_data: list) -> dict:
+        """
+        인트로/아웃트로 세그먼트 (아바타 영상이 없으면 단색 배경)
+        아바타는 출력 형식으로 미리 트랜스코딩된 메자닌 사용 (AvatarLibrary)
+        """
+        try:
+            avatar = self.avatar_library.find(kind)
         except Exception as e:
-            print(f"⚠️ 본문 생성 실패: {e}")
-            return None
+            print(f"⚠️ {kind} 아바타 준비 실패: {e}")
+            avatar = None
+        
+        if avatar:
+            visual = {
+                'type': 'avatar',
+                'path': avatar['path'],
+                'source': avatar['source'],
+                'frames': avatar['frames'],
+                'gop': avatar['gop'],
+            }
+        else:
+            visual = {'type': 'color', 'color': (20, 30, 60)}
+        
+        # 음성 길이 우선, 없으면 아바타 길이, 둘 다 없으면 기본 길이
+        if audio_path and audio_path.exists():
+            duration = self._get_audio_duration(audio_path)
+        elif avatar and avatar['frames']:
+            duration = avatar['frames'] / float(avatar['fps'])
+        else:
+            duration = AVATAR_SETTINGS[f'{kind}_duration']
+        
+        return {
+            'kind': kind,
+            'index': 0,
+            'duration': duration,
+            'audio': str(audio_path) if audio_path and audio_path.exists() else None,
+            'visual': visual,
+            'subtitle': subtitle_data[0][2] if subtitle_data else None,
+        }
     
-    def _create_outro_clip(self, audio_path: Path, subtitle_data: list) -> VideoFileClip:
-        """아웃트로 클립 생성 (아바타)"""
-        # 인트로와 동일한 로직, 파일명만 다름
+    def _render_moviepy(self, plan: dict, soundtrack: np.ndarray,
+                        output_path: Path, subtitles_filter: str = None):
+        """moviepy 클립 트리로 렌더링"""
+        # moviepy.editor는 import 시 imageio/ffmpeg를 초기화하므로 moviepy 엔진을 쓸 때만 import
+        from moviepy.editor import concatenate_videoclips
+        from moviepy.audio.AudioClip import AudioArrayClip
+        
+        style = None if subtitles_filter else plan['style']
+        # 자막은 작업마다 하나인 프레임 버퍼에 제자리 합성 (세그먼트는 순서대로 렌더링됨)
+        compositor = FrameCompositor(self.width, self.height)
+        clips = [self._create_segment_clip(segment, style, compositor) for segment in plan['segments']]
+        # 모든 세그먼트가 출력 해상도이므로 배경 합성(compose) 없이 이어 붙임
+        final_video = concatenate_videoclips(clips, method="chain")
+        
+        if len(soundtrack):
+            final_video = final_video.set_audio(
+                AudioArrayClip(soundtrack, fps=AUDIO_SETTINGS['sample_rate'])
+            )
+        
+        final_video.write_videofile(
+            str(output_path),
+            fps=self.fps,
+            codec=self.settings['codec'],
+            audio_codec=AUDIO_SETTINGS['codec'],
+            audio_fps=AUDIO_SETTINGS['sample_rate'],
+            audio_bitrate=AUDIO_SETTINGS['bitrate'],
+            preset=self.settings['preset'],
+            threads=self.settings['threads'],
+            ffmpeg_params=['-crf', str(self.settings['crf'])] + (
+                ['-vf', subtitles_filter] if subtitles_filter else []
+            )
+        )
+        
+        # 리소스 정리
+        final_video.close()
+        for clip in clips:
+            clip.close()
+    
+    def _create_segment_clip(self, segment: dict, style: str = None,
+                             compositor: FrameCompositor = None) -> 'VideoClip':
+        """
+        세그먼트 클립 생성
+        
+        Args:
+            segment: build_plan()의 세그먼트
+            style: 자막 스타일 (None이면 자막 오버레이 생략)
+            compositor: 자막 합성용 프레임 합성기 (기본 세그먼트마다 새로 생성)
+        """
+        visual = segment['visual']
+        duration = segment['duration']
+        
         try:
-            avatar_files = list(AVATARS_DIR.glob('outro_*.mp4'))
-            
-            if avatar_files:
-                clip = VideoFileClip(str(avatar_files[0]))
+            from moviepy.editor import VideoFileClip
+            if visual['type'] == 'avatar':
+                # 아바타 영상 사용 (오디오는 사운드트랙에서 일괄 처리)
+                clip = VideoFileClip(visual['path'], audio=False)
+                if tuple(clip.size) != (self.width, self.height):
+                    clip = clip.resize((self.width, self.height))
+                clip = clip.set_duration(duration)
+            elif visual['type'] == 'video':
+                # B-roll 영상: 비율을 유지한 채 출력 해상도를 채우도록 축소 후 중앙 크롭
+                clip = self._cover_clip(VideoFileClip(visual['path'], audio=False)).set_duration(duration)
+            elif visual['type'] == 'image':
+                clip = self._create_image_clip(visual, duration)
             else:
-                duration = self._get_audio_duration(audio_path) if audio_path else 5
-                clip = self._create_colored_clip(duration, color=(20, 30, 60))
-            
-            if audio_path and audio_path.exists():
-                audio = AudioFileClip(str(audio_path))
-                clip = clip.set_audio(audio)
-                clip = clip.set_duration(audio.duration)
-            
-            if subtitle_data:
-                clip = self._add_subtitles(clip, subtitle_data)
-            
-            clip = clip.resize((self.width, self.height))
-            return clip
-            
+                clip = self._create_colored_clip(duration, color=visual['color'])
         except Exception as e:
-            print(f"⚠️ 아웃트로 생성 실패: {e}")
-            return None
+            print(f"⚠️ {segment['kind']} 클립 생성 실패: {e}")
+            clip = self._create_colored_clip(duration, color=(20, 30, 60))
+        
+        # 자막 추가 (세그먼트 전체 구간)
+        if style and segment['subtitle']:
+            clip = self._add_subtitles(clip, [(0, duration, segment['subtitle'])], style, compositor)
+        
+        return clip
+    
+    def _cover_clip(self, clip: 'VideoClip') -> 'VideoClip':
+        """클립을 출력 해상도로 커버 크롭 (이미 같은 크기면 그대로)"""
+        if tuple(clip.size) == (self.width, self.height):
+            return clip
+        if clip.w * self.height >= clip.h * self.width:
+            clip = clip.resize(height=self.height)
+        else:
+            clip = clip.resize(width=self.width)
+        return clip.crop(x_center=clip.w / 2, y_center=clip.h / 2, width=self.width, height=self.height)
     
-    def _create_colored_clip(self, duration: float, color: tuple) -> VideoFileClip:
+    def _create_colored_clip(self, duration: float, color: tuple) -> 'VideoClip':
         """단색 배경 클립 생성"""
+        from moviepy.editor import ImageClip
+        
         # numpy 배열로 단색 이미지 생성
         img_array = np.full((self.height, self.width, 3), color, dtype=np.uint8)
         return ImageClip(img_array, duration=duration)
     
-    def _create_image_clip(self, image_url: str, duration: float) -> VideoFileClip:
-        """이미지 URL로부터 클립 생성 (Ken Burns 효과)"""
-        try:
-            import requests
-            from PIL import Image
-            from io import BytesIO
-            
-            # 이미지 다운로드
-            response = requests.get(image_url, timeout=10)
-            img = Image.open(BytesIO(response.content))
-            
-            # PIL Image를 numpy 배열로 변환
-            img_array = np.array(img)
-            
-            # ImageClip 생성
-            clip = ImageClip(img_array, duration=duration)
-            
-            # 리사이즈 (세로형 맞춤)
-            clip = clip.resize((self.width, self.height))
-            
-            # 간단한 Ken Burns 효과 (줌 인)
-            # clip = clip.resize(lambda t: 1 + 0.05 * t / duration)
-            
-            return clip
-            
-        except Exception as e:
-            print(f"⚠️ 이미지 로드 실패 ({image_url}): {e}")
+    def _create_image_clip(self, visual: dict, duration: float) -> 'VideoClip':
+        """
+        이미지 클립 생성 (출력 해상도로 커버 크롭된 캐시 프레임을 그대로 사용)
+        motion이 있으면 Ken Burns: 미리 계산한 크롭 경로로 오버샘플링 소스에서 크롭 영역만 리샘플링
+        """
+        from moviepy.editor import ImageClip, VideoClip
+        
+        path = visual.get('path')
+        if 'path' not in visual:
+            size = source_size(self.width, self.height) if visual.get('motion') else None
+            try:
+                path = self.image_cache.prepare(visual['source'], size)
+            except Exception as e:
+                print(f"⚠️ 이미지 로드 실패 ({visual['source']}): {e}")
+        if not path:
             # 실패 시 단색 배경 반환
-            return self._create_colored_clip(duration, color=(60, 70, 90))
+            return self._create_colored_clip(duration, color=visual.get('fallback', (60, 70, 90)))
+        
+        if visual.get('motion'):
+            motion = KenBurns(path, self.width, self.height, self.fps,
+                              int(round(duration * self.fps)) + 1,
+                              visual['motion'], visual.get('variant', 0))
+            return VideoClip(motion.make_frame, duration=duration)
+        
+        return ImageClip(str(path), duration=duration)
     
-    def _add_subtitles(self, video_clip: VideoFileClip, subtitle_data: list) -> CompositeVideoClip:
-        """영상에 자막 추가"""
+    def _add_subtitles(self, video_clip: 'VideoClip', subtitle_data: list,
+                       style: str = None, compositor: FrameCompositor = None) -> 'VideoClip':
+        """
+        영상에 자막 추가 (Pillow로 미리 렌더링한 RGBA 비트맵을 프레임 버퍼에 제자리 합성)
+        배경 프레임이 그대로인 구간(정지 이미지)은 합성 결과를 재사용
+        """
         try:
-            subtitle_clips = []
+            compositor = compositor or FrameCompositor(self.width, self.height)
+            overlays = []
             
             for start, end, text in subtitle_data:
-                # TextClip 생성
-                txt_clip = TextClip(
-                    text,
-                    fontsize=SUBTITLE_SETTINGS['font_size'],
-                    color=SUBTITLE_SETTINGS['color'],
-                    stroke_color=SUBTITLE_SETTINGS['stroke_color'],
-                    stroke_width=SUBTITLE_SETTINGS['stroke_width'],
-                    method='caption',
-                    size=(self.width - 100, None),
-                    font='Arial'  # 시스템 폰트 사용
-                )
-                
-                # 위치 및 타이밍 설정
-                txt_clip = txt_clip.set_position(('center', self.height - 200))
-                txt_clip = txt_clip.set_start(start)
-                txt_clip = txt_clip.set_duration(end - start)
-                
-                subtitle_clips.append(txt_clip)
+                # RGBA 비트맵 → 위치 기준으로 잘라 알파 곱셈을 미리 계산한 오버레이
+                bitmap = self.subtitle_renderer.render(text, style)
+                position = self.subtitle_renderer.position(bitmap, style)
+                overlays.append((start, end, compositor.overlay(bitmap, position)))
             
-            # 영상과 자막 합성
-            if subtitle_clips:
-                return CompositeVideoClip([video_clip] + subtitle_clips)
-            else:
+            if not overlays:
                 return video_clip
+            
+            def composite(get_frame, t):
+                active = [overlay for start, end, overlay in overlays if start <= t < end]
+                return compositor.compose(get_frame(t), active)
+            
+            return video_clip.fl(composite)
                 
         except Exception as e:
             print(f"⚠️ 자막 추가 실패: {e}")
             return video_clip
     
+    def _get_template(self, article: dict) -> str:
+        """기사 카테고리에 해당하는 템플릿 키"""
+        category = (article or {}).get('category')
+        return category if category in TEMPLATES else 'breaking_news'
+    
     def _get_audio_duration(self, audio_path: Path) -> float:
         """오디오 길이 반환"""
         try:
             if audio_path and audio_path.exists():
+                if audio_path.suffix == '.wav':
+                    return pcm_duration(audio_path)
+                from moviepy.editor import AudioFileClip
                 audio = AudioFileClip(str(audio_path))
                 duration = audio.duration
                 audio.close()
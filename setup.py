@@ -21,6 +21,7 @@ def setup_project():
         'assets/avatars',
         'assets/bgm',
         'assets/broll',
+        'assets/fonts',
     ]
     
     print("\n[1/4] 디렉토리 생성 중...")
@@ -100,6 +101,12 @@ def setup_project():
 - **Incompetech**: https://incompetech.com/
 
 BGM이 없어도 영상 생성은 정상적으로 진행됩니다.
+
+## 캐시
+
+파일명 접두어(`tense`, `soft`, `smart`)로 템플릿 태그가 정해지며, 각 파일은 한 번만 디코딩되어
+`cache/bgm/`에 정규화된 PCM으로 저장됩니다. 파일을 추가/수정하면 다음 작업 시 자동으로 갱신됩니다.
+`tense.json` 같은 사이드카 파일로 `mood`, `tempo`, `tag`를 지정할 수 있습니다.
 """
     
     with open('assets/bgm/README.md', 'w', encoding='utf-8') as f:
@@ -117,6 +124,7 @@ BGM이 없어도 영상 생성은 정상적으로 진행됩니다.
     print("\n2. FFmpeg 설치 (필수):")
     print("   - Windows: https://ffmpeg.org/download.html")
     print("   - 설치 후 시스템 PATH에 추가")
+    print("\n   자막 폰트: NanumGothicBold.ttf를 assets/fonts에 배치 (또는 SUBTITLE_FONT_PATH 지정)")
     print("\n3. API 키 설정:")
     print("   - .env 파일을 열고 OPENAI_API_KEY 입력")
     print("   - (선택) ELEVENLABS_API_KEY 입력")
@@ -0,0 +1,106 @@
+"""
+Segye VIBE 렌더 워커
+작업 큐(JOB_DB_PATH)에서 작업을 리스로 가져와 렌더 파이프라인을 실행
+웹 프로세스와 별도로 원하는 수만큼 실행 (여러 호스트는 OUTPUT_DIR/CACHE_DIR/작업 DB를 공유 볼륨에 둠)
+
+사용법:
+    python worker.py [--once] [--id NAME]
+"""
+import os
+import socket
+import signal
+import argparse
+import threading
+import traceback
+
+from config import JOB_SETTINGS, WARM_UP
+from modules.job_queue import JobQueue
+from modules.pipeline import RenderPipeline, StageAborted
+
+
+# 재시도해도 결과가 같은 입력 오류 (바로 실패 처리)
+PERMANENT_ERRORS = (ValueError, KeyError, FileNotFoundError)
+
+
+class Worker:
+    """렌더 워커"""
+
+    def __init__(self, worker_id: str = None, queue: JobQueue = None):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.queue = queue or JobQueue()
+        self.pipeline = RenderPipeline()
+        self.stopping = threading.Event()
+
+    def run(self, once: bool = False):
+        """작업 루프 (once면 대기 작업이 없을 때 종료)"""
+        print(f"렌더 워커 시작: {self.worker_id} ({self.queue.db_path})")
+        if WARM_UP:
+            # 첫 작업이 moviepy/newspaper import, 폰트/인덱스 로드 시간을 떠안지 않도록
+            self.pipeline.preload()
+        while not self.stopping.is_set():
+            job = self.queue.claim(self.worker_id)
+            if job is None:
+                if once:
+                    break
+                self.stopping.wait(JOB_SETTINGS['poll_interval'])
+                continue
+            self.process(job)
+        print(f"렌더 워커 종료: {self.worker_id}")
+
+    def stop(self, *_):
+        """지금 작업을 끝낸 뒤 종료 (SIGTERM/SIGINT)"""
+        print("종료 요청 - 실행 중인 작업을 마친 뒤 종료합니다")
+        self.stopping.set()
+
+    def process(self, job: dict):
+        """작업 하나 실행 (하트비트 스레드가 리스를 연장, 리스를 잃으면 다음 단계 전에 중단)"""
+        job_id = job['id']
+        resumed = f", {job['stage']} 이후부터 재개" if job['stage'] else ''
+        print(f"작업 시작: {job_id} ({job['kind']}, 시도 {job['attempts']}/{job['max_attempts']}{resumed})")
+        lease_lost = threading.Event()
+        done = threading.Event()
+
+        def heartbeat():
+            while not done.wait(JOB_SETTINGS['heartbeat_interval']):
+                if not self.queue.heartbeat(job_id, self.worker_id):
+                    lease_lost.set()
+                    return
+
+        def on_stage(stage: str, state: dict) -> bool:
+            if lease_lost.is_set():
+                return False
+            return self.queue.save_stage(job_id, self.worker_id, stage, state)
+
+        beat = threading.Thread(target=heartbeat, daemon=True)
+        beat.start()
+        try:
+            state = self.pipeline.run(job['kind'], job['payload'], job['state'], on_stage,
+                                      profile_id=job_id)
+            self.queue.complete(job_id, self.worker_id, state['video'])
+            print(f"작업 완료: {job_id} → {state['video']['filename']}")
+        except StageAborted as e:
+            print(f"작업 중단: {job_id} ({e} 단계 후 리스 상실 - 다른 워커가 이어서 실행)")
+        except Exception as e:
+            traceback.print_exc()
+            status = self.queue.fail(job_id, self.worker_id, str(e),
+                                     retry=not isinstance(e, PERMANENT_ERRORS))
+            print(f"작업 실패: {job_id} ({e}) → {status}")
+        finally:
+            done.set()
+            beat.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Segye VIBE 렌더 워커')
+    parser.add_argument('--once', action='store_true', help='대기 작업을 모두 처리하면 종료')
+    parser.add_argument('--id', help='워커 이름 (기본 호스트명:PID)')
+    args = parser.parse_args()
+
+    worker = Worker(args.id)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run(once=args.once)
+
+
+if __name__ == '__main__':
+    main()